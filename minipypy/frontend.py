@@ -10,6 +10,9 @@ from rpython.rlib.rfile import create_file
 from rpython.rlib.jit import not_rpython
 
 from minipypy.module.marshal import unmarshal_pycode
+from minipypy.module.__builtin__.moduledef import builtin_module
+from minipypy.objects.baseobject import W_StrObject
+from minipypy.objects.module import Module, module_name_from_filename
 
 
 @not_rpython
@@ -70,6 +73,16 @@ def rpy_load_py2(fname):
     return pycode
 
 
+def rpy_load_module(fname):
+    """Load the code of a module and bind it to a fresh module namespace
+    that falls back to the builtins."""
+    pycode = rpy_load_py2(fname)
+    w_name = W_StrObject(module_name_from_filename(pycode.co_filename.value))
+    w_module = Module(w_name, builtin_module.w_dict)
+    pycode.w_globals = w_module.w_dict
+    return pycode
+
+
 if __name__ == "__main__":
     import dis
 
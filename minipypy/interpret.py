@@ -5,20 +5,28 @@ from rpython.rlib import jit
 from rpython.rlib.jit import JitDriver, hint, promote, promote_string, not_rpython
 from rpython.rlib.debug import ll_assert_not_none, make_sure_not_resized, check_nonneg
 from rpython.rlib.objectmodel import always_inline, dont_inline, compute_hash
-from rpython.rlib.rarithmetic import intmask, r_uint
+from rpython.rlib.rarithmetic import intmask, ovfcheck, r_uint
 from rpython.rlib.rerased import new_erasing_pair
 from rpython.tool.sourcetools import func_with_new_name
 
-from minipypy.frontend import rpy_load_py2
+from minipypy.frontend import rpy_load_module
 from minipypy.objects.baseobject import *
 from minipypy.objects.function import *
-from minipypy.objects.dictobject import W_Dict
-from minipypy.objects.iteratorobject import W_IteratorObject
+from minipypy.objects.dictobject import (
+    W_Dict, W_ModuleDict, LOAD_ATTR_caching, LOAD_GLOBAL_caching,
+    STORE_ATTR_caching, lookup_global
+)
+from minipypy.objects.dictmultiobject import W_DictMultiObject
+from minipypy.objects.error import W_TypeError, W_ValueError
 from minipypy.objects.sliceobject import W_SliceObject
-from minipypy.objects.tupleobject import W_TupleObject
+from minipypy.objects.tupleobject import (
+    W_AbstractTupleObject, W_TupleObject, newtuple
+)
 from minipypy.objects.listobject import W_List, W_ListObject
-from minipypy.objects.pycode import PyCode
+from minipypy.objects.pycode import PyCode, CO_NEWLOCALS, CO_OPTIMIZED
 from minipypy.opcode27 import Bytecodes, opmap, opname, HAVE_ARGUMENT
+from minipypy.peephole import SUPERINSTRUCTION_NAMES
+from minipypy.quickening import int_compare
 
 
 # Copied from pypy/interpreter/pyopcode.py
@@ -198,8 +206,8 @@ class PyFrame(W_Root):
     locals_cells_stack_w = None # the list of all locals, cells and the valuestack
     valuestackdepth = 0 # number of items on valuestack
     lastblock = None
-    lastblock = None
-    w_locals = W_Dict()
+    w_returnvalue = None
+    w_locals = None
 
     def __init__(self, code):
         self = hint(self, fresh_virtualizable=True, access_directly=True)
@@ -207,10 +215,27 @@ class PyFrame(W_Root):
         self.code = code
         # the layout of this list is as follows:
         # | local vars | cells | stack |
-        size = code.co_nlocals + len(code.co_cellvars) + len(code.co_freevars) + code.co_stacksize
+        size = code.co_stackstart + code.co_stacksize
         self.locals_cells_stack_w = [None] * size
+        self.valuestackdepth = code.co_stackstart
         check_nonneg(self.valuestackdepth)
+        # module code runs in its globals, class bodies in a fresh dict
+        # that LOAD_LOCALS hands to BUILD_CLASS, functions use fast locals
+        if not code.co_flags & CO_NEWLOCALS:
+            self.w_locals = code.w_globals
+        elif not code.co_flags & CO_OPTIMIZED:
+            self.w_locals = W_Dict()
+
+        self.last_instr = -1
 
+    @jit.unroll_safe
+    def reset(self):
+        """Bring a finished frame back to the state of a fresh one"""
+        for i in range(len(self.locals_cells_stack_w)):
+            self.locals_cells_stack_w[i] = None
+        self.valuestackdepth = self.code.co_stackstart
+        self.lastblock = None
+        self.w_returnvalue = None
         self.last_instr = -1
 
     def getcode(self):
@@ -222,29 +247,15 @@ class PyFrame(W_Root):
     def getname_w(self, index):
         return self.getcode().co_names[index]
 
+    def getname(self, index):
+        return self.getcode().getname(index)
+
     def get_w_globals(self):
         return promote(self.code).w_globals
 
     def get_w_locals(self):
         return promote(self.w_locals)
 
-    def get_module_name(self):
-        w_str = self.getcode().co_filename
-        return self._remove_suffix(w_str)
-
-    @jit.unroll_safe
-    def _remove_suffix(self, w_str):
-        assert isinstance(w_str, W_StrObject)
-        s = ""
-        for c in w_str.value:
-            if c == '/':
-                s = ""
-            elif c == '.':
-                break
-            else:
-                s += c
-        return W_StrObject(s)
-
     def popvalue(self):
         valuestackdepth = self.valuestackdepth - 1
         assert valuestackdepth >= 0
@@ -258,8 +269,9 @@ class PyFrame(W_Root):
         self.valuestackdepth += 1
 
     def top(self):
-        assert self.valuestackdepth >= 0
-        return self.locals_cells_stack_w[self.valuestackdepth]
+        index = self.valuestackdepth - 1
+        assert index >= 0
+        return self.locals_cells_stack_w[index]
 
     @jit.unroll_safe
     def popvalues(self, n):
@@ -294,6 +306,20 @@ class PyFrame(W_Root):
             values_w[n] = self.locals_cells_stack_w[base+n]
         return values_w
 
+    def peekvalue(self, index_from_top=0):
+        index = self.valuestackdepth + ~index_from_top
+        self.assert_stack_index(index)
+        assert index >= 0
+        return self.locals_cells_stack_w[index]
+
+    @jit.unroll_safe
+    def pop_args_into(self, frame, start, argnum):
+        """Move the argnum values on top of the stack into the local slots
+        of frame, starting at slot start."""
+        while argnum > 0:
+            argnum -= 1
+            frame.locals_cells_stack_w[start + argnum] = self.popvalue()
+
     @jit.unroll_safe
     def dropvaluesuntil(self, finaldepth):
         depth = self.valuestackdepth - 1
@@ -310,11 +336,7 @@ class PyFrame(W_Root):
         self._check_stack_index(index)
 
     def _check_stack_index(self, index):
-        code = self.getcode()
-        ncellvars = len(code.co_cellvars)
-        nfreevars = len(code.co_freevars)
-        stackstart = code.co_nlocals + ncellvars + nfreevars
-        assert index >= stackstart
+        assert index >= self.getcode().co_stackstart
 
     def append_block(self, block):
         assert block.previous is self.lastblock
@@ -334,8 +356,8 @@ class PyFrame(W_Root):
     def ROT_TWO(self, oparg, next_instr):
         tos = self.popvalue()
         tos2 = self.popvalue()
-        self.pushvalue(tos2)
         self.pushvalue(tos)
+        self.pushvalue(tos2)
 
     def ROT_THREE(self, oparg, next_instr):
         assert self.valuestackdepth - 2 >= 0
@@ -343,8 +365,8 @@ class PyFrame(W_Root):
         tos2 = self.popvalue()
         tos3 = self.popvalue()
         self.pushvalue(tos)
-        self.pushvalue(tos2)
         self.pushvalue(tos3)
+        self.pushvalue(tos2)
 
     def ROT_FOUR(self, oparg, next_instr):
         assert self.valuestackdepth - 3 >= 0
@@ -353,9 +375,26 @@ class PyFrame(W_Root):
         tos3 = self.popvalue()
         tos4 = self.popvalue()
         self.pushvalue(tos)
-        self.pushvalue(tos2)
-        self.pushvalue(tos3)
         self.pushvalue(tos4)
+        self.pushvalue(tos3)
+        self.pushvalue(tos2)
+
+    @jit.unroll_safe
+    def REVERSE_N(self, count, next_instr):
+        """Reverse the count values on top of the stack, what BUILD_TUPLE
+        count; UNPACK_SEQUENCE count does; see minipypy/peephole.py."""
+        base = self.valuestackdepth - count
+        self.assert_stack_index(base)
+        assert base >= 0
+        stack_w = self.locals_cells_stack_w
+        i = base
+        j = self.valuestackdepth - 1
+        while i < j:
+            w_x = stack_w[i]
+            stack_w[i] = stack_w[j]
+            stack_w[j] = w_x
+            i += 1
+            j -= 1
 
     def UNARY_POSITIVE(self, oparg, next_instr):
         w_x = self.popvalue()
@@ -379,10 +418,12 @@ class PyFrame(W_Root):
         raise OpcodeNotImplementedError()
 
     def STORE_NAME(self, oparg, next_instr):
+        w_value = self.popvalue()
+        self._store_name(oparg, w_value)
+
+    def _store_name(self, oparg, w_value):
         name = self.getcode().co_names[oparg]
         assert name is not None
-
-        w_value = self.popvalue()
         self.w_locals[name] = w_value
 
     def STORE_FAST(self, oparg, next_instr):
@@ -395,7 +436,14 @@ class PyFrame(W_Root):
         assert name is not None
 
         w_value = self.popvalue()
-        self.getcode().w_globals[name] = w_value
+        self.get_w_globals().setitem(name, w_value)
+
+    def DELETE_GLOBAL(self, oparg, next_instr):
+        w_name = self.getname_w(oparg)
+        try:
+            self.get_w_globals().delitem(w_name)
+        except:
+            raise BytecodeCorruption("DELETE_GLOBAL is failed at: %s" % (w_name))
 
     def DELETE_NAME(self, oparg, next_instr):
         w_name = self.getname_w(oparg)
@@ -405,16 +453,19 @@ class PyFrame(W_Root):
             raise BytecodeCorruption("DELETE_NAME is failed at: %s" % (w_name))
 
     def LOAD_NAME(self, oparg, next_instr):
+        self.pushvalue(self._load_name(oparg))
+
+    def _load_name(self, oparg):
         co_names = promote(self.getcode().co_names)
         name = co_names[oparg]
         assert name is not None
 
-        w_result = self.get_w_locals().getitem(name)
-        if w_result is None:
-            w_result = self._load_global(name)
-        if w_result is None:
-            raise BytecodeCorruption("LOAD_NAME is failed: " + str(name))
-        self.pushvalue(w_result)
+        w_locals = self.get_w_locals()
+        if w_locals is not self.get_w_globals():
+            w_result = w_locals.getitem(name)
+            if w_result is not None:
+                return w_result
+        return self._load_global(oparg)
 
     @always_inline
     def LOAD_FAST(self, varindex, next_instr):
@@ -436,25 +487,22 @@ class PyFrame(W_Root):
         self.pushvalue(const)
 
     def LOAD_GLOBAL(self, oparg, next_instr):
-        co_names = promote(self.getcode().co_names)
-        name = co_names[oparg]
-        assert name is not None
-
-        w_result = self._load_global(name)
+        w_result = self._load_global(oparg)
         self.pushvalue(w_result)
 
     @always_inline
-    def _load_global(self, key):
-        assert isinstance(key, W_StrObject)
-        if key.value == "__name__":
-            # __name__ equals to the current module name
-            return self.get_module_name()
-
-        w_globals = self.getcode().w_globals
-        w_result = w_globals[key]
+    def _load_global(self, nameindex):
+        w_globals = self.get_w_globals()
+        assert isinstance(w_globals, W_ModuleDict)
+        if jit.we_are_jitted():
+            # the cells are constant-folded on the promoted dict versions
+            w_result = lookup_global(w_globals, self.getname(nameindex))
+        else:
+            w_result = LOAD_GLOBAL_caching(self.getcode(), w_globals, nameindex)
 
         if w_result is None:
-            raise BytecodeCorruption("_load_global is failed: %s in %s" % (key, w_globals.getrepr()))
+            raise BytecodeCorruption("_load_global is failed: %s in %s" % (
+                self.getname_w(nameindex), w_globals.getrepr()))
         return w_result
 
     def LOAD_LOCALS(self, oparg, next_instr):
@@ -464,12 +512,64 @@ class PyFrame(W_Root):
     def LOAD_ATTR(self, nameindex, next_instr):
         "obj.attributename"
         w_obj = self.popvalue()
-        w_attributename = self.getname_w(nameindex)
-        w_value = w_obj.getattr(w_attributename)
-        if isinstance(w_value, W_FunctionObject):
-            assert isinstance(w_obj, W_InstanceObject)
+        self.pushvalue(self._load_attr(w_obj, nameindex))
+
+    @always_inline
+    def _load_attr(self, w_obj, nameindex):
+        if isinstance(w_obj, W_InstanceObject) and not jit.we_are_jitted():
+            w_value = LOAD_ATTR_caching(self.getcode(), w_obj, nameindex)
+        else:
+            w_value = w_obj.getattr(self.getname_w(nameindex))
+        if w_value is None:
+            raise BytecodeCorruption("%s has no attribute %s" % (
+                w_obj.getrepr(), self.getname(nameindex)))
+        if (isinstance(w_value, W_FunctionObject) and
+                isinstance(w_obj, W_InstanceObject) and
+                w_obj.lookup_method(self.getname(nameindex))
+                is w_value):
+            # a function found on the class, not stored on the instance
             w_value = W_Method(w_value, w_obj, w_obj.w_class)
-        self.pushvalue(w_value)
+        return w_value
+
+    def LOAD_METHOD(self, nameindex, next_instr):
+        """obj.attributename, called right away by the CALL_METHOD that
+        ends the sequence.  For a method of an instance this pushes the
+        function and then obj, which becomes the first argument, without
+        binding them.  Otherwise it pushes None and then the attribute."""
+        w_obj = self.popvalue()
+        if isinstance(w_obj, W_InstanceObject):
+            w_function = w_obj.lookup_method(self.getname(nameindex))
+            if isinstance(w_function, W_FunctionObject):
+                self.pushvalue(w_function)
+                self.pushvalue(w_obj)
+                return
+        self.pushvalue(None)
+        self.pushvalue(self._load_attr(w_obj, nameindex))
+
+    def CALL_METHOD(self, argnum, next_instr):
+        w_function = self.peekvalue(argnum + 1)
+        if w_function is None:
+            # not a method: None, the callable, the arguments
+            self.CALL_FUNCTION(argnum, next_instr)
+            w_result = self.popvalue()
+            self.popvalue()
+            self.pushvalue(w_result)
+            return
+        # the function, the receiver and the arguments, which are all
+        # moved into the new frame
+        assert isinstance(w_function, W_FunctionObject)
+        w_result = w_function.call_from_frame(self, argnum + 1)
+        self.popvalue()
+        self.pushvalue(w_result)
+
+    def STORE_ATTR(self, nameindex, next_instr):
+        "obj.attributename = value"
+        w_obj = self.popvalue()
+        w_value = self.popvalue()
+        if isinstance(w_obj, W_InstanceObject) and not jit.we_are_jitted():
+            STORE_ATTR_caching(self.getcode(), w_obj, nameindex, w_value)
+        else:
+            w_obj.setattr(self.getname_w(nameindex), w_value)
 
     def BINARY_POWER(self, oparg, next_instr):
         w_y = self.popvalue()
@@ -510,12 +610,14 @@ class PyFrame(W_Root):
     def BINARY_ADD(self, oparg, next_instr):
         w_y = self.popvalue()
         w_x = self.popvalue()
+        self.observe_operands(next_instr, w_x, w_y)
         w_z = w_x.add(w_y)
         self.pushvalue(w_z)
 
     def BINARY_SUBTRACT(self, oparg, next_instr):
         w_y = self.popvalue()
         w_x = self.popvalue()
+        self.observe_operands(next_instr, w_x, w_y)
         w_z = w_x.sub(w_y)
         self.pushvalue(w_z)
 
@@ -525,6 +627,17 @@ class PyFrame(W_Root):
         w_z = w_x.subscr(w_y)
         self.pushvalue(w_z)
 
+    def STORE_SUBSCR(self, oparg, next_instr):
+        w_index = self.popvalue()
+        w_obj = self.popvalue()
+        w_value = self.popvalue()
+        w_obj.store_subscr(w_index, w_value)
+
+    def DELETE_SUBSCR(self, oparg, next_instr):
+        w_index = self.popvalue()
+        w_obj = self.popvalue()
+        w_obj.delete_subscr(w_index)
+
     def BINARY_FLOOR_DIVIDE(self, oparg, next_instr):
         w_y = self.popvalue()
         w_x = self.popvalue()
@@ -538,51 +651,65 @@ class PyFrame(W_Root):
         self.pushvalue(w_z)
 
     def COMPARE_OP(self, oparg, next_instr):
-        opnum = oparg
         w_2 = self.popvalue()
         w_1 = self.popvalue()
+        if oparg <= 5:
+            self.observe_operands(next_instr, w_1, w_2)
+        self.pushvalue(self.compare(oparg, w_1, w_2))
+
+    def compare(self, opnum, w_1, w_2):
         if opnum == 0:  # <
-            w_result = w_1.lt(w_2)
+            return w_1.lt(w_2)
         elif opnum == 1:  # <=
-            w_result = w_1.le(w_2)
+            return w_1.le(w_2)
         elif opnum == 2:  # ==
-            w_result = w_1.eq(w_2)
+            return w_1.eq(w_2)
         elif opnum == 3:  # !=
-            w_result = w_1.eq(w_2).not_()
+            return w_1.ne(w_2)
         elif opnum == 4:  # >
-            w_result = w_1.gt(w_2)
+            return w_1.gt(w_2)
         elif opnum == 5:  # >=
-            w_result = w_1.ge(w_2)
+            return w_1.ge(w_2)
+        return W_BoolObject.from_bool(self.compare_is_true(opnum, w_1, w_2))
+
+    def compare_is_true(self, opnum, w_1, w_2):
+        """The truth of the comparison, without building the W_BoolObject
+        when the branch consuming it was fused with the COMPARE_OP."""
+        if opnum <= 5:
+            if type(w_1) is W_IntObject and type(w_2) is W_IntObject:
+                return int_compare(opnum, w_1.value, w_2.value)
+            return self.compare(opnum, w_1, w_2).is_true()
         elif opnum == 6:  # in
-            raise BytecodeCorruption("in is not implemented")
-        elif opnum == 7:
-            raise BytecodeCorruption("not in not implemented")
+            return w_2.contains(w_1)
+        elif opnum == 7:  # not in
+            return not w_2.contains(w_1)
         elif opnum == 8:  # is
-            w_result = w_1.eq(w_2)
+            return w_1 is w_2
         elif opnum == 9:  # is not
-            w_result = w_1.eq(w_2).not_()
+            return w_1 is not w_2
         elif opnum == 10:
             raise BytecodeCorruption("exception match not implemented")
         else:
             raise BytecodeCorruption("Bad cmp op: %d" % (opnum))
-        self.pushvalue(w_result)
 
     def INPLACE_ADD(self, oparg, next_instr):
         w_tos = self.popvalue()
         w_tos1 = self.popvalue()
-        w_result = w_tos1.add(w_tos)
+        self.observe_operands(next_instr, w_tos1, w_tos)
+        w_result = w_tos1.inplace_add(w_tos)
         self.pushvalue(w_result)
 
     def INPLACE_SUBTRACT(self, oparg, next_instr):
         w_tos = self.popvalue()
         w_tos1 = self.popvalue()
+        self.observe_operands(next_instr, w_tos1, w_tos)
         w_result = w_tos1.sub(w_tos)
         self.pushvalue(w_result)
 
     def INPLACE_MULTIPLY(self, oparg, next_instr):
         w_tos = self.popvalue()
         w_tos1 = self.popvalue()
-        w_result = w_tos1.mul(w_tos)
+        w_result = w_tos1.inplace_mul(w_tos)
         self.pushvalue(w_result)
 
     def INPLACE_DIVIDE(self, oparg, next_instr):
@@ -613,7 +740,7 @@ class PyFrame(W_Root):
         if numargs == 3:
             w_step = self.popvalue()
         elif numargs == 2:
-            w_step = self.space.w_None
+            w_step = W_NoneObject.W_None
         else:
             raise BytecodeCorruption
         w_end = self.popvalue()
@@ -652,21 +779,18 @@ class PyFrame(W_Root):
         w_obj = self.popvalue()
         w_newvalue = self.popvalue()
         w_obj.storeslice_0(w_newvalue)
-        self.pushvalue(w_obj)
 
     def STORE_SLICE_1(self, oparg, next_instr):
         w_start = self.popvalue()
         w_obj = self.popvalue()
         w_newvalue = self.popvalue()
         w_obj.storeslice_1(w_newvalue, w_start)
-        self.pushvalue(w_obj)
 
     def STORE_SLICE_2(self, oparg, next_instr):
         w_end = self.popvalue()
         w_obj = self.popvalue()
         w_newvalue = self.popvalue()
         w_obj.storeslice_2(w_newvalue, w_end)
-        self.pushvalue(w_obj)
 
     def STORE_SLICE_3(self, oparg, next_instr):
         w_stop = self.popvalue()
@@ -674,7 +798,6 @@ class PyFrame(W_Root):
         w_obj = self.popvalue()
         w_newvalue = self.popvalue()
         w_obj.storeslice_3(w_newvalue, w_start, w_stop)
-        self.pushvalue(w_obj)
 
     def BUILD_LIST(self, itemcount, next_instr):
         # import pdb; pdb.set_trace()
@@ -682,19 +805,62 @@ class PyFrame(W_Root):
         w_list = W_List().instantiate(items)
         self.pushvalue(w_list)
 
+    def BUILD_MAP(self, sizehint, next_instr):
+        # the oparg is the number of STORE_MAPs that follow, so the dict
+        # can be allocated with room for all of them
+        self.pushvalue(W_DictMultiObject.allocate(sizehint))
+
+    def STORE_MAP(self, oparg, next_instr):
+        w_key = self.popvalue()
+        w_value = self.popvalue()
+        w_dict = self.peekvalue(0)
+        assert isinstance(w_dict, W_DictMultiObject)
+        w_dict.setitem(w_key, w_value)
+
     def BUILD_CLASS(self, oparg, next_instr):
         method_dict = self.popvalue()
-        base_class = self.popvalue()
+        w_bases = self.popvalue()
         class_name = self.popvalue()
-        # TODO: workaround. base_class should be list
-        w_class = W_ClassObject(class_name, [base_class], method_dict)
+        assert isinstance(w_bases, W_AbstractTupleObject)
+        bases_w = w_bases.tolist()[:]
+        for w_base in bases_w:
+            if not isinstance(w_base, W_ClassObject):
+                raise W_TypeError("base is not a class: %s" %
+                                  (w_base.getrepr(),))
+        w_class = W_ClassObject(class_name, bases_w, method_dict)
         self.pushvalue(w_class)
 
     def RETURN_VALUE(self, oparg, next_instr):
-        return self.popvalue()
+        self.w_returnvalue = self.popvalue()
+        return -1
+
+    def GET_ITER(self, oparg, next_instr):
+        w_iterable = self.popvalue()
+        self.pushvalue(w_iterable.iter())
+
+    def FOR_ITER(self, jumpto, next_instr):
+        w_iterator = self.peekvalue(0)
+        w_nextitem = w_iterator.next()
+        if w_nextitem is None:
+            # exhausted
+            self.popvalue()
+            return jumpto
+        self.pushvalue(w_nextitem)
+        return next_instr
+
+    def BREAK_LOOP(self, oparg, next_instr):
+        block = self.pop_block()
+        block.cleanupstack(self)
+        return block.handlerposition
+
+    def LIST_APPEND(self, oparg, next_instr):
+        w_item = self.popvalue()
+        w_list = self.peekvalue(oparg - 1)
+        assert isinstance(w_list, W_ListObject)
+        w_list.append(w_item)
 
     def SETUP_LOOP(self, oparg, next_instr):
-        block = LoopBlock(self, next_instr + oparg, self.lastblock)
+        block = LoopBlock(self, oparg, self.lastblock)
         self.lastblock = block
 
     def POP_BLOCK(self, oparg, next_instr):
@@ -706,78 +872,289 @@ class PyFrame(W_Root):
         argc = oparg
         code = self.popvalue()
         assert isinstance(code, PyCode)
-        defs_w = [None] * argc
-        i = 0
-        while i < argc:
-            defs_w[i] = self.popvalue()
-            i += 1
-        w_function = W_FunctionObject(code, self.getcode().w_globals, defs_w)
-        self.getcode().w_globals[code.co_name] = w_function
+        defs_w = self.popvalues(argc)
+        w_function = W_FunctionObject(code, self.get_w_globals(), defs_w)
         self.pushvalue(w_function)
 
     def CALL_FUNCTION(self, argc, next_instr):
         argnum = argc & 0xFF
         kwnum = (argc >> 8) & 0xFF
-        args = [None] * argnum
-        for i in range(argnum):
-            args[i] = self.popvalue()
-        w_function = self.popvalue()
+        w_function = self.peekvalue(argnum)
         if isinstance(w_function, W_FunctionObject):
-            w_value = w_function.call_args(args, argnum)
+            # the arguments go straight from this stack into the callee
+            w_value = w_function.call_from_frame(self, argnum)
         elif isinstance(w_function, W_Method):
-            w_value = w_function.call_obj_args(args, argnum)
+            w_value = w_function.call_from_frame(self, argnum)
         elif isinstance(w_function, W_InstanceMethod):
+            args = self.popvalues(argnum)
+            w_value = w_function.call_args(args, argnum)
+        elif isinstance(w_function, W_BuiltinMethod):
+            args = self.popvalues(argnum)
             w_value = w_function.call_args(args, argnum)
+        elif isinstance(w_function, W_BuiltinFunction):
+            args = self.popvalues(argnum)
+            if self.getcode().co_opcodes[next_instr] == Bytecodes.GET_ITER:
+                # the result is only iterated over, e.g. range() in a for
+                # loop, so it need not be built up front
+                w_value = w_function.call_for_iteration(args, argnum)
+            else:
+                w_value = w_function.call_args(args, argnum)
         elif isinstance(w_function, W_ClassObject):
             w_value = w_function.instantiate()
+            w_init = w_function.lookup("__init__")
+            if isinstance(w_init, W_FunctionObject):
+                w_init.call_from_frame(self, argnum, w_value)
+            elif argnum != 0:
+                raise W_TypeError("this constructor takes no arguments")
+            w_function.observe_constructed(w_value)
         else:
             raise BytecodeCorruption("w_function is not W_FunctionObject but %s" % (str(w_function)))
+        self.popvalue()
         self.pushvalue(w_value)
 
+    @jit.unroll_safe
     def UNPACK_SEQUENCE(self, count, next_instr):
-        w_iter = self.popvalue()
-        assert isinstance(w_iter, W_IteratorObject)
-        for w_x in w_iter.unpack(count):
-            self.pushvalue(w_x)
+        w_seq = self.popvalue()
+        if isinstance(w_seq, W_AbstractTupleObject):
+            check_unpack_length(w_seq.length(), count)
+            for i in range(count - 1, -1, -1):
+                self.pushvalue(w_seq.getitem(i))
+        elif isinstance(w_seq, W_ListObject):
+            check_unpack_length(w_seq.length(), count)
+            for i in range(count - 1, -1, -1):
+                self.pushvalue(w_seq.getitem(i))
+        else:
+            items_w = unpack_iterable(w_seq, count)
+            for i in range(count - 1, -1, -1):
+                self.pushvalue(items_w[i])
 
     def BUILD_TUPLE(self, oparg, next_instr):
         count = oparg
         values = [None] * count
         for i in range(count):
             values[count - i - 1] = self.popvalue()
-        w_ret = W_TupleObject(values)
+        w_ret = newtuple(values)
         self.pushvalue(w_ret)
 
-    def PRINT_ITME(self, oparg, next_instr):
+    def PRINT_ITEM(self, oparg, next_instr):
         w_x = self.popvalue()
         print w_x.getrepr(),  # fmt: skip
 
     def PRINT_NEWLINE(self, oparg, next_instr):
         print  # fmt: skip
 
-    @jit.unroll_safe
-    def interpret(self):
-        next_instr = r_uint(self.last_instr + 1)
-        oparg = r_uint(0)
+    def JUMP_IF_TRUE_OR_POP(self, oparg, next_instr):
+        tos = self.top()
+        if tos.is_true():
+            return oparg
+        self.popvalue()
+        return next_instr
+
+    def JUMP_IF_FALSE_OR_POP(self, oparg, next_instr):
+        tos = self.top()
+        if not tos.is_true():
+            return oparg
+        self.popvalue()
+        return next_instr
+
+    def POP_JUMP_IF_TRUE(self, oparg, next_instr):
+        tos = self.popvalue()
+        if tos.is_true():
+            return oparg
+        return next_instr
+
+    def POP_JUMP_IF_FALSE(self, oparg, next_instr):
+        tos = self.popvalue()
+        if not tos.is_true():
+            return oparg
+        return next_instr
+
+    def JUMP_ABSOLUTE(self, oparg, next_instr):
+        jitdriver.can_enter_jit(
+            next_instr=oparg,
+            code=self.getcode(),
+            valuestackdepth=self.valuestackdepth,
+            self=self,
+        )
+        return oparg
+
+    def JUMP_FORWARD(self, oparg, next_instr):
+        return oparg
+
+    def NOP(self, oparg, next_instr):
+        pass
+
+    # superinstructions, see minipypy/peephole.py.  The opargs of the fused
+    # instructions following the first one are read from their own slots.
+
+    def read_oparg(self, index):
+        return self.getcode().co_opargs[index]
+
+    def LOAD_FAST__LOAD_FAST(self, oparg, next_instr):
+        self.LOAD_FAST(oparg, next_instr)
+        self.LOAD_FAST(self.read_oparg(next_instr), next_instr)
+        return next_instr + 1
+
+    def LOAD_FAST__LOAD_CONST__BINARY_ADD(self, oparg, next_instr):
+        w_x = self.locals_cells_stack_w[oparg]
+        if w_x is None:
+            self._load_fast_failed(oparg)
+        w_y = self.read_const(self.read_oparg(next_instr))
+        self.pushvalue(w_x.add(w_y))
+        return next_instr + 2
+
+    def LOAD_FAST__LOAD_CONST__BINARY_SUBTRACT(self, oparg, next_instr):
+        w_x = self.locals_cells_stack_w[oparg]
+        if w_x is None:
+            self._load_fast_failed(oparg)
+        w_y = self.read_const(self.read_oparg(next_instr))
+        self.pushvalue(w_x.sub(w_y))
+        return next_instr + 2
+
+    def COMPARE_OP__POP_JUMP_IF_FALSE(self, oparg, next_instr):
+        w_2 = self.popvalue()
+        w_1 = self.popvalue()
+        if oparg <= 5:
+            self.observe_operands(next_instr, w_1, w_2)
+        if not self.compare_is_true(oparg, w_1, w_2):
+            return self.read_oparg(next_instr)
+        return next_instr + 1
+
+    def COMPARE_OP__POP_JUMP_IF_TRUE(self, oparg, next_instr):
+        w_2 = self.popvalue()
+        w_1 = self.popvalue()
+        if oparg <= 5:
+            self.observe_operands(next_instr, w_1, w_2)
+        if self.compare_is_true(oparg, w_1, w_2):
+            return self.read_oparg(next_instr)
+        return next_instr + 1
+
+    def LOAD_NAME__LOAD_CONST__INPLACE_ADD__STORE_NAME(self, oparg, next_instr):
+        w_x = self._load_name(oparg)
+        w_y = self.read_const(self.read_oparg(next_instr))
+        self._store_name(self.read_oparg(next_instr + 2), w_x.inplace_add(w_y))
+        return next_instr + 3
+
+    # quickened instructions, see minipypy/quickening.py.  They are only
+    # dispatched by the interpreter and fall back to the generic operation,
+    # unquickening their site, when the type guard fails.
+
+    def observe_operands(self, next_instr, w_x, w_y):
+        if not jit.we_are_jitted():
+            self.getcode().observe_operands(next_instr - 1, w_x, w_y)
+
+    def generic_add(self, next_instr, w_x, w_y):
+        """The operation of the unquickened BINARY_ADD or INPLACE_ADD
+        at next_instr - 1."""
+        self.getcode().unquicken(next_instr - 1)
+        if self.getcode().co_opcodes[next_instr - 1] == Bytecodes.INPLACE_ADD:
+            return w_x.inplace_add(w_y)
+        return w_x.add(w_y)
+
+    def INT_ADD(self, oparg, next_instr):
+        w_y = self.popvalue()
+        w_x = self.popvalue()
+        if type(w_x) is W_IntObject and type(w_y) is W_IntObject:
+            try:
+                z = ovfcheck(w_x.value + w_y.value)
+            except OverflowError:
+                pass
+            else:
+                self.pushvalue(W_IntObject(z))
+                return
+        # a site whose result overflowed goes on with longs
+        self.pushvalue(self.generic_add(next_instr, w_x, w_y))
+
+    def INT_SUBTRACT(self, oparg, next_instr):
+        w_y = self.popvalue()
+        w_x = self.popvalue()
+        if type(w_x) is W_IntObject and type(w_y) is W_IntObject:
+            try:
+                z = ovfcheck(w_x.value - w_y.value)
+            except OverflowError:
+                pass
+            else:
+                self.pushvalue(W_IntObject(z))
+                return
+        self.getcode().unquicken(next_instr - 1)
+        self.pushvalue(w_x.sub(w_y))
+
+    def FLOAT_ADD(self, oparg, next_instr):
+        w_y = self.popvalue()
+        w_x = self.popvalue()
+        if type(w_x) is W_FloatObject and type(w_y) is W_FloatObject:
+            self.pushvalue(W_FloatObject(w_x.value + w_y.value))
+        else:
+            self.pushvalue(self.generic_add(next_instr, w_x, w_y))
+
+    def FLOAT_SUBTRACT(self, oparg, next_instr):
+        w_y = self.popvalue()
+        w_x = self.popvalue()
+        if type(w_x) is W_FloatObject and type(w_y) is W_FloatObject:
+            self.pushvalue(W_FloatObject(w_x.value - w_y.value))
+        else:
+            self.getcode().unquicken(next_instr - 1)
+            self.pushvalue(w_x.sub(w_y))
 
-        while next_instr < len(self.getco_code()):
+    def INT_COMPARE_OP(self, oparg, next_instr):
+        w_2 = self.popvalue()
+        w_1 = self.popvalue()
+        if type(w_1) is W_IntObject and type(w_2) is W_IntObject:
+            result = int_compare(oparg, w_1.value, w_2.value)
+            self.pushvalue(W_BoolObject.from_bool(result))
+        else:
+            self.getcode().unquicken(next_instr - 1)
+            self.pushvalue(self.compare(oparg, w_1, w_2))
+
+    def INT_COMPARE_OP__POP_JUMP_IF_FALSE(self, oparg, next_instr):
+        w_2 = self.popvalue()
+        w_1 = self.popvalue()
+        if type(w_1) is W_IntObject and type(w_2) is W_IntObject:
+            result = int_compare(oparg, w_1.value, w_2.value)
+        else:
+            self.getcode().unquicken(next_instr - 1)
+            result = self.compare_is_true(oparg, w_1, w_2)
+        if not result:
+            return self.read_oparg(next_instr)
+        return next_instr + 1
+
+    def INT_COMPARE_OP__POP_JUMP_IF_TRUE(self, oparg, next_instr):
+        w_2 = self.popvalue()
+        w_1 = self.popvalue()
+        if type(w_1) is W_IntObject and type(w_2) is W_IntObject:
+            result = int_compare(oparg, w_1.value, w_2.value)
+        else:
+            self.getcode().unquicken(next_instr - 1)
+            result = self.compare_is_true(oparg, w_1, w_2)
+        if result:
+            return self.read_oparg(next_instr)
+        return next_instr + 1
+
+    def interpret(self):
+        code = self.getcode()
+        if not code.is_decoded():
+            code.decode()
+        return self.dispatch(code, self.last_instr + 1)
+
+    def dispatch(self, code, next_instr):
+        """The portal of the JIT.  Every call of a Python function reaches
+        the merge point below with next_instr == 0 first, so the hotness
+        of a function is counted on entry (see function_threshold) as well
+        as on backward jumps.  Recursive calls re-enter this portal and end
+        up as call_assembler once the callee has been compiled."""
+        while next_instr < len(code.co_opcodes):
             jitdriver.jit_merge_point(
                 next_instr=next_instr,
-                code=self.getcode(),
+                code=code,
                 valuestackdepth=self.valuestackdepth,
                 self=self,
             )
-            co_code = self.getco_code()
-            opcode = ord(co_code[next_instr])
-            next_instr += 1
-
-            if HAVE_ARGUMENT <= opcode:
-                lo = ord(co_code[next_instr])
-                hi = ord(co_code[next_instr+1])
-                next_instr += 2
-                oparg = (hi * 256) | lo
+            if jit.we_are_jitted():
+                opcode = code.co_opcodes[next_instr]
             else:
-                oparg = r_uint(0)
+                opcode = code._quickened_opcodes[next_instr]
+            oparg = code.co_opargs[next_instr]
+            next_instr += 1
 
             self.valuestackdepth = hint(self.valuestackdepth, promote=True)
 
@@ -788,162 +1165,141 @@ class PyFrame(W_Root):
                     opname[opcode],
                     self.locals_cells_stack_w,
                     self.valuestackdepth,
-                    self.getcode().w_globals,
-                )
-            if opcode == Bytecodes.BINARY_ADD:
-                self.BINARY_ADD(oparg, next_instr)
-            elif opcode == Bytecodes.BINARY_DIVIDE:
-                self.BINARY_DIVIDE(oparg, next_instr)
-            elif opcode == Bytecodes.BINARY_SUBTRACT:
-                self.BINARY_SUBTRACT(oparg, next_instr)
-            elif opcode == Bytecodes.BINARY_MULTIPLY:
-                self.BINARY_MULTIPLY(oparg, next_instr)
-            elif opcode == Bytecodes.BINARY_TRUE_DIVIDE:
-                self.BINARY_TRUE_DIVIDE(oparg, next_instr)
-            elif opcode == Bytecodes.UNARY_POSITIVE:
-                self.UNARY_POSITIVE(opcode, next_instr)
-            elif opcode == Bytecodes.UNARY_NEGATIVE:
-                self.UNARY_NEGATIVE(opcode, next_instr)
-            elif opcode == Bytecodes.UNARY_NOT:
-                self.UNARY_NOT(opcode, next_instr)
-            elif opcode == Bytecodes.UNARY_CONVERT:
-                self.UNARY_CONVERT(opcode, next_instr)
-            elif opcode == Bytecodes.UNARY_INVERT:
-                self.UNARY_INVERT(opcode, next_instr)
-            elif opcode == Bytecodes.BUILD_CLASS:
-                self.BUILD_CLASS(oparg, next_instr)
-            elif opcode == Bytecodes.INPLACE_ADD:
-                self.INPLACE_ADD(oparg, next_instr)
-            elif opcode == Bytecodes.INPLACE_SUBTRACT:
-                self.INPLACE_SUBTRACT(oparg, next_instr)
-            elif opcode == Bytecodes.INPLACE_DIVIDE:
-                self.INPLACE_DIVIDE(oparg, next_instr)
-            elif opcode == Bytecodes.INPLACE_LSHIFT:
-                self.INPLACE_LSHIFT(oparg, next_instr)
-            elif opcode == Bytecodes.INPLACE_RSHIFT:
-                self.INPLACE_RSHIFT(oparg, next_instr)
-            elif opcode == Bytecodes.INPLACE_MODULO:
-                self.INPLACE_MODULO(oparg, next_instr)
-            elif opcode == Bytecodes.BUILD_LIST:
-                self.BUILD_LIST(oparg, next_instr)
-            elif opcode == Bytecodes.SLICE_0:
-                self.SLICE_0(oparg, next_instr)
-            elif opcode == Bytecodes.SLICE_1:
-                self.SLICE_1(oparg, next_instr)
-            elif opcode == Bytecodes.SLICE_2:
-                self.SLICE_2(oparg, next_instr)
-            elif opcode == Bytecodes.SLICE_3:
-                self.SLICE_3(oparg, next_instr)
-            elif opcode == Bytecodes.STORE_SLICE_0:
-                self.STORE_SLICE_0(oparg, next_instr)
-            elif opcode == Bytecodes.STORE_SLICE_1:
-                self.STORE_SLICE_1(oparg, next_instr)
-            elif opcode == Bytecodes.STORE_SLICE_2:
-                self.STORE_SLICE_2(oparg, next_instr)
-            elif opcode == Bytecodes.STORE_SLICE_3:
-                self.STORE_SLICE_3(oparg, next_instr)
-            elif opcode == Bytecodes.LOAD_FAST:
-                self.LOAD_FAST(oparg, next_instr)
-            elif opcode == Bytecodes.LOAD_GLOBAL:
-                self.LOAD_GLOBAL(oparg, next_instr)
-            elif opcode == Bytecodes.LOAD_LOCALS:
-                self.LOAD_LOCALS(oparg, next_instr)
-            elif opcode == Bytecodes.PRINT_ITEM:
-                self.PRINT_ITME(oparg, next_instr)
-            elif opcode == Bytecodes.PRINT_NEWLINE:
-                self.PRINT_NEWLINE(oparg, next_instr)
-            elif opcode == Bytecodes.RETURN_VALUE:
-                return self.RETURN_VALUE(oparg, next_instr)
-            elif opcode == Bytecodes.SETUP_LOOP:
-                self.SETUP_LOOP(oparg, next_instr)
-            elif opcode == Bytecodes.STORE_NAME:
-                self.STORE_NAME(oparg, next_instr)
-            elif opcode == Bytecodes.DELETE_NAME:
-                self.DELETE_NAME(oparg, next_instr)
-            elif opcode == Bytecodes.UNPACK_SEQUENCE:
-                self.UNPACK_SEQUENCE(oparg, next_instr)
-            elif opcode == Bytecodes.FOR_ITER:
-                pass
-            elif opcode == Bytecodes.LIST_APPEND:
-                pass
-            elif opcode == Bytecodes.STORE_ATTR:
-                pass
-            elif opcode == Bytecodes.DELETE_ATTR:
-                pass
-            elif opcode == Bytecodes.STORE_GLOBAL:
-                self.STORE_GLOBAL(oparg, next_instr)
-            elif opcode == Bytecodes.DELETE_GLOBAL:
-                pass
-            elif opcode == Bytecodes.DUP_TOPX:
-                pass
-            elif opcode == Bytecodes.LOAD_NAME:
-                self.LOAD_NAME(oparg, next_instr)
-            elif opcode == Bytecodes.BUILD_TUPLE:
-                self.BUILD_TUPLE(oparg, next_instr)
-            elif opcode == Bytecodes.BUILD_SET:
-                pass
-            elif opcode == Bytecodes.BUILD_MAP:
-                pass
-            elif opcode == Bytecodes.LOAD_ATTR:
-                self.LOAD_ATTR(oparg, next_instr)
-            elif opcode == Bytecodes.COMPARE_OP:
-                self.COMPARE_OP(oparg, next_instr)
-            elif opcode == Bytecodes.IMPORT_NAME:
-                pass
-            elif opcode == Bytecodes.IMPORT_FROM:
-                pass
-            elif opcode == Bytecodes.LOAD_CONST:
-                self.LOAD_CONST(oparg, next_instr)
-            elif opcode == Bytecodes.STORE_FAST:
-                self.STORE_FAST(oparg, next_instr)
-            elif opcode == Bytecodes.POP_BLOCK:
-                self.POP_BLOCK(oparg, next_instr)
-            elif opcode == Bytecodes.MAKE_FUNCTION:
-                self.MAKE_FUNCTION(oparg, next_instr)
-            elif opcode == Bytecodes.CALL_FUNCTION:
-                self.CALL_FUNCTION(oparg, next_instr)
-            elif opcode == Bytecodes.POP_TOP:
-                self.POP_TOP(oparg, next_instr)
-            elif opcode == Bytecodes.ROT_TWO:
-                self.ROT_TWO(oparg, next_instr)
-            elif opcode == Bytecodes.ROT_THREE:
-                self.ROT_THREE(oparg, next_instr)
-            elif opcode == Bytecodes.JUMP_IF_TRUE_OR_POP:
-                tos = self.top()
-                if tos.is_true():
-                    next_instr = oparg
-                else:
-                    self.popvalue()
-            elif opcode == Bytecodes.JUMP_IF_FALSE_OR_POP:
-                tos = self.top()
-                if not tos.is_true():
-                    next_instr = oparg
-                else:
-                    self.popvalue()
-            elif opcode == Bytecodes.POP_JUMP_IF_TRUE:
-                tos = self.popvalue()
-                if tos.is_true():
-                    next_instr = oparg
-            elif opcode == Bytecodes.POP_JUMP_IF_FALSE:
-                tos = self.popvalue()
-                if not tos.is_true():
-                    next_instr = oparg
-            elif opcode == Bytecodes.JUMP_ABSOLUTE:
-                next_instr = oparg
-                jitdriver.can_enter_jit(
-                    next_instr=next_instr,
-                    code=self.getcode(),
-                    valuestackdepth=self.valuestackdepth,
-                    self=self,
+                    code.w_globals,
                 )
-            elif opcode == Bytecodes.JUMP_FORWARD:
-                next_instr += oparg
-            elif opcode == Bytecodes.STOP_CODE:
-                pass
+            next_instr = dispatch_table.handlers[opcode](self, oparg, next_instr)
+            if next_instr < 0:
+                return self.w_returnvalue
+
+
+def check_unpack_length(length, count):
+    if length > count:
+        raise W_ValueError("too many values to unpack")
+    if length < count:
+        raise W_ValueError("need more than %d values to unpack" % length)
+
+
+def unpack_iterable(w_seq, count):
+    """The first count items of iterating over w_seq, which must have
+    exactly that many."""
+    w_iter = w_seq.iter()
+    items_w = [None] * count
+    for i in range(count):
+        w_item = w_iter.next()
+        if w_item is None:
+            check_unpack_length(i, count)
+        items_w[i] = w_item
+    if w_iter.next() is not None:
+        check_unpack_length(count + 1, count)
+    return items_w
+
+
+FRAME_FREELIST_SIZE = 32
+
+
+def allocate_frame(code):
+    """Return a fresh frame for code, reusing a finished one if the
+    interpreter kept one around.  Under the JIT frames are always newly
+    allocated, so that they stay virtual."""
+    if not jit.we_are_jitted():
+        free_frames = code._free_frames
+        if free_frames:
+            frame = free_frames.pop()
+            # a reused frame is not fresh for the JIT like a new one.
+            # reset() writes its virtualizable fields from outside the JIT,
+            # which forces the frame if machine code still has it and
+            # clears its token before it can reach the portal again
+            frame.reset()
+            return frame
+    return PyFrame(code)
+
+
+def release_frame(frame):
+    """Hand a frame that returned back to allocate_frame, which resets it.
+    Only frames of functions are reused, the namespace of a class body
+    outlives it."""
+    if jit.we_are_jitted():
+        return
+    code = frame.code
+    if not code.co_flags & CO_OPTIMIZED:
+        return
+    free_frames = code._free_frames
+    if len(free_frames) < FRAME_FREELIST_SIZE:
+        free_frames.append(frame)
+
+
+class OpcodeDispatchTable(object):
+    """Opcode-indexed table of handlers.  Every handler has the signature
+    handler(frame, oparg, next_instr) and returns the number of the next
+    instruction to execute, or a negative number once the frame returned."""
+
+    _immutable_fields_ = ["handlers[*]"]
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+
+
+# opcode methods that compute the next instruction themselves, all other
+# methods fall through to the following instruction
+CONTROL_FLOW_OPCODES = [
+    "RETURN_VALUE",
+    "JUMP_IF_TRUE_OR_POP",
+    "JUMP_IF_FALSE_OR_POP",
+    "POP_JUMP_IF_TRUE",
+    "POP_JUMP_IF_FALSE",
+    "JUMP_ABSOLUTE",
+    "JUMP_FORWARD",
+    "FOR_ITER",
+    "BREAK_LOOP",
+    "INT_COMPARE_OP__POP_JUMP_IF_FALSE",
+    "INT_COMPARE_OP__POP_JUMP_IF_TRUE",
+] + SUPERINSTRUCTION_NAMES
+
+
+@not_rpython
+def _make_fallthrough_handler(name):
+    def opimpl(frame, oparg, next_instr):
+        getattr(frame, name)(oparg, next_instr)
+        return next_instr
+
+    return func_with_new_name(opimpl, "opcode_impl_for_%s" % name)
+
+
+@not_rpython
+def _make_control_flow_handler(name):
+    def opimpl(frame, oparg, next_instr):
+        return getattr(frame, name)(oparg, next_instr)
+
+    return func_with_new_name(opimpl, "opcode_impl_for_%s" % name)
+
+
+@not_rpython
+def _make_missing_handler(name):
+    def opimpl(frame, oparg, next_instr):
+        raise OpcodeNotImplementedError(name)
+
+    return func_with_new_name(opimpl, "opcode_missing_%s" % name)
+
+
+@not_rpython
+def build_dispatch_table():
+    handlers = [None] * 256
+    for opcode in range(256):
+        name = opname[opcode]
+        if name in CONTROL_FLOW_OPCODES:
+            handlers[opcode] = _make_control_flow_handler(name)
+        elif name in opmap and hasattr(PyFrame, name):
+            handlers[opcode] = _make_fallthrough_handler(name)
+        else:
+            handlers[opcode] = _make_missing_handler(name)
+    return OpcodeDispatchTable(handlers)
+
+
+dispatch_table = build_dispatch_table()
 
 
 def get_printable_location(next_instr, code):
-    opcode = ord(code.co_code[next_instr])
+    opcode = code.co_opcodes[next_instr]
     name = opname[opcode]
     return '%s #%d %s' % (code.getrepr(), next_instr, name)
 
@@ -953,6 +1309,8 @@ jitdriver = JitDriver(
     reds=["valuestackdepth", "self"],
     virtualizables=["self"],
     get_printable_location=get_printable_location,
+    is_recursive=True,
+    name="minipypy",
 )
 
 if __name__ == "__main__":
@@ -962,6 +1320,6 @@ if __name__ == "__main__":
 
     setup_prebuilt()
 
-    code = rpy_load_py2(sys.argv[1])
+    code = rpy_load_module(sys.argv[1])
     pyframe = PyFrame(code)
     w_x = pyframe.interpret()
@@ -0,0 +1,146 @@
+"""Statistics about what the JIT did, collected through RPython's JIT hooks
+and printed by --jit-stats.
+
+The loop/bridge/abort numbers come from the hooks and are always
+available.  The tracing and backend times are read from the JIT profiler,
+which is only present when translating with --jit-profiler=on; otherwise
+they are reported as zero.
+"""
+
+import time
+
+from rpython.jit.metainterp.resoperation import rop
+from rpython.rlib import jit_hooks
+from rpython.rlib.jit import Counters, JitHookInterface
+from rpython.rlib.objectmodel import compute_unique_id
+
+from minipypy.objects.mapobject import mapstats
+
+
+class JitStats(object):
+    def __init__(self):
+        self.enabled = False
+        self.start_time = 0.0
+        self.loops = 0
+        self.entry_bridges = 0
+        self.bridges = 0
+        # bridge number (as used by the backend's debug counters) -> the
+        # location of the guard that failed often enough to get a bridge
+        self.bridge_locations = {}
+        # location -> number of bridges attached to guards there
+        self.bridges_by_location = {}
+        # (reason, location) -> number of aborted traces
+        self.aborts = {}
+
+    def enable(self):
+        self.enabled = True
+        self.start_time = time.time()
+        # make the backend count how often every loop and bridge is entered
+        jit_hooks.stats_set_debug(None, True)
+
+    def record_loop(self, kind):
+        if kind == "entry bridge":
+            self.entry_bridges += 1
+        else:
+            self.loops += 1
+
+    def record_bridge(self, number, location):
+        self.bridges += 1
+        self.bridge_locations[number] = location
+        self.bridges_by_location[location] = (
+            self.bridges_by_location.get(location, 0) + 1)
+
+    def record_abort(self, reason, location):
+        key = (reason, location)
+        self.aborts[key] = self.aborts.get(key, 0) + 1
+
+    def guard_failures(self):
+        """Return a dict location -> number of times the guards there
+        failed and continued into their bridge."""
+        failures = {}
+        ll_times = jit_hooks.stats_get_loop_run_times(None)
+        if ll_times:
+            for i in range(len(ll_times)):
+                if ll_times[i].type != 'b':
+                    continue
+                location = self.bridge_locations.get(ll_times[i].number, "?")
+                failures[location] = (failures.get(location, 0) +
+                                      ll_times[i].counter)
+        return failures
+
+    def report(self):
+        total = time.time() - self.start_time
+        tracing = jit_hooks.stats_get_times_value(None, Counters.TRACING)
+        backend = jit_hooks.stats_get_times_value(None, Counters.BACKEND)
+        print("JIT statistics:")
+        print("  loops compiled:         %d" % self.loops)
+        print("  entry bridges compiled: %d" % self.entry_bridges)
+        print("  bridges compiled:       %d" % self.bridges)
+        print("  total time:             %f s" % total)
+        print("  tracing time:           %f s" % tracing)
+        print("  backend time:           %f s" % backend)
+        print("  interpreter and machine code: %f s" %
+              (total - tracing - backend))
+        print("  maps created:           %d" % mapstats.maps)
+        print("  map transitions:        %d" % mapstats.transitions)
+        print("  map lookup dicts:       %d" % mapstats.lookups)
+        failures = self.guard_failures()
+        if failures:
+            print("  guard failures:")
+            for location, count in failures.items():
+                print("    %s  %s" % (rjust(count, 8), location))
+        if self.bridges_by_location:
+            print("  bridges per location:")
+            for location, count in self.bridges_by_location.items():
+                print("    %s  %s" % (rjust(count, 8), location))
+        if self.aborts:
+            print("  aborted traces:")
+            for key, count in self.aborts.items():
+                reason, location = key
+                print("    %s  %s  %s" % (rjust(count, 8), reason, location))
+
+
+jitstats = JitStats()
+
+
+def rjust(count, width):
+    """count right-aligned in width columns; RPython's % formatting takes
+    no widths."""
+    s = str(count)
+    if len(s) < width:
+        s = " " * (width - len(s)) + s
+    return s
+
+
+def bridge_location(debug_info):
+    """The location of the guard a bridge starts from, i.e. the first
+    debug_merge_point in the bridge."""
+    for op in debug_info.operations:
+        if op.getopnum() == rop.DEBUG_MERGE_POINT:
+            jd_sd = debug_info.jitdriver_sd
+            return jd_sd.warmstate.get_location_str(op.getarglist()[3:])
+    return "?"
+
+
+class MiniPyPyJitHooks(JitHookInterface):
+    def on_abort(self, reason, jitdriver, greenkey, greenkey_repr, logops,
+                 operations):
+        if jitstats.enabled:
+            jitstats.record_abort(Counters.counter_names[reason],
+                                  greenkey_repr)
+
+    def on_trace_too_long(self, jitdriver, greenkey, greenkey_repr):
+        if jitstats.enabled:
+            jitstats.record_abort("TRACE_TOO_LONG", greenkey_repr)
+
+    def after_compile(self, debug_info):
+        if jitstats.enabled:
+            jitstats.record_loop(debug_info.type)
+
+    def after_compile_bridge(self, debug_info):
+        if jitstats.enabled:
+            jitstats.record_bridge(compute_unique_id(debug_info.fail_descr),
+                                   bridge_location(debug_info))
+
+
+jit_hooks_iface = MiniPyPyJitHooks()
@@ -7,15 +7,25 @@ from rpython.rlib.rsre import rsre_re as re
 from rpython.memory.gc.base import GCBase
 from rpython.memory.gc.hook import GcHooks
 
-from minipypy.frontend import rpy_load_py2
+from minipypy.frontend import rpy_load_module
 from minipypy.interpret import PyFrame
+from minipypy.jitstats import jitstats
 from minipypy.objects.baseobject import setup_prebuilt
 
+JIT_USAGE = """\
+--jit param=value[,param=value...] or --jit off, where param is one of
+  threshold           number of loop iterations before a loop is traced
+  function_threshold  number of calls before a function is traced from its
+                      entry (recursive functions without loops rely on it)
+  trace_limit         maximal length of a trace
+  (see rpython.rlib.jit.PARAMETER_DOCS for the full list)"""
+
 
 def entry_point(argv):
     setup_prebuilt()
 
     is_gc_stats = False
+    is_jit_stats = False
 
     i = 0
     while True:
@@ -27,15 +37,29 @@ def entry_point(argv):
                 print("missing argument after --jit")
                 return 2
             jitarg = argv[i + 1]
-            jit.set_user_param(None, jitarg)
+            try:
+                jit.set_user_param(None, jitarg)
+            except ValueError:
+                print("invalid argument after --jit: %s" % jitarg)
+                print(JIT_USAGE)
+                return 2
             del argv[i : i + 2]
             continue
+        if argv[i] == "--jit-stats":
+            is_jit_stats = True
+            del argv[i]
+            continue
         i += 1
 
-    code = rpy_load_py2(argv[1])
+    if is_jit_stats:
+        jitstats.enable()
+
+    code = rpy_load_module(argv[1])
     pyframe = PyFrame(code)
     w_x = pyframe.interpret()
 
+    if is_jit_stats:
+        jitstats.report()
     return 0
 
 
@@ -49,8 +73,9 @@ def target(driver, _args):
 
 def jitpolicy(_driver):
     from rpython.jit.codewriter.policy import JitPolicy  # pylint: disable=import-error
+    from minipypy.jitstats import jit_hooks_iface
 
-    return JitPolicy()
+    return JitPolicy(jit_hooks_iface)
 
 
 if __name__ == "__main__":
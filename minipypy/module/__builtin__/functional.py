@@ -1,11 +1,15 @@
-from minipypy.objects.baseobject import W_IntObject, W_FloatObject
-from minipypy.objects.error import oefmt, W_TypeError
+from minipypy.objects.baseobject import (
+    W_Root, W_IntObject, W_LongObject, W_FloatObject
+)
+from minipypy.objects.error import (
+    oefmt, W_TypeError, W_ValueError, W_OverflowError
+)
 from minipypy.objects.listobject import newlist
 from rpython.rlib import jit, rarithmetic
 from rpython.rlib.objectmodel import specialize
 from rpython.rlib.rarithmetic import r_uint, intmask
 
-def get_len_of_range(space, lo, hi, step):
+def get_len_of_range(lo, hi, step):
     """
     Return number of items in range/xrange (lo, hi, step).
     Raise ValueError if step == 0 and OverflowError if the true value is too
@@ -23,7 +27,7 @@ def get_len_of_range(space, lo, hi, step):
     # hi-lo-1 = M-(-M-1)-1 = 2*M.  Therefore unsigned long has enough
     # precision to compute the RHS exactly.
     if step == 0:
-        raise oefmt(space.w_ValueError, "step argument must not be zero")
+        raise oefmt(W_ValueError, "step argument must not be zero")
     elif step < 0:
         lo, hi, step = hi, lo, -step
     if lo < hi:
@@ -32,47 +36,105 @@ def get_len_of_range(space, lo, hi, step):
         diff = uhi - ulo - 1
         n = intmask(diff // r_uint(step) + 1)
         if n < 0:
-            raise oefmt(space.w_OverflowError, "result has too many items")
+            raise oefmt(W_OverflowError, "result has too many items")
     else:
         n = 0
     return n
 
-def range_int(space, w_x, w_y=None, w_step=None):
+def unwrap_range_arg(fname, what, w_x):
+    if isinstance(w_x, W_IntObject):
+        return w_x.value
+    if isinstance(w_x, W_LongObject):
+        return w_x.toint()
+    if isinstance(w_x, W_FloatObject):
+        raise oefmt(W_TypeError,
+                    "%s() integer %s argument expected, got float." % (
+                        fname, what))
+    raise oefmt(W_TypeError,
+                "%s() integer %s argument expected." % (fname, what))
+
+
+def unwrap_range_args(fname, args_w):
+    """(start, stop, step) from the arguments of range() or xrange()."""
+    if len(args_w) == 1:
+        return 0, unwrap_range_arg(fname, "end", args_w[0]), 1
+    if len(args_w) == 2:
+        return (unwrap_range_arg(fname, "start", args_w[0]),
+                unwrap_range_arg(fname, "end", args_w[1]), 1)
+    if len(args_w) == 3:
+        return (unwrap_range_arg(fname, "start", args_w[0]),
+                unwrap_range_arg(fname, "end", args_w[1]),
+                unwrap_range_arg(fname, "step", args_w[2]))
+    raise oefmt(W_TypeError,
+                "%s expected 1 to 3 arguments, got %d" % (fname, len(args_w)))
+
+
+def range_int(args_w):
     """Return a list of integers in arithmetic position from start (defaults
 to zero) to stop - 1 by step (defaults to 1).  Use a negative step to
 get a list in decending order."""
-
-    if w_y is None:
-        w_start = W_IntObject(0)
-        w_stop = w_x
-    else:
-        w_start = w_x
-        w_stop = w_y
-
-    if isinstance(w_stop, W_FloatObject):
-        raise oefmt(w_TypeError,
-                    "range() integer end argument expected, got float.")
-    if isinstance(w_start, W_FloatObject):
-        raise oefmt(w_TypeError,
-                    "range() integer start argument expected, got float.")
-    if isinstance(w_step, W_FloatObject):
-        raise oefmt(w_TypeError,
-                    "range() integer step argument expected, got float.")
-
-    w_start = w_start.toint()
-    w_stop = sw_stop.toint()
-    w_step = w_step.toint()
-
-    # TODO: should check ovf err
-    start = W_IntObject(w_start)
-    stop = W_IntObject(w_stop)
-    step = W_IntObject(w_step)
-
-    howmany = get_len_of_range(space, start, stop, step)
+    start, stop, step = unwrap_range_args("range", args_w)
+    howmany = get_len_of_range(start, stop, step)
 
     res_w = [None] * howmany
     v = start
     for idx in range(howmany):
-        res_w[idx] = space.newint(v)
+        res_w[idx] = W_IntObject(v)
         v += step
     return newlist(res_w)
+
+
+def xrange_int(args_w):
+    """Like range(), but return a lazy sequence instead of a list."""
+    start, stop, step = unwrap_range_args("xrange", args_w)
+    return W_XRange(start, get_len_of_range(start, stop, step), step)
+
+
+class W_XRange(W_Root):
+    _immutable_fields_ = ['start', 'len', 'step']
+
+    def __init__(self, start, len, step):
+        self.start = start
+        self.len = len
+        self.step = step
+
+    def getrepr(self):
+        if self.len == 0:
+            return "xrange(0)"
+        stop = self.start + self.len * self.step
+        if self.start == 0 and self.step == 1:
+            return "xrange(%d)" % (stop,)
+        if self.step == 1:
+            return "xrange(%d, %d)" % (self.start, stop)
+        return "xrange(%d, %d, %d)" % (self.start, stop, self.step)
+
+    def __repr__(self):
+        return self.getrepr()
+
+    def is_true(self):
+        return self.len != 0
+
+    def iter(self):
+        return W_XRangeIterator(self.start, self.len, self.step)
+
+
+class W_XRangeIterator(W_Root):
+    """Produces the integers of a range one at a time.  It only holds
+    three machine integers, so the JIT can keep it virtual when it does
+    not escape the loop."""
+
+    def __init__(self, current, remaining, step):
+        self.current = current
+        self.remaining = remaining
+        self.step = step
+
+    def iter(self):
+        return self
+
+    def next(self):
+        if self.remaining <= 0:
+            return None
+        item = self.current
+        self.current = item + self.step
+        self.remaining -= 1
+        return W_IntObject(item)
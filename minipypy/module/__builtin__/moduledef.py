@@ -1,7 +1,56 @@
 from minipypy.objects import module
+from minipypy.objects.baseobject import W_BoolObject, W_NoneObject, W_StrObject
+from minipypy.objects.function import W_BuiltinFunction
+
+from rpython.rlib.objectmodel import not_rpython
+
+
+@not_rpython
+def resolve_interpleveldef(spec):
+    """'functional.range_int' -> the function range_int of the
+    functional submodule of this package."""
+    modname, funcname = spec.split('.')
+    mod = __import__('minipypy.module.__builtin__.' + modname,
+                     None, None, [funcname])
+    return getattr(mod, funcname)
+
 
 class Module(module.Module):
 
     interpleveldefs = {
-        'range'         : 'functional.range_int'
+        'range'         : 'functional.range_int',
+        'xrange'        : 'functional.xrange_int',
+        'len'           : 'operation.builtin_len',
+        'iter'          : 'operation.builtin_iter',
+    }
+
+    # used instead when the result is directly iterated over
+    iterationdefs = {
+        'range'         : 'functional.xrange_int',
     }
+
+    constants = {
+        'None'          : W_NoneObject.W_None,
+        'True'          : W_BoolObject.W_True,
+        'False'         : W_BoolObject.W_False,
+    }
+
+    def __init__(self):
+        module.Module.__init__(self, W_StrObject("__builtin__"))
+        for name, w_value in self.constants.items():
+            self.w_dict.setitem(W_StrObject(name), w_value)
+        self.install_interpleveldefs()
+
+    @not_rpython
+    def install_interpleveldefs(self):
+        for name, spec in self.interpleveldefs.items():
+            func_for_iteration = None
+            if name in self.iterationdefs:
+                func_for_iteration = resolve_interpleveldef(
+                    self.iterationdefs[name])
+            w_func = W_BuiltinFunction(name, resolve_interpleveldef(spec),
+                                       func_for_iteration)
+            self.w_dict.setitem(W_StrObject(name), w_func)
+
+
+builtin_module = Module()
@@ -0,0 +1,18 @@
+from minipypy.objects.baseobject import W_IntObject
+from minipypy.objects.error import oefmt, W_TypeError
+
+
+def builtin_len(args_w):
+    if len(args_w) != 1:
+        raise oefmt(W_TypeError,
+                    "len() takes exactly one argument (%d given)" % (
+                        len(args_w),))
+    return W_IntObject(args_w[0].length())
+
+
+def builtin_iter(args_w):
+    if len(args_w) != 1:
+        raise oefmt(W_TypeError,
+                    "iter() takes exactly one argument (%d given)" % (
+                        len(args_w),))
+    return args_w[0].iter()
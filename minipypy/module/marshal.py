@@ -1,8 +1,9 @@
 from rpython.rlib.rarithmetic import intmask
+from rpython.rlib.rstruct.runpack import runpack
 
 from minipypy.objects.pycode import PyCode
 from minipypy.objects.baseobject import *
-from minipypy.objects.tupleobject import W_TupleObject
+from minipypy.objects.tupleobject import newtuple
 from minipypy.objects.listobject import W_ListObject
 
 TYPE_NULL = "0"
@@ -79,6 +80,10 @@ def get_lng(f):
         raise Exception("bad marshal data")
 
 
+def get_binary_float(f):
+    return runpack("<d", f.read(8))
+
+
 def atom_lng(f, typecode):
     start(f, typecode)
     return get_lng(f)
@@ -121,8 +126,12 @@ def get_list_w(self):
 def dispatch(tc, f):
     if tc == TYPE_INT:
         return unmarshal_int(f)
+    elif tc == TYPE_INT64:
+        return unmarshal_int64(f)
     elif tc == TYPE_LONG:
         return unmarshal_lng(f)
+    elif tc == TYPE_BINARY_FLOAT:
+        return W_FloatObject(get_binary_float(f))
     elif tc == TYPE_STRING:
         return W_StrObject.from_str(get_str(f))
     elif tc == TYPE_INTERNED:
@@ -140,7 +149,7 @@ def dispatch(tc, f):
 
 
 def unmarshal_tuple(f):
-    return W_TupleObject(get_tuple(f))
+    return newtuple(get_tuple(f))
 
 
 def unmarshal_interned_str(f):
@@ -170,6 +179,11 @@ def unmarshal_int(f):
     return W_IntObject(get_int(f))
 
 
+def unmarshal_int64(f):
+    # ints that do not fit in 32 bits
+    return W_IntObject(runpack("<q", f.read(8)))
+
+
 def unmarshal_lng(f):
     from rpython.rlib.rbigint import rbigint
 
@@ -1,6 +1,15 @@
+import math
+
 from rpython.rlib import jit
 from rpython.rlib.rbigint import rbigint
-from rpython.rlib.objectmodel import instantiate, compute_hash
+from rpython.rlib.objectmodel import (
+    instantiate, compute_hash, compute_identity_hash
+)
+from rpython.rlib.rarithmetic import (
+    LONG_BIT, intmask, ovfcheck, ovfcheck_float_to_int
+)
+
+from minipypy.objects.error import W_ValueError, W_ZeroDivisionError
 
 prebuilt_from = 0
 prebuilt_to = 100
@@ -22,6 +31,46 @@ class W_Root(object):
     def is_none(self):
         return False
 
+    def is_tuple(self):
+        return False
+
+    def iter(self):
+        raise WObjectOperationException("object is not iterable")
+
+    def next(self):
+        """Return the next item of an iterator, or None once it is
+        exhausted."""
+        raise WObjectOperationException("object is not an iterator")
+
+    def inplace_add(self, w_other):
+        return self.add(w_other)
+
+    def inplace_mul(self, w_other):
+        return self.mul(w_other)
+
+    def eq(self, w_other):
+        return W_BoolObject.from_bool(self is w_other)
+
+    def ne(self, w_other):
+        return W_BoolObject.from_bool(not self.eq(w_other).is_true())
+
+    def contains(self, w_item):
+        raise WObjectOperationException("argument is not iterable")
+
+    def length(self):
+        raise WObjectOperationException("object has no len()")
+
+    def store_subscr(self, w_index, w_value):
+        raise WObjectOperationException(
+            "object does not support item assignment")
+
+    def delete_subscr(self, w_index):
+        raise WObjectOperationException(
+            "object does not support item deletion")
+
+    def hash(self):
+        return compute_identity_hash(self)
+
 
 class W_NoneObject(W_Root):
     _immutable_fields_ = ["value"]
@@ -41,6 +90,9 @@ class W_NoneObject(W_Root):
     def is_none(self):
         return True
 
+    def hash(self):
+        return 0
+
     @jit.elidable
     def unwrap(self):
         return None
@@ -71,16 +123,28 @@ class W_BoolObject(W_Root):
 
     def not_(self):
         if self.value:
-            return W_BoolObject(False)
+            return W_BoolObject.W_False
         else:
-            return W_BoolObject(True)
+            return W_BoolObject.W_True
 
     @staticmethod
     def from_bool(boolprim):
         if boolprim:
-            return W_BoolObject(True)
+            return W_BoolObject.W_True
         else:
-            return W_BoolObject(False)
+            return W_BoolObject.W_False
+
+    def eq(self, other):
+        if isinstance(other, W_BoolObject):
+            return W_BoolObject.from_bool(self.value == other.value)
+        if (isinstance(other, W_IntObject) or
+                isinstance(other, W_FloatObject) or
+                isinstance(other, W_LongObject)):
+            return other.eq(self)
+        return W_BoolObject.W_False
+
+    def hash(self):
+        return int(self.value)
 
     @jit.elidable
     def unwrap(self):
@@ -118,7 +182,10 @@ class W_IntObject(W_Root):
         return str(self.value)
 
     def is_true(self):
-        return self.value == 0
+        return self.value != 0
+
+    def hash(self):
+        return self.value
 
     @staticmethod
     def from_int(i):
@@ -127,63 +194,118 @@ class W_IntObject(W_Root):
         return w_result
 
     def positive(self):
-        return W_IntObject(+self.value)
+        return self
 
     def negative(self):
-        return W_IntObject(-self.value)
+        x = self.value
+        try:
+            return W_IntObject(ovfcheck(-x))
+        except OverflowError:
+            return W_LongObject(rbigint.fromint(x).neg())
 
     def not_(self):
         if self.value == 0:
             return W_BoolObject.W_True
         return W_BoolObject.W_False
 
+    # The arithmetic works on machine ints and only turns to rbigint when
+    # the result overflows, or when the other operand is a long.
+
     def add(self, other):
+        x = self.value
         if isinstance(other, W_IntObject):
-            x = self.value
             y = other.value
-            return W_IntObject(x + y)
+            try:
+                return W_IntObject(ovfcheck(x + y))
+            except OverflowError:
+                return W_LongObject(rbigint.fromint(x).int_add(y))
         elif isinstance(other, W_LongObject):
-            x = self.value
-            y = other.value
-            return W_LongObject(rbigint.fromint(x).add(y))
+            return newlong(other.value.int_add(x))
         else:
             raise WObjectOperationException("Unexpected object: %s" % (other))
 
     def sub(self, other):
+        x = self.value
         if isinstance(other, W_IntObject):
-            return W_IntObject(self.value - other.value)
+            y = other.value
+            try:
+                return W_IntObject(ovfcheck(x - y))
+            except OverflowError:
+                return W_LongObject(rbigint.fromint(x).int_sub(y))
         elif isinstance(other, W_LongObject):
-            return W_LongObject(rbigint.fromint(self.value).sub(other.value))
+            return newlong(other.value.neg().int_add(x))
         else:
             raise WObjectOperationException("Unexpected object: %s" % (other))
 
     def mul(self, other):
+        x = self.value
         if isinstance(other, W_IntObject):
-            return W_IntObject(self.value * other.value)
+            y = other.value
+            try:
+                return W_IntObject(ovfcheck(x * y))
+            except OverflowError:
+                return W_LongObject(rbigint.fromint(x).int_mul(y))
         elif isinstance(other, W_LongObject):
-            return W_LongObject(rbigint.fromint(self.value).mul(other.value))
+            return newlong(other.value.int_mul(x))
         else:
             raise WObjectOperationException("Unexpected object: %s" % (other))
 
     def div(self, other):
+        """Floor division, what / does on ints in Python 2."""
+        x = self.value
         if isinstance(other, W_IntObject):
-            return W_IntObject(self.value / other.value)
+            y = other.value
+            if y == 0:
+                raise W_ZeroDivisionError("integer division by zero")
+            try:
+                return W_IntObject(ovfcheck(x // y))
+            except OverflowError:
+                # only -sys.maxint-1 // -1
+                return W_LongObject(rbigint.fromint(x).neg())
         elif isinstance(other, W_LongObject):
-            return W_LongObject(rbigint.fromint(self.value).div(other.value))
+            return W_LongObject.from_int(x).div(other)
         else:
             raise WObjectOperationException("Unexpected object: %s" % (other))
 
     def true_div(self, other):
-        return self.div(other)
+        if isinstance(other, W_IntObject):
+            y = other.value
+            if y == 0:
+                raise W_ZeroDivisionError("division by zero")
+            return W_FloatObject(float(self.value) / float(y))
+        elif isinstance(other, W_LongObject):
+            return W_LongObject.from_int(self.value).true_div(other)
+        else:
+            raise WObjectOperationException("Unexpected object: %s" % (other))
 
     def mod(self, other):
         x = self.value
         if isinstance(other, W_IntObject):
             y = other.value
-            return W_IntObject(x % y)
+            if y == 0:
+                raise W_ZeroDivisionError("integer modulo by zero")
+            try:
+                return W_IntObject(ovfcheck(x % y))
+            except OverflowError:
+                # only -sys.maxint-1 % -1
+                return W_IntObject(0)
+        elif isinstance(other, W_LongObject):
+            return W_LongObject.from_int(x).mod(other)
+        else:
+            raise WObjectOperationException("Unexpected object: %s" % (other))
+
+    def power(self, other):
+        x = self.value
+        if isinstance(other, W_IntObject):
+            y = other.value
+            if y < 0:
+                return W_FloatObject(math.pow(float(x), float(y)))
+            try:
+                return W_IntObject(int_pow(x, y))
+            except OverflowError:
+                return W_LongObject(rbigint.fromint(x).pow(rbigint.fromint(y)))
         elif isinstance(other, W_LongObject):
-            y = other.value.toint()
-            return W_IntObject(x % y)
+            return W_LongObject.from_int(x).power(other)
         else:
             raise WObjectOperationException("Unexpected object: %s" % (other))
 
@@ -191,10 +313,15 @@ class W_IntObject(W_Root):
         x = self.value
         if isinstance(other, W_IntObject):
             y = other.value
-            return W_IntObject(x << y)
+            if y < 0:
+                raise W_ValueError("negative shift count")
+            if y < LONG_BIT:
+                z = intmask(x << y)
+                if z >> y == x:
+                    return W_IntObject(z)
+            return W_LongObject(rbigint.fromint(x).lshift(y))
         elif isinstance(other, W_LongObject):
-            y = other.value.toint()
-            return W_IntObject(x << y)
+            return W_LongObject.from_int(x).lshift(other)
         else:
             raise WObjectOperationException("Unexpected object: %s" % (other))
 
@@ -202,21 +329,26 @@ class W_IntObject(W_Root):
         x = self.value
         if isinstance(other, W_IntObject):
             y = other.value
+            if y < 0:
+                raise W_ValueError("negative shift count")
+            if y >= LONG_BIT:
+                y = LONG_BIT - 1
             return W_IntObject(x >> y)
         elif isinstance(other, W_LongObject):
-            y = other.value.toint()
-            return W_IntObject(x >> y)
+            return W_LongObject.from_int(x).rshift(other)
         else:
             raise WObjectOperationException("Unexpected object: %s" % (other))
 
     def eq(self, other):
-        if isinstance(other, W_NoneObject):
-            return W_BoolObject.W_False
         if isinstance(other, W_IntObject):
             return W_BoolObject.from_bool(self.value == other.value)
         if isinstance(other, W_LongObject):
-            return W_BoolObject.from_bool(self.value == other.value.toint())
-        return W_BoolObject.W_True
+            return W_BoolObject.from_bool(other.value.int_eq(self.value))
+        if isinstance(other, W_BoolObject):
+            return W_BoolObject.from_bool(self.value == int(other.value))
+        if isinstance(other, W_FloatObject):
+            return W_BoolObject.from_bool(float(self.value) == other.value)
+        return W_BoolObject.W_False
 
     def lt(self, other):
         if isinstance(other, W_NoneObject):
@@ -224,14 +356,14 @@ class W_IntObject(W_Root):
         if isinstance(other, W_IntObject):
             return W_BoolObject.from_bool(self.value < other.value)
         if isinstance(other, W_LongObject):
-            return W_BoolObject.from_bool(self.value < other.value.toint())
+            return W_BoolObject.from_bool(other.value.int_gt(self.value))
         return W_BoolObject.W_True
 
     def le(self, other):
         if isinstance(other, W_IntObject):
             return W_BoolObject.from_bool(self.value <= other.value)
         if isinstance(other, W_LongObject):
-            return W_BoolObject.from_bool(self.value <= other.value.toint())
+            return W_BoolObject.from_bool(other.value.int_ge(self.value))
         if isinstance(other, W_NoneObject):
             return W_BoolObject.W_False
         return W_BoolObject.W_True
@@ -242,7 +374,7 @@ class W_IntObject(W_Root):
         if isinstance(other, W_IntObject):
             return W_BoolObject.from_bool(self.value > other.value)
         if isinstance(other, W_LongObject):
-            return W_BoolObject.from_bool(self.value > other.value.toint())
+            return W_BoolObject.from_bool(other.value.int_lt(self.value))
         return W_BoolObject.W_True
 
     def ge(self, other):
@@ -251,14 +383,36 @@ class W_IntObject(W_Root):
         if isinstance(other, W_IntObject):
             return W_BoolObject.from_bool(self.value >= other.value)
         if isinstance(other, W_LongObject):
-            return W_BoolObject.from_bool(self.value >= other.value.toint())
+            return W_BoolObject.from_bool(other.value.int_le(self.value))
         return W_BoolObject.W_True
 
 
+def int_pow(x, y):
+    """x ** y for y >= 0 by repeated squaring, raising OverflowError when
+    the result does not fit in a machine int."""
+    result = 1
+    while y > 0:
+        if y & 1:
+            result = ovfcheck(result * x)
+        y >>= 1
+        if y > 0:
+            x = ovfcheck(x * x)
+    return result
+
+
 class W_FloatObject(W_Root):
     _immutable_fields_ = ["value"]
     PREBUILT = []
 
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return self.getrepr()
+
+    def getrepr(self):
+        return str(self.value)
+
     def toint(self):
         return self.value
 
@@ -270,7 +424,22 @@ class W_FloatObject(W_Root):
         return str(self.value)
 
     def is_true(self):
-        return self.value == 0
+        return self.value != 0
+
+    def eq(self, other):
+        if isinstance(other, W_FloatObject):
+            return W_BoolObject.from_bool(self.value == other.value)
+        if isinstance(other, W_IntObject):
+            return W_BoolObject.from_bool(self.value == float(other.value))
+        if isinstance(other, W_BoolObject):
+            return W_BoolObject.from_bool(self.value == float(other.value))
+        if isinstance(other, W_LongObject):
+            return W_BoolObject.from_bool(
+                float_eq_bigint(self.value, other.value))
+        return W_BoolObject.W_False
+
+    def hash(self):
+        return hash_float(self.value)
 
     @staticmethod
     def from_int(i):
@@ -354,98 +523,113 @@ class W_LongObject(W_Root):
         return str(self.value)
 
     def getrepr(self):
-        return "%dL" % (self.value.toint())
+        return self.value.str() + "L"
 
     def is_true(self):
-        if self.value.toint() == 0:
-            return False
-        return True
+        return self.value.tobool()
+
+    def hash(self):
+        return self.value.hash()
 
     def not_(self):
-        if self.value.toint() == 0:
+        if self.value.tobool():
             return W_BoolObject.W_False
         return W_BoolObject.W_True
 
     @jit.elidable
     def positive(self):
-        return W_LongObject(self.value.abs())
+        return self
 
     @jit.elidable
     def negative(self):
-        return W_LongObject(self.value.neg())
+        return newlong(self.value.neg())
+
+    # The results of the arithmetic go through newlong(), so a value that
+    # fits in a machine int goes back to a W_IntObject.
 
     def add(self, other):
         if isinstance(other, W_IntObject):
-            return W_LongObject(self.value.add(rbigint.fromint(other.value)))
+            return newlong(self.value.int_add(other.value))
         if isinstance(other, W_LongObject):
-            return W_LongObject(self.value.add(other.value))
+            return newlong(self.value.add(other.value))
         raise WObjectOperationException("Unexpected object: %s" % (other))
 
     def sub(self, other):
         if isinstance(other, W_IntObject):
-            return W_LongObject(self.value.sub(rbigint.fromint(other.value)))
+            return newlong(self.value.int_sub(other.value))
         if isinstance(other, W_LongObject):
-            return W_LongObject(self.value.sub(other.value))
+            return newlong(self.value.sub(other.value))
         raise WObjectOperationException("Unexpected object: %s" % (other))
 
     def mul(self, other):
         if isinstance(other, W_IntObject):
-            return W_LongObject(self.value.mul(rbigint.fromint(other.value)))
+            return newlong(self.value.int_mul(other.value))
         elif isinstance(other, W_LongObject):
-            return W_LongObject(self.value.mul(other.value))
+            return newlong(self.value.mul(other.value))
         else:
             raise WObjectOperationException("Unexpected object: %s" % (other))
 
-    def true_div(self, other):
+    def _bigint_of(self, other):
         if isinstance(other, W_IntObject):
-            return W_LongObject(self.value.div(rbigint.fromint(other.value)))
+            return rbigint.fromint(other.value)
         if isinstance(other, W_LongObject):
-            return W_LongObject(self.value.div(other.value))
+            return other.value
         raise WObjectOperationException("Unexpected object: %s" % (other))
 
+    def div(self, other):
+        y = self._bigint_of(other)
+        if not y.tobool():
+            raise W_ZeroDivisionError("long division or modulo by zero")
+        return newlong(self.value.floordiv(y))
+
+    def true_div(self, other):
+        y = self._bigint_of(other)
+        if not y.tobool():
+            raise W_ZeroDivisionError("division by zero")
+        return W_FloatObject(self.value.truediv(y))
+
     def mod(self, other):
-        if isinstance(other, W_IntObject):
-            return W_LongObject(self.value.mod(rbigint.fromint(other.value)))
-        if isinstance(other, W_LongObject):
-            return W_LongObject(self.value.mod(other.value))
-        raise WObjectOperationException("Unexpected object: %s" % (other))
+        y = self._bigint_of(other)
+        if not y.tobool():
+            raise W_ZeroDivisionError("long division or modulo by zero")
+        return newlong(self.value.mod(y))
+
+    def power(self, other):
+        y = self._bigint_of(other)
+        if y.sign < 0:
+            return W_FloatObject(math.pow(self.value.tofloat(), y.tofloat()))
+        return newlong(self.value.pow(y))
 
     def lshift(self, other):
-        if isinstance(other, W_IntObject):
-            y = other.value
-            return W_LongObject(self.value.lshift(y))
-        if isinstance(other, W_LongObject):
-            y = other.value.toint()
-            return W_LongObject(self.value.lshift(y))
-        raise WObjectOperationException("Unexpected object: %s" % (other))
+        shift = self._bigint_of(other).toint()
+        if shift < 0:
+            raise W_ValueError("negative shift count")
+        return newlong(self.value.lshift(shift))
 
     def rshift(self, other):
-        if isinstance(other, W_IntObject):
-            y = other.value
-            return W_LongObject(self.value.rshift(y))
-        if isinstance(other, W_LongObject):
-            y = other.value.toint()
-            return W_LongObject(self.value.rshift(y))
-        raise WObjectOperationException("Unexpected object: %s" % (other))
+        shift = self._bigint_of(other).toint()
+        if shift < 0:
+            raise W_ValueError("negative shift count")
+        return newlong(self.value.rshift(shift))
 
     def eq(self, other):
-        if isinstance(other, W_NoneObject):
-            return W_BoolObject.W_False
         if isinstance(other, W_IntObject):
-            return W_BoolObject.from_bool(
-                self.value.eq(rbigint.fromint(other.value))
-            )
+            return W_BoolObject.from_bool(self.value.int_eq(other.value))
         if isinstance(other, W_LongObject):
             return W_BoolObject.from_bool(self.value.eq(other.value))
+        if isinstance(other, W_BoolObject):
+            return W_BoolObject.from_bool(
+                self.value.int_eq(int(other.value)))
+        if isinstance(other, W_FloatObject):
+            return W_BoolObject.from_bool(
+                float_eq_bigint(other.value, self.value))
         return W_BoolObject.W_False
 
     def lt(self, other):
         if isinstance(other, W_NoneObject):
             return W_BoolObject.W_False
         if isinstance(other, W_IntObject):
-            return W_BoolObject.from_bool(
-                self.value.lt(rbigint.fromint(other.value))
-            )
+            return W_BoolObject.from_bool(self.value.int_lt(other.value))
         if isinstance(other, W_LongObject):
             return W_BoolObject.from_bool(self.value.lt(other.value))
         return W_BoolObject.W_True
@@ -454,9 +638,7 @@ class W_LongObject(W_Root):
         if isinstance(other, W_NoneObject):
             return W_BoolObject.W_False
         if isinstance(other, W_IntObject):
-            return W_BoolObject.from_bool(
-                self.value.le(rbigint.fromint(other.value))
-            )
+            return W_BoolObject.from_bool(self.value.int_le(other.value))
         if isinstance(other, W_LongObject):
             return W_BoolObject.from_bool(self.value.le(other.value))
         return W_BoolObject.W_True
@@ -468,6 +650,15 @@ class W_LongObject(W_Root):
         return other.le(self)
 
 
+def newlong(value):
+    """The result of long arithmetic: a W_IntObject if the rbigint value
+    fits in a machine int, a W_LongObject otherwise."""
+    try:
+        return W_IntObject(value.toint())
+    except OverflowError:
+        return W_LongObject(value)
+
+
 class W_StrObject(W_Root):
     _immutable_fields_ = ["value"]
 
@@ -495,7 +686,10 @@ class W_StrObject(W_Root):
         return str(self.value)
 
     def is_true(self):
-        return self.value is not ""
+        return len(self.value) != 0
+
+    def hash(self):
+        return compute_hash(self.value)
 
     @staticmethod
     def from_str(strval):
@@ -503,7 +697,7 @@ class W_StrObject(W_Root):
         return W_StrObject(strval)
 
     def not_(self):
-        if self.value is "":
+        if len(self.value) == 0:
             return W_BoolObject.W_True
         return W_BoolObject.W_False
 
@@ -585,8 +779,6 @@ class W_StrObject(W_Root):
         return W_BoolObject.W_False
 
     def eq(self, other):
-        if self.value == "":
-            return W_BoolObject.W_False
         if isinstance(other, W_StrObject):
             return W_BoolObject.from_bool(self.value == other.value)
         if isinstance(other, W_IntObject):
@@ -600,6 +792,69 @@ class W_StrObject(W_Root):
     def eq_str(self, other):
         return self.eq(W_StrObject(other))
 
+    def length(self):
+        return len(self.value)
+
+    def contains(self, w_item):
+        if not isinstance(w_item, W_StrObject):
+            raise WObjectOperationException(
+                "'in <string>' requires string as left operand")
+        return self.value.find(w_item.value) >= 0
+
+    def subscr(self, w_index):
+        from minipypy.objects.sliceobject import W_SliceObject
+        if isinstance(w_index, W_SliceObject):
+            start, stop, step, length = w_index.indices4(len(self.value))
+            return self.getslice(start, stop, step, length)
+        assert isinstance(w_index, W_IntObject)
+        index = w_index.value
+        if index < 0:
+            index += len(self.value)
+        if not 0 <= index < len(self.value):
+            raise IndexError
+        return W_StrObject(self.value[index])
+
+    def getslice(self, start, stop, step, length):
+        # strings are immutable and their slices are plain (memcpy'd)
+        # RPython strings; only lists get slice views
+        if step == 1:
+            assert start >= 0
+            stop = start + length
+            assert stop >= 0
+            return W_StrObject(self.value[start:stop])
+        chars = [' '] * length
+        for i in range(length):
+            chars[i] = self.value[start]
+            start += step
+        return W_StrObject("".join(chars))
+
+    def getslice_0(self):
+        return self
+
+    def getslice_1(self, w_start):
+        from minipypy.objects.sliceobject import normalize_index
+        assert isinstance(w_start, W_IntObject)
+        length = len(self.value)
+        start = normalize_index(w_start.value, length)
+        return self.getslice(start, length, 1, length - start)
+
+    def getslice_2(self, w_stop):
+        from minipypy.objects.sliceobject import normalize_index
+        assert isinstance(w_stop, W_IntObject)
+        stop = normalize_index(w_stop.value, len(self.value))
+        return self.getslice(0, stop, 1, stop)
+
+    def getslice_3(self, w_start, w_stop):
+        from minipypy.objects.sliceobject import normalize_index
+        assert isinstance(w_start, W_IntObject)
+        assert isinstance(w_stop, W_IntObject)
+        length = len(self.value)
+        start = normalize_index(w_start.value, length)
+        stop = normalize_index(w_stop.value, length)
+        if stop < start:
+            stop = start
+        return self.getslice(start, stop, 1, stop - start)
+
     def __hash__(self):
         return compute_hash(self.value)
 
@@ -671,6 +926,56 @@ class W_ByteObject(W_Root):
         raise WObjectOperationNotImplemented
 
 
+def is_integral(value):
+    """Whether the float value is a whole number."""
+    return (not math.isinf(value) and not math.isnan(value) and
+            math.floor(value) == value)
+
+
+def float_eq_bigint(value, bigint):
+    """Exact equality between a float and an rbigint, without rounding
+    the rbigint to a float."""
+    if not is_integral(value):
+        return False
+    return rbigint.fromfloat(value).eq(bigint)
+
+
+def hash_float(value):
+    """The hash of a float.  An integral float hashes like the int or long
+    equal to it, as they are equal as dict keys."""
+    if is_integral(value):
+        try:
+            return ovfcheck_float_to_int(value)
+        except OverflowError:
+            return rbigint.fromfloat(value).hash()
+    return compute_hash(value)
+
+
+def is_number(w_obj):
+    return (isinstance(w_obj, W_IntObject) or
+            isinstance(w_obj, W_BoolObject) or
+            isinstance(w_obj, W_FloatObject) or
+            isinstance(w_obj, W_LongObject))
+
+
+def eq_w(w_obj1, w_obj2):
+    """Equality as used by containers: objects of different types are
+    never equal, which keeps the str comparisons from having to deal with
+    foreign operands.  Numbers are the exception, an int, a bool, a float
+    and a long compare by value, and equal numbers hash alike.  So are
+    tuples, whose classes depend on the kinds of their items."""
+    if w_obj1 is w_obj2:
+        return True
+    if type(w_obj1) is not type(w_obj2):
+        if is_number(w_obj1) and is_number(w_obj2):
+            pass
+        elif w_obj1.is_tuple() and w_obj2.is_tuple():
+            pass
+        else:
+            return False
+    return w_obj1.eq(w_obj2).is_true()
+
+
 def setup_prebuilt():
     for i in range(prebuilt_from, prebuilt_to):
         W_IntObject.PREBUILT.append(W_IntObject.from_int(i))
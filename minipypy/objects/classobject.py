@@ -1,10 +1,42 @@
-from minipypy.objects.baseobject import W_Root, W_StrObject
-from minipypy.objects.dictobject import Map, W_Dict
+from minipypy.objects.baseobject import (
+    W_Root, W_BoolObject, W_FloatObject, W_IntObject, W_StrObject,
+    WObjectOperationException, eq_w
+)
+from minipypy.objects.dictobject import VersionTag, W_Dict
+from minipypy.objects.error import W_TypeError
+from minipypy.objects.mapobject import (
+    FIELD_FLOAT, FIELD_INT, FIELD_OBJECT, Map
+)
+
+import weakref
+
+from rpython.rlib.jit import elidable, hint, promote, unroll_safe
+from rpython.rlib.longlong2float import float2longlong, longlong2float
+from rpython.rlib.objectmodel import compute_hash, compute_identity_hash
+from rpython.rlib.rarithmetic import intmask, r_int64, r_uint
+from rpython.rlib.unroll import unrolling_iterable
+
+# the special methods looked up once per class version, by name without
+# the underscores; the slot of __add__ is SlotTable.w_add
+SPECIAL_METHODS = [
+    "add", "sub", "mul", "div", "truediv", "mod", "pow",
+    "lshift", "rshift",
+    "lt", "le", "eq", "ne", "gt", "ge",
+    "getitem", "setitem", "delitem", "contains", "len", "nonzero", "iter",
+]
+unrolling_special_methods = unrolling_iterable(SPECIAL_METHODS)
+SLOT_FIELDS = ["w_" + _name for _name in SPECIAL_METHODS]
 
-from rpython.rlib.jit import elidable, hint, unroll_safe
 
 class W_ClassObject(W_Root):
-    _immutable_fields_ = ["bases_w?[*]", "w_dict?"]
+    """A class.  Its attributes are found along mro_w, the C3 linearization
+    of the class and its bases, computed once.  The quasi-immutable version
+    is replaced whenever the dict of the class or of one of its bases
+    changes, so lookups keyed on the version can be cached in method_cache
+    and are constant-folded by the JIT."""
+
+    _immutable_fields_ = ["bases_w[*]", "mro_w[*]", "w_dict", "version?",
+                          "instance_root", "instances_devolved?"]
 
     def __init__(self, w_name, bases_w, w_dict):
         assert isinstance(w_name, W_StrObject)
@@ -13,6 +45,26 @@ class W_ClassObject(W_Root):
         self.bases_w = bases_w   # base classes tuple
         assert isinstance(w_dict, W_Dict)
         self.w_dict = w_dict     # methods dictionary
+        self.version = VersionTag()
+        self.weak_subclasses = []
+        for w_base in bases_w:
+            assert isinstance(w_base, W_ClassObject)
+            w_base.weak_subclasses.append(weakref.ref(self))
+        self.mro_w = compute_c3_mro(self)
+        # storage sizes of the largest instance seen so far, used to size
+        # the storage of new instances
+        self.instance_num_objects = 0
+        self.instance_num_unboxed = 0
+        # the map instances usually have when their constructor returns,
+        # see observe_constructed
+        self.predicted_map = None
+        self.prediction_confidence = 0
+        # the special methods as of some version, see get_slots
+        self.slots = None
+        # the root of the maps of the instances, and whether there got to
+        # be too many of them, see W_InstanceObject.devolve
+        self.instance_root = Map()
+        self.instances_devolved = False
 
     def __repr__(self):
         return self.getrepr()
@@ -27,57 +79,256 @@ class W_ClassObject(W_Root):
         assert isinstance(attr, str)
         w_dict = self.getdict()
         if w_dict is not None:
-            return w_dict.getitem(attr)
+            return w_dict.getitem_str(attr)
         return None
 
     def instantiate(self):
         return W_InstanceObject(self)
 
+    def observe_instance_map(self, map):
+        if map.num_objects > self.instance_num_objects:
+            self.instance_num_objects = map.num_objects
+        if map.num_unboxed > self.instance_num_unboxed:
+            self.instance_num_unboxed = map.num_unboxed
+
     def find_method(self, attr):
         return self.getdict().getitem(attr)
 
-    @unroll_safe
+    def observe_constructed(self, w_instance):
+        """Called with every instance once its constructor returned.  The
+        predicted map is the majority vote of the maps seen: a different
+        map takes over only after it was seen more often than the current
+        one since."""
+        map = w_instance.map
+        if map is self.predicted_map:
+            if self.prediction_confidence < MAX_PREDICTION_CONFIDENCE:
+                self.prediction_confidence += 1
+        elif self.prediction_confidence > 0:
+            self.prediction_confidence -= 1
+        else:
+            self.predicted_map = map
+            self.prediction_confidence = 1
+
+    def check_instance_maps(self):
+        """Devolve the instances once they have created more than
+        MAX_INSTANCE_MAPS maps, i.e. when they get attributes in many
+        different orders or are used as bags of arbitrary names.  Every
+        map is a new constant for the JIT to guard on, and none of them
+        are ever freed.  The maps are counted where they are created,
+        outside of the elidable lookup of the transitions."""
+        if self.instance_root.tree_size > MAX_INSTANCE_MAPS:
+            self.instances_devolved = True
+        return self.instances_devolved
+
+    @elidable
     def is_subclass_of(self, other):
         assert isinstance(other, W_ClassObject)
-        if self is other:
-            return True
-        for base in self.bases_w:
-            assert isinstance(base, W_ClassObject)
-            if base.is_subclass_of(other):
+        for w_class in self.mro_w:
+            if w_class is other:
                 return True
         return False
 
-    @unroll_safe
+    def mutated(self):
+        """Called when the dict of the class changed: lookups cached for
+        it and for its subclasses are stale."""
+        self.version = VersionTag()
+        for ref in self.weak_subclasses:
+            w_subclass = ref()
+            if w_subclass is not None:
+                w_subclass.mutated()
+
     def lookup(self, attr):
         assert isinstance(attr, str)
-        w_result = self.w_dict.getitem(attr)
-        if w_result is not None:
-            return w_result
-        for base in self.bases_w:
-            assert isinstance(base, W_ClassObject)
-            w_result = base.lookup(attr)
+        return self._pure_lookup(promote(self.version), attr)
+
+    @elidable
+    def _pure_lookup(self, version, attr):
+        return method_cache.lookup(self, version, attr)
+
+    def lookup_in_mro(self, attr):
+        for w_class in self.mro_w:
+            w_result = w_class.w_dict.getitem_str(attr)
             if w_result is not None:
                 return w_result
         return None
 
+    def get_slots(self):
+        """The special methods of the class, from a table that is rebuilt
+        when the version changes.  Constant-folded by the JIT."""
+        return self._get_slots(promote(self.version))
+
+    @elidable
+    def _get_slots(self, version):
+        slots = self.slots
+        if slots is None or slots.version is not version:
+            slots = SlotTable(self, version)
+            self.slots = slots
+        return slots
+
+    def getattr(self, w_name):
+        assert isinstance(w_name, W_StrObject)
+        return self.lookup(w_name.value)
+
+    def setattr(self, w_name, w_value):
+        self.w_dict.setitem(w_name, w_value)
+        self.mutated()
+
+
+class SlotTable(object):
+    """The special methods of a class as of one version of it.  A slot is
+    the function implementing the operation, or None if the class does
+    not define it (or defines it as something other than a function)."""
+
+    _immutable_fields_ = ["version"] + SLOT_FIELDS
+
+    def __init__(self, w_class, version):
+        self.version = version
+        for name in unrolling_special_methods:
+            setattr(self, "w_" + name, find_special_method(w_class, name))
+
+
+def find_special_method(w_class, name):
+    from minipypy.objects.function import W_FunctionObject
+    w_function = w_class.lookup_in_mro("__%s__" % name)
+    if isinstance(w_function, W_FunctionObject):
+        return w_function
+    return None
+
 
-EMPTY_MAP = Map()
+def compute_c3_mro(w_class):
+    """The C3 linearization of w_class: the class, followed by the merge of
+    the linearizations of its bases and the list of the bases."""
+    orderlists = []
+    bases = []
+    for w_base in w_class.bases_w:
+        assert isinstance(w_base, W_ClassObject)
+        orderlists.append(list(w_base.mro_w))
+        bases.append(w_base)
+    orderlists.append(bases)
+    mro_w = [w_class]
+    while True:
+        w_candidate = None
+        for lst in orderlists:
+            if not lst:
+                continue
+            w_candidate = lst[0]
+            # a good candidate is not in the tail of any list
+            for other in orderlists:
+                for i in range(1, len(other)):
+                    if other[i] is w_candidate:
+                        w_candidate = None
+                        break
+                if w_candidate is None:
+                    break
+            if w_candidate is not None:
+                break
+        if w_candidate is None:
+            for lst in orderlists:
+                if lst:
+                    raise W_TypeError(
+                        "Cannot create a consistent method resolution "
+                        "order (MRO) for bases")
+            # mro_w was built by appending, the result is a fixed-size copy
+            return mro_w[:]
+        assert isinstance(w_candidate, W_ClassObject)
+        mro_w.append(w_candidate)
+        for lst in orderlists:
+            if lst and lst[0] is w_candidate:
+                del lst[0]
+
+
+# the global method cache: class attribute lookups keyed by (version, name),
+# in the spirit of PyPy's.  A hit costs a single probe.
+METHOD_CACHE_SIZE_EXP = 10
+METHOD_CACHE_SIZE = 1 << METHOD_CACHE_SIZE_EXP
+METHOD_CACHE_SHIFT = r_uint.BITS - METHOD_CACHE_SIZE_EXP
+
+
+class MethodCache(object):
+    def __init__(self):
+        self.versions = [None] * METHOD_CACHE_SIZE
+        self.names = [None] * METHOD_CACHE_SIZE
+        self.results_w = [None] * METHOD_CACHE_SIZE
+
+    def lookup(self, w_class, version, name):
+        product = intmask(compute_identity_hash(version) * compute_hash(name))
+        index = intmask(r_uint(product) >> METHOD_CACHE_SHIFT)
+        if self.versions[index] is version and self.names[index] == name:
+            return self.results_w[index]
+        w_result = w_class.lookup_in_mro(name)
+        self.versions[index] = version
+        self.names[index] = name
+        self.results_w[index] = w_result
+        return w_result
+
+
+method_cache = MethodCache()
+
+
+# the most maps the instances of a class may create before they devolve
+MAX_INSTANCE_MAPS = 64
+
+# how many mispredictions it takes at most to replace a predicted map
+MAX_PREDICTION_CONFIDENCE = 16
+
+# the map of devolved instances, which keep their attributes in a dict
+DEVOLVED_MAP = Map()
+
+
+class W_AttributeDict(W_Root):
+    """The attributes of a devolved instance, the only item of its
+    storage."""
+
+    def __init__(self):
+        self.attrs = {}
+
+
+def fieldtype_of(w_value):
+    if type(w_value) is W_IntObject:
+        return FIELD_INT
+    if type(w_value) is W_FloatObject:
+        return FIELD_FLOAT
+    return FIELD_OBJECT
+
+
+def grown_size(size, needed):
+    if size * 2 > needed:
+        return size * 2
+    return needed
 
 
 class W_InstanceObject(W_Root):
+    """An instance whose attributes are laid out by self.map.  Boxed values
+    go to self.storage; ints and floats of attributes that have only ever
+    held one of those go unboxed to self.unboxed_storage, floats as their
+    bit pattern.  Both lists are fixed-size: they start at the size of the
+    map the constructor of the class usually ends with, or else at the size
+    the instances of the class ended up needing so far, and grow by
+    doubling.
+
+    Instances of classes whose instances created too many maps are
+    devolved: their map is DEVOLVED_MAP and their storage holds a single
+    W_AttributeDict.
+    """
     # _immutable_fields_ = ['w_class'] # TODO: make it immutable later
 
     def __init__(self, w_class):
         assert isinstance(w_class, W_ClassObject)
         self.w_class = w_class
-        self.map = EMPTY_MAP
-        self.storage = [None] * 16
-        self.storage_index = 0
-
-    def storage_append(self, value):
-        storage_index = hint(self.storage_index, promote=True)
-        self.storage[storage_index] = value
-        self.storage_index = storage_index + 1
+        if w_class.instances_devolved:
+            self.map = DEVOLVED_MAP
+            self.storage = [W_AttributeDict()]
+            self.unboxed_storage = []
+        else:
+            self.map = w_class.instance_root
+            predicted_map = w_class.predicted_map
+            if predicted_map is not None:
+                # exactly the room the constructor will most likely fill
+                self.storage = [None] * predicted_map.num_objects
+                self.unboxed_storage = [0] * predicted_map.num_unboxed
+            else:
+                self.storage = [None] * w_class.instance_num_objects
+                self.unboxed_storage = [0] * w_class.instance_num_unboxed
 
     def __repr__(self):
         return self.getrepr()
@@ -85,25 +336,311 @@ class W_InstanceObject(W_Root):
     def getrepr(self):
         return "%s instance" % (self.w_class.name)
 
+    def read_field(self, attr):
+        """The value of the attribute added by the map attr."""
+        fieldtype = attr.fieldtype
+        if fieldtype == FIELD_INT:
+            return W_IntObject(self.unboxed_storage[attr.storageindex])
+        if fieldtype == FIELD_FLOAT:
+            return W_FloatObject(longlong2float(
+                r_int64(self.unboxed_storage[attr.storageindex])))
+        return self.storage[attr.storageindex]
+
+    def write_field(self, attr, w_value):
+        """Store w_value as the attribute added by attr.  Returns False,
+        storing nothing, if attr keeps the attribute unboxed as another
+        type."""
+        fieldtype = attr.fieldtype
+        if fieldtype == FIELD_INT:
+            if type(w_value) is not W_IntObject:
+                return False
+            self.unboxed_storage[attr.storageindex] = w_value.value
+        elif fieldtype == FIELD_FLOAT:
+            if type(w_value) is not W_FloatObject:
+                return False
+            self.unboxed_storage[attr.storageindex] = intmask(
+                float2longlong(w_value.value))
+        else:
+            self.storage[attr.storageindex] = w_value
+        return True
+
+    def add_field(self, newmap, w_value):
+        """Switch to newmap, a child of self.map, storing w_value as its
+        attribute.  Returns False, changing nothing, if w_value does not
+        fit the type newmap stores the attribute as, or if the instance
+        has to be devolved instead."""
+        if self.w_class.instances_devolved:
+            return False
+        if newmap.fieldtype == FIELD_OBJECT:
+            if newmap.num_objects > len(self.storage):
+                self._grow_storage(newmap)
+        elif newmap.num_unboxed > len(self.unboxed_storage):
+            self._grow_storage(newmap)
+        if not self.write_field(newmap, w_value):
+            return False
+        self.map = newmap
+        return True
+
+    def _grow_storage(self, newmap):
+        self.w_class.observe_instance_map(newmap)
+        if newmap.num_objects > len(self.storage):
+            storage = [None] * grown_size(len(self.storage),
+                                          newmap.num_objects)
+            for i in range(len(self.storage)):
+                storage[i] = self.storage[i]
+            self.storage = storage
+        if newmap.num_unboxed > len(self.unboxed_storage):
+            unboxed_storage = [0] * grown_size(len(self.unboxed_storage),
+                                               newmap.num_unboxed)
+            for i in range(len(self.unboxed_storage)):
+                unboxed_storage[i] = self.unboxed_storage[i]
+            self.unboxed_storage = unboxed_storage
+
+    def _generalize(self, attr):
+        """attr stores its attribute unboxed and got a value of another
+        type: move to a map storing it boxed, relaying out the storage."""
+        chain = self.map.get_chain()
+        values_w = [None] * len(chain)
+        for i in range(len(chain)):
+            values_w[i] = self.read_field(chain[i])
+        map = self.w_class.instance_root
+        for i in range(len(chain)):
+            if chain[i] is attr:
+                map = map.generalize_transition(attr.name, attr.fieldtype)
+            else:
+                map = map.new_map_with_additional_name(chain[i].name,
+                                                       chain[i].fieldtype)
+        self.storage = [None] * map.num_objects
+        self.unboxed_storage = [0] * map.num_unboxed
+        self.w_class.observe_instance_map(map)
+        newchain = map.get_chain()
+        for i in range(len(newchain)):
+            self.write_field(newchain[i], values_w[i])
+        self.map = map
+
+    def devolve(self):
+        """Move the attributes into a dict, leaving the maps for good."""
+        w_attrs = W_AttributeDict()
+        for attr in self.map.get_chain():
+            w_attrs.attrs[attr.name] = self.read_field(attr)
+        self.map = DEVOLVED_MAP
+        self.storage = [w_attrs]
+        self.unboxed_storage = []
+
+    def _get_attribute_dict(self):
+        w_attrs = self.storage[0]
+        assert isinstance(w_attrs, W_AttributeDict)
+        return w_attrs.attrs
+
     def getfield(self, name):
         map = hint(self.map, promote=True)
-        index = map.getindex(name)
-        if index != -1:
-            return self.storage[index]
+        if map is DEVOLVED_MAP:
+            w_value = self._get_attribute_dict().get(name, None)
+            if w_value is None:
+                raise AttributeError(name)
+            return w_value
+        attr = map.find_map(name)
+        if attr is not None:
+            return self.read_field(attr)
         raise AttributeError(name)
 
-    def write_attribute(self, name, value):
+    def lookup_method(self, name):
+        """The class attribute name, if the instance does not have an
+        attribute of that name shadowing it, else None."""
         map = hint(self.map, promote=True)
-        name = name.value
-        index = map.getindex(name)
-        if index != -1:
-            self.storage[index] = value
+        if map is DEVOLVED_MAP:
+            if name in self._get_attribute_dict():
+                return None
+        elif map.find_map(name) is not None:
+            return None
+        return self.w_class.lookup(name)
+
+    def write_attribute(self, name, w_value):
+        map = hint(self.map, promote=True)
+        if map is DEVOLVED_MAP:
+            self._get_attribute_dict()[name] = w_value
+            return
+        attr = map.find_map(name)
+        if attr is not None:
+            if not self.write_field(attr, w_value):
+                self._generalize(attr)
+                self.write_attribute(name, w_value)
             return
-        self.map = map.new_map_with_additional_attribute(name)
-        self.storage_append(value)
+        if self.w_class.check_instance_maps():
+            self.devolve()
+            self._get_attribute_dict()[name] = w_value
+            return
+        self.add_field(
+            map.new_map_with_additional_name(name, fieldtype_of(w_value)),
+            w_value)
 
-    def getattr(self, name):
+    def getdict(self):
+        """A dict of the attributes.  Instances do not keep one, so this
+        builds a new dict every time, and changing it does not change the
+        instance."""
+        from minipypy.objects.dictmultiobject import W_DictMultiObject
+        if self.map is DEVOLVED_MAP:
+            attrs = self._get_attribute_dict()
+            w_dict = W_DictMultiObject.allocate(len(attrs))
+            for name, w_value in attrs.items():
+                w_dict.setitem(W_StrObject(name), w_value)
+            return w_dict
+        chain = self.map.get_chain()
+        w_dict = W_DictMultiObject.allocate(len(chain))
+        for attr in chain:
+            w_dict.setitem(W_StrObject(attr.name), self.read_field(attr))
+        return w_dict
+
+    def getattr(self, w_name):
+        assert isinstance(w_name, W_StrObject)
+        name = w_name.value
         try:
             return self.getfield(name)
         except AttributeError:
-            return self.w_class.find_method(name)
+            if name == "__dict__":
+                return self.getdict()
+            return self.w_class.lookup(name)
+
+    def setattr(self, w_name, w_value):
+        assert isinstance(w_name, W_StrObject)
+        self.write_attribute(w_name.value, w_value)
+
+    # operations, dispatched to the special methods of the class
+
+    def _special(self, w_function, name):
+        """w_function, the slot of the special method __name__, which must
+        be defined."""
+        if w_function is None:
+            raise WObjectOperationException(
+                "%s instance has no attribute '__%s__'" % (self.w_class.name,
+                                                          name))
+        return w_function
+
+    def add(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_add, "add").call2(self, w_other)
+
+    def sub(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_sub, "sub").call2(self, w_other)
+
+    def mul(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_mul, "mul").call2(self, w_other)
+
+    def div(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_div, "div").call2(self, w_other)
+
+    def true_div(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_truediv, "truediv").call2(self, w_other)
+
+    def mod(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_mod, "mod").call2(self, w_other)
+
+    def power(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_pow, "pow").call2(self, w_other)
+
+    def lshift(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_lshift, "lshift").call2(self, w_other)
+
+    def rshift(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_rshift, "rshift").call2(self, w_other)
+
+    def lt(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_lt, "lt").call2(self, w_other)
+
+    def le(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_le, "le").call2(self, w_other)
+
+    def gt(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_gt, "gt").call2(self, w_other)
+
+    def ge(self, w_other):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_ge, "ge").call2(self, w_other)
+
+    def eq(self, w_other):
+        w_function = self.w_class.get_slots().w_eq
+        if w_function is None:
+            return W_BoolObject.from_bool(self is w_other)
+        return w_function.call2(self, w_other)
+
+    def ne(self, w_other):
+        # as in CPython 2, != does not fall back to __eq__
+        w_function = self.w_class.get_slots().w_ne
+        if w_function is None:
+            return W_BoolObject.from_bool(self is not w_other)
+        return w_function.call2(self, w_other)
+
+    def not_(self):
+        return W_BoolObject.from_bool(not self.is_true())
+
+    def subscr(self, w_index):
+        slots = self.w_class.get_slots()
+        return self._special(slots.w_getitem, "getitem").call2(self, w_index)
+
+    def store_subscr(self, w_index, w_value):
+        slots = self.w_class.get_slots()
+        self._special(slots.w_setitem, "setitem").call3(self, w_index, w_value)
+
+    def delete_subscr(self, w_index):
+        slots = self.w_class.get_slots()
+        self._special(slots.w_delitem, "delitem").call2(self, w_index)
+
+    def contains(self, w_item):
+        w_function = self.w_class.get_slots().w_contains
+        if w_function is None:
+            w_iterator = self.iter()
+            while True:
+                w_x = w_iterator.next()
+                if w_x is None:
+                    return False
+                if eq_w(w_x, w_item):
+                    return True
+        return truth_of(w_function.call2(self, w_item))
+
+    def length(self):
+        slots = self.w_class.get_slots()
+        w_result = self._special(slots.w_len, "len").call1(self)
+        if not isinstance(w_result, W_IntObject):
+            raise W_TypeError("an integer is required")
+        return w_result.value
+
+    def is_true(self):
+        slots = self.w_class.get_slots()
+        if slots.w_nonzero is not None:
+            return truth_of(slots.w_nonzero.call1(self))
+        if slots.w_len is not None:
+            return self.length() != 0
+        return True
+
+    def iter(self):
+        """The result of __iter__, or rather an iterator over it: the
+        interpreter has no exceptions, so an instance cannot signal the end
+        of the iteration from a next() method.  For the same reason an
+        __iter__ returning an instance, usually self, is rejected instead of
+        being iterated over in turn."""
+        slots = self.w_class.get_slots()
+        w_iterable = self._special(slots.w_iter, "iter").call1(self)
+        if isinstance(w_iterable, W_InstanceObject):
+            raise W_TypeError("iteration over an instance returned by "
+                              "__iter__ is not supported")
+        return w_iterable.iter()
+
+
+def truth_of(w_result):
+    """The truth of the result of __nonzero__ or __contains__."""
+    if isinstance(w_result, W_BoolObject):
+        return w_result.value
+    if isinstance(w_result, W_IntObject):
+        return w_result.value != 0
+    raise W_TypeError("__nonzero__ should return bool or int")
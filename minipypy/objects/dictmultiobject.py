@@ -0,0 +1,403 @@
+from rpython.rlib import rerased
+from rpython.rlib.rarithmetic import ovfcheck_float_to_int
+from rpython.rlib.objectmodel import (
+    import_from_mixin, prepare_dict_update, r_dict
+)
+
+from minipypy.objects.baseobject import (
+    W_Root, W_BoolObject, W_FloatObject, W_IntObject, W_LongObject,
+    W_NoneObject, W_StrObject, eq_w, is_integral
+)
+from minipypy.objects.error import W_KeyError, W_TypeError
+from minipypy.objects.function import W_BuiltinMethod
+
+
+def hash_w(w_key):
+    return w_key.hash()
+
+
+def check_hashable(w_key):
+    """Raises W_TypeError if w_key cannot be a key, like a list or a dict,
+    whose hash() refuses."""
+    w_key.hash()
+
+
+class W_DictMultiObject(W_Root):
+    """A dictionary, as built by BUILD_MAP.  Namespaces keep using the
+    map-based W_Dict.
+
+    How the items are stored is decided by self.strategy, which owns
+    self.dstorage.  The non-empty strategies keep an RPython dict, which is
+    a compact hash table: the entries sit in insertion order in a dense
+    array, a separate index maps hashes to entries, and deleting marks the
+    entry as a tombstone instead of moving the later ones.  Dicts whose
+    keys are all str or all int keep the keys unwrapped."""
+
+    def __init__(self, strategy, storage, sizehint=0):
+        self.strategy = strategy
+        self.dstorage = storage
+        self.sizehint = sizehint
+
+    @staticmethod
+    def allocate(sizehint=0):
+        return W_DictMultiObject(empty_dict_strategy,
+                                 empty_dict_strategy.erase(None), sizehint)
+
+    def __repr__(self):
+        return self.getrepr()
+
+    def getrepr(self):
+        s = "{"
+        keys_w = self.getkeys()
+        values_w = self.getvalues()
+        for i in range(len(keys_w)):
+            if i > 0:
+                s += ", "
+            s += "%s: %s" % (keys_w[i].getrepr(), values_w[i].getrepr())
+        s += "}"
+        return s
+
+    def is_true(self):
+        return self.length() != 0
+
+    def hash(self):
+        raise W_TypeError("unhashable type: 'dict'")
+
+    def switch_to_object_strategy(self):
+        keys_w = self.getkeys()
+        values_w = self.getvalues()
+        d = r_dict(eq_w, hash_w)
+        prepare_dict_update(d, len(keys_w))
+        for i in range(len(keys_w)):
+            d[keys_w[i]] = values_w[i]
+        self.strategy = object_dict_strategy
+        self.dstorage = object_dict_strategy.erase(d)
+
+    # the strategy-dispatched interface
+
+    def length(self):
+        return self.strategy.length(self)
+
+    def getitem(self, w_key):
+        """The value for w_key, or None if it is missing."""
+        return self.strategy.getitem(self, w_key)
+
+    def setitem(self, w_key, w_value):
+        self.strategy.setitem(self, w_key, w_value)
+
+    def delitem(self, w_key):
+        self.strategy.delitem(self, w_key)
+
+    def getkeys(self):
+        return self.strategy.getkeys(self)
+
+    def getvalues(self):
+        return self.strategy.getvalues(self)
+
+    def clear(self):
+        self.strategy = empty_dict_strategy
+        self.dstorage = empty_dict_strategy.erase(None)
+
+    # operations on the dict from the bytecode
+
+    def subscr(self, w_key):
+        w_value = self.getitem(w_key)
+        if w_value is None:
+            raise W_KeyError(w_key.getrepr())
+        return w_value
+
+    def store_subscr(self, w_key, w_value):
+        self.setitem(w_key, w_value)
+
+    def delete_subscr(self, w_key):
+        self.delitem(w_key)
+
+    def contains(self, w_key):
+        return self.getitem(w_key) is not None
+
+    def iter(self):
+        from minipypy.objects.listobject import newlist
+        return newlist(self.getkeys()).iter()
+
+    def getattr(self, w_name):
+        assert isinstance(w_name, W_StrObject)
+        func = dict_methods.get(w_name.value, None)
+        if func is None:
+            raise AttributeError(w_name.value)
+        return W_BuiltinMethod(w_name.value, func, self)
+
+
+class DictStrategy(object):
+    """Decides how the items of a W_DictMultiObject are kept in
+    w_dict.dstorage.  There is a single prebuilt instance of every
+    strategy."""
+
+    def length(self, w_dict):
+        raise NotImplementedError
+
+    def getitem(self, w_dict, w_key):
+        raise NotImplementedError
+
+    def setitem(self, w_dict, w_key, w_value):
+        raise NotImplementedError
+
+    def delitem(self, w_dict, w_key):
+        raise NotImplementedError
+
+    def getkeys(self, w_dict):
+        raise NotImplementedError
+
+    def getvalues(self, w_dict):
+        raise NotImplementedError
+
+
+class EmptyDictStrategy(DictStrategy):
+    """A dict without items.  The first key stored decides the strategy,
+    and the storage is presized from the BUILD_MAP hint."""
+
+    erase, unerase = rerased.new_erasing_pair("empty")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def length(self, w_dict):
+        return 0
+
+    def getitem(self, w_dict, w_key):
+        return None
+
+    def setitem(self, w_dict, w_key, w_value):
+        if type(w_key) is W_StrObject:
+            strategy = str_dict_strategy
+        elif type(w_key) is W_IntObject:
+            strategy = int_dict_strategy
+        else:
+            check_hashable(w_key)
+            strategy = object_dict_strategy
+        w_dict.strategy = strategy
+        w_dict.dstorage = strategy.get_empty_storage(w_dict.sizehint)
+        strategy.setitem(w_dict, w_key, w_value)
+
+    def delitem(self, w_dict, w_key):
+        raise W_KeyError(w_key.getrepr())
+
+    def getkeys(self, w_dict):
+        return []
+
+    def getvalues(self, w_dict):
+        return []
+
+
+class AbstractTypedStrategy(object):
+    """Shared implementation of the strategies keeping the items in an
+    RPython dict keyed by self.unwrap(w_key)."""
+
+    def wrap(self, key):
+        raise NotImplementedError
+
+    def unwrap(self, w_key):
+        raise NotImplementedError
+
+    def is_correct_type(self, w_key):
+        raise NotImplementedError
+
+    def convert_key(self, w_key):
+        """The key of the correct type equal to w_key, which is not of the
+        correct type, or None if there is none."""
+        raise NotImplementedError
+
+    def get_empty_storage(self, sizehint):
+        d = self.newdict()
+        if sizehint > 0:
+            prepare_dict_update(d, sizehint)
+        return self.erase(d)
+
+    def length(self, w_dict):
+        return len(self.unerase(w_dict.dstorage))
+
+    def getitem(self, w_dict, w_key):
+        if not self.is_correct_type(w_key):
+            check_hashable(w_key)
+            w_key = self.convert_key(w_key)
+            if w_key is None:
+                return None
+        return self.unerase(w_dict.dstorage).get(self.unwrap(w_key), None)
+
+    def setitem(self, w_dict, w_key, w_value):
+        d = self.unerase(w_dict.dstorage)
+        if self.is_correct_type(w_key):
+            d[self.unwrap(w_key)] = w_value
+            return
+        check_hashable(w_key)
+        # an equal key already stored keeps its type, e.g. d[1.0] = x
+        # replaces the value of the key 1
+        w_equal = self.convert_key(w_key)
+        if w_equal is not None and self.unwrap(w_equal) in d:
+            d[self.unwrap(w_equal)] = w_value
+            return
+        w_dict.switch_to_object_strategy()
+        w_dict.setitem(w_key, w_value)
+
+    def delitem(self, w_dict, w_key):
+        w_equal = w_key
+        if not self.is_correct_type(w_key):
+            check_hashable(w_key)
+            w_equal = self.convert_key(w_key)
+        if w_equal is not None:
+            d = self.unerase(w_dict.dstorage)
+            key = self.unwrap(w_equal)
+            if key in d:
+                del d[key]
+                return
+        raise W_KeyError(w_key.getrepr())
+
+    def getkeys(self, w_dict):
+        d = self.unerase(w_dict.dstorage)
+        keys_w = [None] * len(d)
+        i = 0
+        for key in d:
+            keys_w[i] = self.wrap(key)
+            i += 1
+        return keys_w
+
+    def getvalues(self, w_dict):
+        return self.unerase(w_dict.dstorage).values()
+
+
+class StrDictStrategy(DictStrategy):
+    import_from_mixin(AbstractTypedStrategy)
+
+    erase, unerase = rerased.new_erasing_pair("str")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def newdict(self):
+        return {}
+
+    def wrap(self, key):
+        return W_StrObject(key)
+
+    def unwrap(self, w_key):
+        assert isinstance(w_key, W_StrObject)
+        return w_key.value
+
+    def is_correct_type(self, w_key):
+        return type(w_key) is W_StrObject
+
+    def convert_key(self, w_key):
+        # keys of other types are never equal to a str
+        return None
+
+
+class IntDictStrategy(DictStrategy):
+    import_from_mixin(AbstractTypedStrategy)
+
+    erase, unerase = rerased.new_erasing_pair("int")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def newdict(self):
+        return {}
+
+    def wrap(self, key):
+        return W_IntObject(key)
+
+    def unwrap(self, w_key):
+        assert isinstance(w_key, W_IntObject)
+        return w_key.value
+
+    def is_correct_type(self, w_key):
+        return type(w_key) is W_IntObject
+
+    def convert_key(self, w_key):
+        # a bool, or a float or a long with an int value
+        if isinstance(w_key, W_BoolObject):
+            return W_IntObject(int(w_key.value))
+        if isinstance(w_key, W_FloatObject) and is_integral(w_key.value):
+            try:
+                return W_IntObject(ovfcheck_float_to_int(w_key.value))
+            except OverflowError:
+                return None
+        if isinstance(w_key, W_LongObject):
+            try:
+                return W_IntObject(w_key.value.toint())
+            except OverflowError:
+                return None
+        return None
+
+
+class ObjectDictStrategy(DictStrategy):
+    import_from_mixin(AbstractTypedStrategy)
+
+    erase, unerase = rerased.new_erasing_pair("object")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def newdict(self):
+        return r_dict(eq_w, hash_w)
+
+    def wrap(self, w_key):
+        return w_key
+
+    def unwrap(self, w_key):
+        return w_key
+
+    def is_correct_type(self, w_key):
+        return True
+
+    def convert_key(self, w_key):
+        return w_key
+
+
+empty_dict_strategy = EmptyDictStrategy()
+str_dict_strategy = StrDictStrategy()
+int_dict_strategy = IntDictStrategy()
+object_dict_strategy = ObjectDictStrategy()
+
+
+def _get(w_dict, args):
+    w_value = w_dict.getitem(args[0])
+    if w_value is None:
+        if len(args) > 1:
+            return args[1]
+        return W_NoneObject.W_None
+    return w_value
+
+
+def _keys(w_dict, args):
+    from minipypy.objects.listobject import newlist
+    return newlist(w_dict.getkeys())
+
+
+def _values(w_dict, args):
+    from minipypy.objects.listobject import newlist
+    return newlist(w_dict.getvalues())
+
+
+def _items(w_dict, args):
+    from minipypy.objects.listobject import newlist
+    from minipypy.objects.tupleobject import newtuple
+    keys_w = w_dict.getkeys()
+    values_w = w_dict.getvalues()
+    items_w = [None] * len(keys_w)
+    for i in range(len(keys_w)):
+        items_w[i] = newtuple([keys_w[i], values_w[i]])
+    return newlist(items_w)
+
+
+def _has_key(w_dict, args):
+    return W_BoolObject.from_bool(w_dict.contains(args[0]))
+
+
+def _clear(w_dict, args):
+    w_dict.clear()
+    return W_NoneObject.W_None
+
+
+dict_methods = {
+    "get": _get,
+    "keys": _keys,
+    "values": _values,
+    "items": _items,
+    "has_key": _has_key,
+    "clear": _clear,
+}
@@ -2,7 +2,7 @@ import weakref, sys
 
 from rpython.rlib.jit import elidable, promote, unroll_safe
 
-from minipypy.objects.baseobject import W_Root
+from minipypy.objects.baseobject import W_Root, W_StrObject
 from minipypy.objects.mapobject import Map
 
 EMPTY_MAP = Map()
@@ -20,14 +20,20 @@ class W_Dict(W_Root):
     def getrepr(self):
         s = "{"
         for i in range(len(self.storage)):
+            if self.storage[i] is None:
+                continue
             s += str(self.storage[i])
             s += ", "
         s += "}"
         return s
 
     def getitem(self, w_key):
+        assert isinstance(w_key, W_StrObject)
+        return self.getitem_str(w_key.value)
+
+    def getitem_str(self, name):
         map = promote(self.map)
-        index = map.getindex(w_key)
+        index = map.getindex(name)
         if index != -1:
             if index < len(self.storage):
                 return self.storage[index]
@@ -36,28 +42,247 @@ class W_Dict(W_Root):
     __getitem__ = getitem
 
     def setitem(self, w_key, w_val):
+        assert isinstance(w_key, W_StrObject)
+        name = w_key.value
         map = promote(self.map)
-        index = map.getindex(w_key)
+        index = map.getindex(name)
         if index != -1:
             self.storage[index] = w_val
             return
-        self.map = map.new_map_with_additional_name(w_key)
+        self.map = map.new_map_with_additional_name(name)
         self.storage.append(w_val)
 
     __setitem__ = setitem
 
     def delitem(self, w_key):
+        assert isinstance(w_key, W_StrObject)
         map = promote(self.map)
-        index = map.getindex(w_key)
-        if index != -1:
-            del self.storage[index]
+        index = map.getindex(w_key.value)
+        if index != -1 and self.storage[index] is not None:
+            # leave a hole: the map still gives the later names their
+            # indices, so the storage must not be shifted down
+            self.storage[index] = None
             return
         raise Exception("%s is not defined" % (w_key))
 
+class VersionTag(object):
+    pass
+
+
+class ObjectMutableCell(W_Root):
+    """Holds the value of a module global that has been rebound at least
+    once.  Rebinding it again only writes the cell, so the version of the
+    module dict stays the same."""
+
+    def __init__(self, w_value):
+        self.w_value = w_value
+
+    def getrepr(self):
+        return "<cell %s>" % (self.w_value.getrepr(),)
+
+
+def unwrap_cell(w_cell):
+    if isinstance(w_cell, ObjectMutableCell):
+        return w_cell.w_value
+    return w_cell
+
+
+class W_ModuleDict(W_Dict):
+    """The namespace of a module, keyed by name.
+
+    A name maps either directly to its value, as long as it was never
+    rebound, or to an ObjectMutableCell.  The quasi-immutable version is
+    replaced whenever that mapping changes, so that lookups keyed on the
+    version are constant-folded by the JIT and can be cached per site by
+    the interpreter.  Names that are missing fall back to w_builtins."""
+
+    _immutable_fields_ = ["version?", "w_builtins"]
+
+    def __init__(self, w_builtins=None):
+        self.cells = {}
+        self.version = VersionTag()
+        self.w_builtins = w_builtins
+
+    def mutated(self):
+        self.version = VersionTag()
+
+    @unroll_safe
+    def getrepr(self):
+        s = "{"
+        for name, w_cell in self.cells.items():
+            s += "%s: %s, " % (name, str(unwrap_cell(w_cell)))
+        s += "}"
+        return s
+
+    def getcell(self, name):
+        return self._getcell_elidable(promote(self.version), name)
+
+    @elidable
+    def _getcell_elidable(self, version, name):
+        return self.cells.get(name, None)
+
+    def getitem(self, w_key):
+        assert isinstance(w_key, W_StrObject)
+        return unwrap_cell(self.getcell(w_key.value))
+
+    __getitem__ = getitem
+
+    def setitem(self, w_key, w_val):
+        assert isinstance(w_key, W_StrObject)
+        name = w_key.value
+        w_cell = self.getcell(name)
+        if isinstance(w_cell, ObjectMutableCell):
+            w_cell.w_value = w_val
+            return
+        if w_cell is None:
+            self.cells[name] = w_val
+        else:
+            self.cells[name] = ObjectMutableCell(w_val)
+        self.mutated()
+
+    __setitem__ = setitem
+
+    def delitem(self, w_key):
+        assert isinstance(w_key, W_StrObject)
+        name = w_key.value
+        if name not in self.cells:
+            raise Exception("%s is not defined" % (w_key))
+        del self.cells[name]
+        self.mutated()
+
+
+class CacheEntry(object):
+    """Inline cache of one LOAD_ATTR or STORE_ATTR site, keyed on the map of
+    the W_InstanceObject last seen there.  attr is the map that added the
+    attribute, which says where and how it is stored.  For a STORE_ATTR
+    that adds the attribute, new_map is the map the instance transitions
+    to."""
+
+    map = None
+    attr = None
+    new_map = None
+    success_counter = 0
+    failure_counter = 0
+
+    def is_valid_for_map(self, map):
+        return map is self.map
+
+
 def init_mapdict_cache(pycode):
     num_entries = len(pycode.co_names)
     pycode._mapdict_caches = [None] * num_entries
+    pycode._mapdict_store_caches = [None] * num_entries
+
+
+def _get_cache_entry(caches, nameindex):
+    entry = caches[nameindex]
+    if entry is None:
+        entry = CacheEntry()
+        caches[nameindex] = entry
+    return entry
 
 
+# The interpreter uses the inline caches below for attributes of
+# W_InstanceObjects, they are not used if we_are_jitted(): the JIT promotes
+# the map and constant-folds the index lookup instead.
+
 def LOAD_ATTR_caching(pycode, w_obj, nameindex):
-    pass
+    entry = pycode._mapdict_caches[nameindex]
+    map = w_obj.map
+    if entry is not None and entry.is_valid_for_map(map):
+        entry.success_counter += 1
+        return w_obj.read_field(entry.attr)
+    return LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map)
+
+
+def LOAD_ATTR_slowpath(pycode, w_obj, nameindex, map):
+    entry = _get_cache_entry(pycode._mapdict_caches, nameindex)
+    entry.failure_counter += 1
+    name = pycode.getname(nameindex)
+    attr = map.find_map(name)
+    if attr is None:
+        # not stored on the instance, nothing to cache
+        return w_obj.getattr(pycode.co_names[nameindex])
+    entry.map = map
+    entry.attr = attr
+    return w_obj.read_field(attr)
+
+
+def STORE_ATTR_caching(pycode, w_obj, nameindex, w_value):
+    entry = pycode._mapdict_store_caches[nameindex]
+    map = w_obj.map
+    if entry is not None and entry.is_valid_for_map(map):
+        if entry.new_map is None:
+            if w_obj.write_field(entry.attr, w_value):
+                entry.success_counter += 1
+                return
+        elif w_obj.add_field(entry.new_map, w_value):
+            entry.success_counter += 1
+            return
+    STORE_ATTR_slowpath(pycode, w_obj, nameindex, w_value, map)
+
+
+def STORE_ATTR_slowpath(pycode, w_obj, nameindex, w_value, map):
+    entry = _get_cache_entry(pycode._mapdict_store_caches, nameindex)
+    entry.failure_counter += 1
+    name = pycode.getname(nameindex)
+    w_obj.write_attribute(name, w_value)
+    # cache the layout the instance ended up with, unless the store had to
+    # generalize an unboxed field, which changed the map of the attribute
+    # itself
+    new_map = w_obj.map
+    attr = new_map.find_map(name)
+    if attr is None:
+        # the instance is devolved, it has no layout to cache
+        return
+    if new_map is map:
+        entry.map = map
+        entry.attr = attr
+        entry.new_map = None
+    elif new_map.back is map:
+        entry.map = map
+        entry.attr = attr
+        entry.new_map = new_map
+
+
+class GlobalCacheEntry(object):
+    _immutable_fields_ = ["version", "builtins_version", "w_cell"]
+
+    def __init__(self, version, builtins_version, w_cell):
+        self.version = version
+        self.builtins_version = builtins_version
+        self.w_cell = w_cell
+
+
+def init_global_cache(pycode):
+    num_entries = len(pycode.co_names)
+    pycode._global_caches = [None] * num_entries
+
+
+def lookup_global(w_globals, name):
+    w_cell = w_globals.getcell(name)
+    w_builtins = w_globals.w_builtins
+    if w_cell is None and w_builtins is not None:
+        w_cell = w_builtins.getcell(name)
+    return unwrap_cell(w_cell)
+
+
+def LOAD_GLOBAL_caching(pycode, w_globals, nameindex):
+    """Look up co_names[nameindex] in w_globals and then in its builtins,
+    reusing the cell found by the previous lookup from the same site as
+    long as neither namespace changed its version since."""
+    w_builtins = w_globals.w_builtins
+    builtins_version = None
+    if w_builtins is not None:
+        builtins_version = w_builtins.version
+    entry = pycode._global_caches[nameindex]
+    if (entry is not None and entry.version is w_globals.version and
+            entry.builtins_version is builtins_version):
+        return unwrap_cell(entry.w_cell)
+    name = pycode.getname(nameindex)
+    w_cell = w_globals.cells.get(name, None)
+    if w_cell is None and w_builtins is not None:
+        w_cell = w_builtins.cells.get(name, None)
+    pycode._global_caches[nameindex] = GlobalCacheEntry(
+        w_globals.version, builtins_version, w_cell)
+    return unwrap_cell(w_cell)
@@ -1,4 +1,35 @@
-class W_TypeError(Exception):
+class W_Error(Exception):
+    """An error raised at application level.  The explicit __init__ lets
+    oefmt() instantiate any of the subclasses with a message."""
+
+    def __init__(self, msg):
+        self.msg = msg
+
+    def __str__(self):
+        return self.msg
+
+
+class W_TypeError(W_Error):
+    pass
+
+
+class W_ValueError(W_Error):
+    pass
+
+
+class W_OverflowError(W_Error):
+    pass
+
+
+class W_IndexError(W_Error):
+    pass
+
+
+class W_KeyError(W_Error):
+    pass
+
+
+class W_ZeroDivisionError(W_Error):
     pass
 
 
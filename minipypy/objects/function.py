@@ -1,6 +1,7 @@
 from minipypy.objects.baseobject import W_Root
 
 from minipypy.objects.classobject import W_ClassObject
+from minipypy.objects.error import W_TypeError
 from rpython.rlib import jit
 from rpython.rlib.objectmodel import compute_hash
 
@@ -47,15 +48,84 @@ class W_FunctionObject(W_Root):
     def is_true(self):
         return True
 
-    def call_args(self, args, argum):
-        from minipypy.interpret import PyFrame
+    @jit.unroll_safe
+    def call_args(self, args, argnum):
+        from minipypy.interpret import allocate_frame
         code = self.getcode()
-        pyframe = PyFrame(code)
-        for i in range(len(args)):
-            assert i >= 0
+        self.check_argcount(code, argnum)
+        pyframe = allocate_frame(code)
+        for i in range(argnum):
             pyframe.locals_cells_stack_w[i] = args[i]
-            pyframe.valuestackdepth += 1
-        return pyframe.interpret()
+        return self.run_frame(pyframe, code, argnum)
+
+    # fixed-arity calls, used for the special methods of instances, which
+    # need not build a list of the arguments
+
+    def call1(self, w_arg):
+        from minipypy.interpret import allocate_frame
+        code = self.getcode()
+        self.check_argcount(code, 1)
+        pyframe = allocate_frame(code)
+        pyframe.locals_cells_stack_w[0] = w_arg
+        return self.run_frame(pyframe, code, 1)
+
+    def call2(self, w_arg1, w_arg2):
+        from minipypy.interpret import allocate_frame
+        code = self.getcode()
+        self.check_argcount(code, 2)
+        pyframe = allocate_frame(code)
+        pyframe.locals_cells_stack_w[0] = w_arg1
+        pyframe.locals_cells_stack_w[1] = w_arg2
+        return self.run_frame(pyframe, code, 2)
+
+    def call3(self, w_arg1, w_arg2, w_arg3):
+        from minipypy.interpret import allocate_frame
+        code = self.getcode()
+        self.check_argcount(code, 3)
+        pyframe = allocate_frame(code)
+        pyframe.locals_cells_stack_w[0] = w_arg1
+        pyframe.locals_cells_stack_w[1] = w_arg2
+        pyframe.locals_cells_stack_w[2] = w_arg3
+        return self.run_frame(pyframe, code, 3)
+
+    def run_frame(self, pyframe, code, given):
+        """Fill in the defaults of the arguments after the given ones and
+        run the frame."""
+        from minipypy.interpret import release_frame
+        self.fill_defaults(pyframe, code, given)
+        w_result = pyframe.interpret()
+        release_frame(pyframe)
+        return w_result
+
+    def call_from_frame(self, caller, argnum, w_self=None):
+        """Call the function with the argnum values on top of the stack of
+        caller, which are moved directly into the locals of the new frame.
+        w_self, if given, is passed as an additional first argument."""
+        from minipypy.interpret import allocate_frame
+        code = self.getcode()
+        start = 0
+        if w_self is not None:
+            start = 1
+        self.check_argcount(code, start + argnum)
+        pyframe = allocate_frame(code)
+        if w_self is not None:
+            pyframe.locals_cells_stack_w[0] = w_self
+        caller.pop_args_into(pyframe, start, argnum)
+        return self.run_frame(pyframe, code, start + argnum)
+
+    def check_argcount(self, code, given):
+        argcount = code.co_argcount
+        if given > argcount or given < argcount - len(self.defs_w):
+            raise W_TypeError("%s() takes %d arguments (%d given)" % (
+                self.name, argcount, given))
+
+    @jit.unroll_safe
+    def fill_defaults(self, pyframe, code, given):
+        argcount = code.co_argcount
+        defs_w = self.defs_w
+        first_default = argcount - len(defs_w)
+        for i in range(given, argcount):
+            pyframe.locals_cells_stack_w[i] = defs_w[i - first_default]
 
 
 class W_Method(W_Root):
@@ -72,31 +142,10 @@ class W_Method(W_Root):
         name = self.w_function.name if hasattr(self.w_function, "name") else "?"
         return "<%s %s>" % (self.__class__.__name__, self.w_function.name)
 
-    # def call_obj_args(self, args, argnum):
-    #     from minipypy.interpret import PyFrame
-    #     w_function = self.w_function
-    #     assert isinstance(w_function, W_FunctionObject)
-    #     code = w_function.getcode()
-    #     pyframe = PyFrame(code)
-    #     args = [self.w_instance] + args
-    #     for i in range(len(args)):
-    #         assert i >= 0
-    #         pyframe.locals_cells_stack_w[i] = args[i]
-    #         pyframe.valuestackdepth += 1
-    #     return pyframe.interpret()
-
-    def call_obj_args(self, args, argnum):
-        from minipypy.interpret import PyFrame
+    def call_from_frame(self, caller, argnum):
         w_function = self.w_function
         assert isinstance(w_function, W_FunctionObject)
-        code = w_function.getcode()
-        pyframe = PyFrame(code)
-        args = [self.w_instance] + args
-        for i in range(len(args)):
-            assert i >= 0
-            pyframe.locals_cells_stack_w[i] = args[i]
-            pyframe.valuestackdepth += 1
-        return pyframe.interpret()
+        return w_function.call_from_frame(caller, argnum, self.w_instance)
 
 class W_InstanceMethod(W_Root):
     "Like types.InstanceMethod, but with a reasonable (structural) equality."
@@ -142,3 +191,56 @@ class W_InstanceMethod(W_Root):
 
     def __hash__(self):
         return compute_hash((self.im_func, self.im_self))
+
+
+class W_BuiltinFunction(W_Root):
+    """A function implemented at interpreter level.  func takes the list of
+    arguments.  func_for_iteration, if given, is used instead when the
+    result is only iterated over (e.g. range in a for loop) and may return
+    a lazy iterable rather than a full list."""
+    _immutable_fields_ = ['name', 'func', 'func_for_iteration']
+
+    def __init__(self, name, func, func_for_iteration=None):
+        self.name = name
+        self.func = func
+        self.func_for_iteration = func_for_iteration
+
+    def __repr__(self):
+        return "<built-in function %s>" % (self.name,)
+
+    def getrepr(self):
+        return "<built-in function %s>" % (self.name,)
+
+    def is_true(self):
+        return True
+
+    def call_args(self, args, argnum):
+        return self.func(args)
+
+    def call_for_iteration(self, args, argnum):
+        if self.func_for_iteration is None:
+            return self.func(args)
+        return self.func_for_iteration(args)
+
+
+class W_BuiltinMethod(W_Root):
+    """A method of a builtin object, implemented at interpreter level.
+    func takes the object and the list of arguments."""
+    _immutable_fields_ = ['name', 'func', 'w_self']
+
+    def __init__(self, name, func, w_self):
+        self.name = name
+        self.func = func
+        self.w_self = w_self
+
+    def __repr__(self):
+        return "<built-in method %s>" % (self.name,)
+
+    def getrepr(self):
+        return "<built-in method %s>" % (self.name,)
+
+    def is_true(self):
+        return True
+
+    def call_args(self, args, argnum):
+        return self.func(self.w_self, args)
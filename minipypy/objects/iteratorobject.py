@@ -1,4 +1,4 @@
-from minipypy.objects.baseobject import W_Root
+from minipypy.objects.baseobject import W_Root, eq_w
 
 from rpython.rlib.jit import elidable, unroll_safe
 
@@ -12,6 +12,43 @@ class W_IteratorObject(W_Root):
     def unwrap(self):
         return self.wrappeditems
 
-    def unpack(self, count):
-        for i in range(count):
-            yield self.unwrap()[-1-i]
+    def length(self):
+        raise NotImplementedError
+
+    def getitem(self, index):
+        raise NotImplementedError
+
+    def contains(self, w_item):
+        for i in range(self.length()):
+            if eq_w(self.getitem(i), w_item):
+                return True
+        return False
+
+
+class W_SeqIterObject(W_Root):
+    """Iterator over a list or a tuple.  It reads the items of the sequence
+    as it goes instead of copying them, so a list that grows while being
+    iterated over yields the new items as well.  Subclasses read the
+    sequence as its concrete type, through length() and getitem()."""
+    _immutable_fields_ = ["w_seq"]
+
+    def __init__(self, w_seq):
+        self.w_seq = w_seq
+        self.index = 0
+
+    def length(self):
+        raise NotImplementedError
+
+    def getitem(self, index):
+        raise NotImplementedError
+
+    def iter(self):
+        return self
+
+    def next(self):
+        index = self.index
+        if index >= self.length():
+            return None
+        self.index = index + 1
+        return self.getitem(index)
+
@@ -1,21 +1,33 @@
 from minipypy.objects.dictobject import W_Dict
 from minipypy.objects.mapobject import EMPTY_MAP, Map
-from rpython.rlib import jit
+from rpython.rlib import jit, rerased
+from rpython.rlib.listsort import make_timsort_class
 from rpython.rlib.rarithmetic import ovfcheck
 from rpython.rlib.rbigint import rbigint
-from rpython.rlib.objectmodel import compute_hash, r_dict
+from rpython.rlib.objectmodel import (
+    compute_hash, r_dict, import_from_mixin, instantiate
+)
 from rpython.tool.descriptor import InstanceMethod
 
 from minipypy.objects.baseobject import (
     W_BoolObject,
+    W_FloatObject,
     W_IntObject,
     W_NoneObject,
     W_StrObject,
 )
-from minipypy.objects.iteratorobject import W_IteratorObject
+from minipypy.objects.error import W_IndexError, W_TypeError, W_ValueError
+from minipypy.objects.iteratorobject import W_IteratorObject, W_SeqIterObject
 from minipypy.objects.mapobject import Map
+from minipypy.objects.sliceobject import W_SliceObject, normalize_index
 from minipypy.objects.function import *
 
+UNROLL_CUTOFF = 5
+
+# slices at least this long share the items of their list instead of
+# copying them, see SliceViewStrategy
+MIN_VIEW_LENGTH = 16
+
 
 def key_eq(key1, key2):
     assert isinstance(key1, W_StrObject)
@@ -28,7 +40,7 @@ def key_hash(key):
     return compute_hash(key.value)
 
 
-def newlist(wrappteditems):
+def newlist(wrappeditems):
     return W_List().instantiate(wrappeditems)
 
 
@@ -38,6 +50,7 @@ class W_List(W_Root):
         self.methods = r_dict(key_eq, key_hash)
         self.write_method("append", _append)
         self.write_method("pop", _pop)
+        self.write_method("extend", _extend)
 
     def write_method(self, name, value):
         self.methods[W_StrObject(name)] = value
@@ -47,11 +60,45 @@ class W_List(W_Root):
 
 
 class W_ListObject(W_IteratorObject):
-    strategy = None
+    """A list.  How the items are stored is decided by self.strategy, which
+    owns self.lstorage: lists of ints or floats keep them unboxed, and a
+    list switches to a more general strategy when an item of another type
+    is stored into it.
+
+    storage_shared is set when slice views (see SliceViewStrategy) refer
+    to the current storage; it is then copied before it is mutated."""
 
     def __init__(self, cls, wrappeditems):
         self.cls = cls
-        self.wrappeditems = wrappeditems
+        self.storage_shared = False
+        self.strategy = get_strategy_from_list_objects(wrappeditems)
+        self.strategy.init_from_list_w(self, wrappeditems)
+
+    @staticmethod
+    def from_storage_and_strategy(cls, strategy, storage):
+        w_list = instantiate(W_ListObject)
+        w_list.cls = cls
+        w_list.storage_shared = False
+        w_list.strategy = strategy
+        w_list.lstorage = storage
+        return w_list
+
+    def switch_to_object_strategy(self):
+        list_w = self.getitems()
+        self.strategy = object_strategy
+        self.storage_shared = False
+        object_strategy.init_from_list_w(self, list_w)
+
+    def materialize_view(self):
+        if self.strategy is view_strategy:
+            view_strategy.materialize(self)
+
+    def switch_to_correct_strategy(self, w_item):
+        """Called on an empty list that is about to receive w_item."""
+        assert self.strategy is empty_strategy
+        strategy = get_strategy_from_list_objects([w_item])
+        self.strategy = strategy
+        strategy.init_from_list_w(self, [])
 
     def find_method(self, name):
         result = self.cls.methods.get(name, None)
@@ -64,13 +111,13 @@ class W_ListObject(W_IteratorObject):
         return self.find_method(name)
 
     def getrepr(self):
-        if not self.wrappeditems:
+        length = self.length()
+        if length == 0:
             return "[]"
         s = "["
-        itemlen = len(self.wrappeditems)
-        for i, item in enumerate(self.wrappeditems):
-            s += item.getrepr()
-            if i == itemlen - 1:
+        for i in range(length):
+            s += self.getitem(i).getrepr()
+            if i == length - 1:
                 break
             s += ", "
         s += "]"
@@ -80,165 +127,711 @@ class W_ListObject(W_IteratorObject):
         return self.getrepr()
 
     def __len__(self):
-        return len(self.wrappeditems)
+        return self.length()
 
     def is_true(self):
-        return len(self.wrappeditems) != 0
+        return self.length() != 0
+
+    def hash(self):
+        raise W_TypeError("unhashable type: 'list'")
+
+    def iter(self):
+        return W_ListIterObject(self)
 
     def not_(self):
-        if len(self.wrappeditems) == 0:
+        if self.length() == 0:
             return W_BoolObject.W_True
         return W_BoolObject.W_False
 
+    # the strategy-dispatched interface
+
+    def length(self):
+        return self.strategy.length(self)
+
+    def getitem(self, index):
+        return self.strategy.getitem(self, index)
+
+    def getitems(self):
+        """A fresh list of the wrapped items."""
+        return self.strategy.getitems(self)
+
+    def unwrap(self):
+        return self.getitems()
+
+    def setitem(self, index, w_item):
+        self.strategy.setitem(self, index, w_item)
+
+    def append(self, w_item):
+        self.strategy.append(self, w_item)
+
+    def pop(self, index):
+        return self.strategy.pop(self, index)
+
+    def pop_end(self):
+        return self.strategy.pop_end(self)
+
+    def getslice(self, start, stop, step, length):
+        return self.strategy.getslice(self, start, stop, step, length)
+
+    def setslice(self, start, stop, w_other):
+        """Replace the items start:stop (with start <= stop) by the items
+        of w_other."""
+        assert isinstance(w_other, W_ListObject)
+        if w_other is self:
+            # l[i:j] = l reads all of l before writing to it
+            w_other = W_ListObject.from_storage_and_strategy(
+                self.cls, self.strategy, self.strategy.getstorage_copy(self))
+        w_other.materialize_view()
+        self.strategy.setslice(self, start, stop, w_other)
+
+    def extend(self, w_other):
+        assert isinstance(w_other, W_ListObject)
+        w_other.materialize_view()
+        self.strategy.extend(self, w_other)
+
+    def add(self, w_other):
+        w_result = W_ListObject.from_storage_and_strategy(
+            self.cls, self.strategy, self.strategy.getstorage_copy(self))
+        w_result.extend(self._as_list(w_other))
+        return w_result
+
+    def inplace_add(self, w_other):
+        self.extend(self._as_list(w_other))
+        return self
+
+    def mul(self, w_times):
+        assert isinstance(w_times, W_IntObject)
+        return self.strategy.mul(self, w_times.value)
+
+    def inplace_mul(self, w_times):
+        assert isinstance(w_times, W_IntObject)
+        self.strategy.inplace_mul(self, w_times.value)
+        return self
+
+    def reverse(self):
+        self.strategy.reverse(self)
+
+    def sort(self):
+        self.strategy.sort(self)
+
+    def subscr(self, w_index):
+        if isinstance(w_index, W_SliceObject):
+            start, stop, step, length = w_index.indices4(self.length())
+            return self.getslice(start, stop, step, length)
+        assert isinstance(w_index, W_IntObject)
+        index = w_index.value
+        length = self.length()
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise W_IndexError("list index out of range")
+        return self.getitem(index)
+
+    def store_subscr(self, w_index, w_value):
+        if isinstance(w_index, W_SliceObject):
+            self.store_extended_slice(w_index, w_value)
+            return
+        assert isinstance(w_index, W_IntObject)
+        index = w_index.value
+        length = self.length()
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise W_IndexError("list assignment index out of range")
+        self.setitem(index, w_value)
+
+    def store_extended_slice(self, w_slice, w_value):
+        start, stop, step, length = w_slice.indices4(self.length())
+        w_other = self._as_list(w_value)
+        if step == 1:
+            if stop < start:
+                stop = start
+            self.setslice(start, stop, w_other)
+            return
+        if w_other.length() != length:
+            raise W_ValueError("attempt to assign sequence of size %d to "
+                               "extended slice of size %d" % (
+                                   w_other.length(), length))
+        if w_other is self:
+            w_other = self.getslice(0, length, 1, length)
+        for i in range(length):
+            self.setitem(start, w_other.getitem(i))
+            start += step
+
     def getslice_0(self):
-        return W_ListObject(self.cls, self.wrappeditems[:])
+        length = self.length()
+        return self.getslice(0, length, 1, length)
 
     def getslice_1(self, w_start):
         assert isinstance(w_start, W_IntObject)
-        start = w_start.value
-        assert start >= 0
-        sublist = self.wrappeditems[start:]
-        return W_ListObject(self.cls, sublist)
+        length = self.length()
+        start = normalize_index(w_start.value, length)
+        return self.getslice(start, length, 1, length - start)
 
     def getslice_2(self, w_stop):
         assert isinstance(w_stop, W_IntObject)
-        stop = w_stop.value
-        assert stop >= 0
-        sublist = self.wrappeditems[:stop]
-        return W_ListObject(self.cls, sublist)
+        stop = normalize_index(w_stop.value, self.length())
+        return self.getslice(0, stop, 1, stop)
 
     def getslice_3(self, w_start, w_stop):
         assert isinstance(w_start, W_IntObject)
         assert isinstance(w_stop, W_IntObject)
-        start = w_start.value
-        stop = w_stop.value
-        assert start >= 0
-        assert stop >= 0
-        sublist = self.wrappeditems[start:stop]
-        return W_ListObject(self.cls, sublist)
+        length = self.length()
+        start = normalize_index(w_start.value, length)
+        stop = normalize_index(w_stop.value, length)
+        if stop < start:
+            stop = start
+        return self.getslice(start, stop, 1, stop - start)
+
+    def _as_list(self, w_newvalue):
+        if isinstance(w_newvalue, W_ListObject):
+            return w_newvalue
+        from minipypy.objects.tupleobject import W_AbstractTupleObject
+        if isinstance(w_newvalue, W_AbstractTupleObject):
+            return W_ListObject(self.cls, w_newvalue.tolist()[:])
+        raise W_TypeError("can only assign an iterable")
 
     def storeslice_0(self, w_newvalue):
-        assert isinstance(w_newvalue, W_IteratorObject)
-        self.wrappeditems = w_newvalue.wrappeditems
+        w_other = self._as_list(w_newvalue)
+        self.setslice(0, self.length(), w_other)
 
-    @jit.unroll_safe
     def storeslice_1(self, w_newvalue, w_start):
-        assert isinstance(w_newvalue, W_IteratorObject)
         assert isinstance(w_start, W_IntObject)
-        start = w_start.value
+        w_other = self._as_list(w_newvalue)
+        length = self.length()
+        self.setslice(normalize_index(w_start.value, length), length, w_other)
+
+    def storeslice_2(self, w_newvalue, w_stop):
+        assert isinstance(w_stop, W_IntObject)
+        w_other = self._as_list(w_newvalue)
+        self.setslice(0, normalize_index(w_stop.value, self.length()), w_other)
+
+    def storeslice_3(self, w_newvalue, w_start, w_stop):
+        assert isinstance(w_start, W_IntObject)
+        assert isinstance(w_stop, W_IntObject)
+        w_other = self._as_list(w_newvalue)
+        length = self.length()
+        start = normalize_index(w_start.value, length)
+        stop = normalize_index(w_stop.value, length)
+        if stop < start:
+            stop = start
+        self.setslice(start, stop, w_other)
 
-        assert 0 <= start < len(self.wrappeditems)
-        oldlist = self.wrappeditems[:start]
 
-        newlist = [None] * (len(oldlist) + len(w_newvalue))
+class W_ListIterObject(W_SeqIterObject):
+    """Iterator over a list."""
 
-        for i in range(len(newlist)):
-            if i < start:
-                newlist[i] = oldlist[i]
-            else:
-                newlist[i] = w_newvalue.wrappeditems[i-start]
+    def length(self):
+        w_seq = self.w_seq
+        assert isinstance(w_seq, W_ListObject)
+        return w_seq.length()
 
-        self.wrappeditems = newlist
+    def getitem(self, index):
+        w_seq = self.w_seq
+        assert isinstance(w_seq, W_ListObject)
+        return w_seq.getitem(index)
 
-    @jit.unroll_safe
-    def storeslice_2(self, w_newvalue, w_stop):
-        assert isinstance(w_newvalue, W_IteratorObject)
-        assert isinstance(w_stop, W_IntObject)
-        stop = w_stop.value
 
-        assert 0 <= stop < len(self.wrappeditems)
-        oldlist = self.wrappeditems[stop:]
+class ListStrategy(object):
+    """Decides how the items of a W_ListObject are kept in w_list.lstorage.
+    There is a single prebuilt instance of every strategy."""
 
-        newlist = [None] * (len(w_newvalue) + len(oldlist))
-        for i in range(len(newlist)):
-            if i < len(w_newvalue.wrappeditems):
-                newlist[i] = w_newvalue.wrappeditems[i]
-            else:
-                newlist[i] = oldlist[i-len(w_newvalue)]
+    def init_from_list_w(self, w_list, list_w):
+        raise NotImplementedError
 
-        self.wrappeditems = newlist
+    def length(self, w_list):
+        raise NotImplementedError
 
-    @jit.unroll_safe
-    def storeslice_3(self, w_newvalue, w_start, w_stop):
-        assert isinstance(w_newvalue, W_IteratorObject)
-        assert isinstance(w_start, W_IntObject)
-        assert isinstance(w_stop, W_IntObject)
-        start = w_start.value
-        stop = w_stop.value
+    def getitem(self, w_list, index):
+        raise NotImplementedError
 
-        assert 0 <= start < len(self.wrappeditems)
-        assert 0 <= stop < len(self.wrappeditems)
-        oldlist1 = self.wrappeditems[:start]
-        oldlist2 = self.wrappeditems[stop:]
+    def getitems(self, w_list):
+        raise NotImplementedError
 
-        newlist = [None] * (
-            len(oldlist1) + len(w_newvalue) + len(oldlist2)
-        )
+    def setitem(self, w_list, index, w_item):
+        raise NotImplementedError
 
-        for i in range(len(newlist)):
-            if i < start:
-                newlist[i] = oldlist1[i]
-            elif start <= i < start + len(w_newvalue.wrappeditems):
-                newlist[i] = w_newvalue.wrappeditems[i-start]
-            else:
-                newlist[i] = oldlist2[i - (start + len(w_newvalue))]
+    def append(self, w_list, w_item):
+        raise NotImplementedError
 
-        self.wrappeditems = newlist
+    def pop(self, w_list, index):
+        raise NotImplementedError
 
-    def getslice(self, start, stop, step, length):
-        if step == 1 and 0 <= start <= stop:
+    def pop_end(self, w_list):
+        raise NotImplementedError
+
+    def getslice(self, w_list, start, stop, step, length):
+        raise NotImplementedError
+
+    def setslice(self, w_list, start, stop, w_other):
+        raise NotImplementedError
+
+    def extend(self, w_list, w_other):
+        raise NotImplementedError
+
+    def mul(self, w_list, times):
+        raise NotImplementedError
+
+    def inplace_mul(self, w_list, times):
+        raise NotImplementedError
+
+    def reverse(self, w_list):
+        raise NotImplementedError
+
+    def sort(self, w_list):
+        raise NotImplementedError
+
+
+class EmptyListStrategy(ListStrategy):
+    """A list without items.  The first item stored decides the strategy
+    the list switches to."""
+
+    erase, unerase = rerased.new_erasing_pair("empty")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def init_from_list_w(self, w_list, list_w):
+        assert len(list_w) == 0
+        w_list.lstorage = self.erase(None)
+
+    def length(self, w_list):
+        return 0
+
+    def getitem(self, w_list, index):
+        raise IndexError
+
+    def getitems(self, w_list):
+        return []
+
+    def setitem(self, w_list, index, w_item):
+        raise IndexError
+
+    def append(self, w_list, w_item):
+        w_list.switch_to_correct_strategy(w_item)
+        w_list.append(w_item)
+
+    def pop(self, w_list, index):
+        raise IndexError
+
+    def pop_end(self, w_list):
+        raise IndexError
+
+    def getslice(self, w_list, start, stop, step, length):
+        return W_ListObject.from_storage_and_strategy(
+            w_list.cls, self, self.erase(None))
+
+    def setslice(self, w_list, start, stop, w_other):
+        strategy = w_other.strategy
+        if strategy is self:
+            return
+        w_list.strategy = strategy
+        w_list.lstorage = strategy.getstorage_copy(w_other)
+
+    def extend(self, w_list, w_other):
+        self.setslice(w_list, 0, 0, w_other)
+
+    def getstorage_copy(self, w_list):
+        return self.erase(None)
+
+    def mul(self, w_list, times):
+        return W_ListObject.from_storage_and_strategy(
+            w_list.cls, self, self.erase(None))
+
+    def inplace_mul(self, w_list, times):
+        pass
+
+    def reverse(self, w_list):
+        pass
+
+    def sort(self, w_list):
+        pass
+
+
+class AbstractUnwrappedStrategy(object):
+    """Shared implementation of the strategies that keep the items in an
+    RPython list, unwrapped by self.unwrap()."""
+
+    def wrap(self, unwrapped):
+        raise NotImplementedError
+
+    def unwrap(self, w_obj):
+        raise NotImplementedError
+
+    def is_correct_type(self, w_obj):
+        raise NotImplementedError
+
+    @jit.look_inside_iff(lambda self, w_list, list_w:
+            jit.loop_unrolling_heuristic(list_w, len(list_w), UNROLL_CUTOFF))
+    def init_from_list_w(self, w_list, list_w):
+        l = [self._none_value] * len(list_w)
+        for i in range(len(list_w)):
+            l[i] = self.unwrap(list_w[i])
+        w_list.lstorage = self.erase(l)
+
+    def getstorage_copy(self, w_list):
+        return self.erase(self.unerase(w_list.lstorage)[:])
+
+    def get_mutable_storage(self, w_list):
+        """The items of w_list, copied first if slice views share them."""
+        l = self.unerase(w_list.lstorage)
+        if w_list.storage_shared:
+            l = l[:]
+            w_list.lstorage = self.erase(l)
+            w_list.storage_shared = False
+        return l
+
+    def length(self, w_list):
+        return len(self.unerase(w_list.lstorage))
+
+    def getitem(self, w_list, index):
+        return self.wrap(self.unerase(w_list.lstorage)[index])
+
+    def getitem_from_storage(self, storage, index):
+        return self.wrap(self.unerase(storage)[index])
+
+    def slice_storage(self, storage, start, step, length):
+        l = self.unerase(storage)
+        if step == 1:
+            stop = start + length
             assert start >= 0
             assert stop >= 0
-            sublist = self.wrappeditems[start:stop]
-            return W_ListObject(self.cls, sublist)
+            subitems = l[start:stop]
         else:
-            subitems_w = [W_NoneObject.W_None] * length
-            self._fill_in_with_sliced_items(
-                subitems_w, self.wrappeditems, start, step, length
-            )
-            return W_ListObject(self.cls, subitems_w)
-
-    def _fill_in_with_sliced_items(self, subitems_w, l, start, step, length):
-        for i in range(length):
-            try:
-                subitems_w[i] = l[start]
+            subitems = [self._none_value] * length
+            for i in range(length):
+                subitems[i] = l[start]
                 start += step
-            except IndexError:
-                raise
+        return self.erase(subitems)
+
+    def getitems(self, w_list):
+        l = self.unerase(w_list.lstorage)
+        list_w = [None] * len(l)
+        for i in range(len(l)):
+            list_w[i] = self.wrap(l[i])
+        return list_w
+
+    def setitem(self, w_list, index, w_item):
+        if self.is_correct_type(w_item):
+            self.get_mutable_storage(w_list)[index] = self.unwrap(w_item)
+            return
+        w_list.switch_to_object_strategy()
+        w_list.setitem(index, w_item)
+
+    def append(self, w_list, w_item):
+        if self.is_correct_type(w_item):
+            self.get_mutable_storage(w_list).append(self.unwrap(w_item))
+            return
+        w_list.switch_to_object_strategy()
+        w_list.append(w_item)
+
+    def pop(self, w_list, index):
+        l = self.get_mutable_storage(w_list)
+        return self.wrap(l.pop(index))
+
+    def pop_end(self, w_list):
+        l = self.get_mutable_storage(w_list)
+        return self.wrap(l.pop())
+
+    def getslice(self, w_list, start, stop, step, length):
+        if length >= MIN_VIEW_LENGTH:
+            w_list.storage_shared = True
+            return new_view(w_list.cls, self, w_list.lstorage,
+                            start, step, length)
+        storage = self.slice_storage(w_list.lstorage, start, step, length)
+        return W_ListObject.from_storage_and_strategy(w_list.cls, self,
+                                                      storage)
+
+    def setslice(self, w_list, start, stop, w_other):
+        if w_other.strategy is self:
+            items2 = self.unerase(w_other.lstorage)
+        elif w_other.strategy is empty_strategy:
+            items2 = []
+        else:
+            w_list.switch_to_object_strategy()
+            w_list.setslice(start, stop, w_other)
+            return
+        self.replace_range(w_list, start, stop, items2)
+
+    def replace_range(self, w_list, start, stop, items2):
+        """Replace l[start:stop] by items2 in place.  Only the items after
+        stop move, and only if the length of the list changes."""
+        l = self.get_mutable_storage(w_list)
+        assert 0 <= start <= stop <= len(l)
+        len2 = len(items2)
+        delta = len2 - (stop - start)
+        if delta > 0:
+            # make room at the end, then move the tail up by delta
+            oldsize = len(l)
+            l.extend([self._none_value] * delta)
+            i = oldsize - 1
+            while i >= stop:
+                l[i + delta] = l[i]
+                i -= 1
+        elif delta < 0:
+            # the tail moves down; RPython's del memmoves it
+            del l[start + len2:stop]
+        for i in range(len2):
+            l[start + i] = items2[i]
+
+    def extend(self, w_list, w_other):
+        if w_other.strategy is self:
+            # also right for l.extend(l): the length is read up front
+            self.get_mutable_storage(w_list).extend(
+                self.unerase(w_other.lstorage))
+        elif w_other.strategy is empty_strategy:
+            pass
+        else:
+            w_list.switch_to_object_strategy()
+            w_list.extend(w_other)
 
-    @jit.unroll_safe
-    def pop(self, w_index):
-        assert isinstance(w_index, W_IntObject)
-        index = w_index.value
+    def mul(self, w_list, times):
+        l = self.unerase(w_list.lstorage)
+        return W_ListObject.from_storage_and_strategy(
+            w_list.cls, self, self.erase(l * times))
 
-        assert 0 <= index < len(self.wrappeditems)
-        w_value = self.wrappeditems[index]
+    def inplace_mul(self, w_list, times):
+        # resizes the storage once and copies the items into place
+        l = self.get_mutable_storage(w_list)
+        l *= times
 
-        pred = self.wrappeditems[index:]
-        succ = self.wrappeditems[:index]
+    def reverse(self, w_list):
+        self.get_mutable_storage(w_list).reverse()
 
-        newlist = [None] * (len(pred) + len(succ))
-        for i in range(len(pred) + len(succ)):
-            if i < len(pred):
-                newlist[i] = pred[i]
-            else:
-                newlist[i] = succ[i - len(pred)]
 
-        self.wrappeditems = newlist
-        return w_value
+class ObjectListStrategy(ListStrategy):
+    import_from_mixin(AbstractUnwrappedStrategy)
 
-    def pop_end(self):
-        return self.pop(W_IntObject(len(self.wrappeditems) - 1))
+    _none_value = None
 
-    @jit.unroll_safe
-    def append(self, w_item):
-        newlist = [None] * (len(self.wrappeditems) + 1)
-        for i in range(len(newlist)):
-            if i < len(newlist) - 1:
-                newlist[i] = self.wrappeditems[i]
-            else:
-                newlist[i] = w_item
-        self.wrappeditems = newlist
+    erase, unerase = rerased.new_erasing_pair("object")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, unwrapped):
+        return unwrapped
+
+    def unwrap(self, w_obj):
+        return w_obj
+
+    def is_correct_type(self, w_obj):
+        return True
+
+    def setslice(self, w_list, start, stop, w_other):
+        if w_other.strategy is self:
+            items2 = self.unerase(w_other.lstorage)
+        else:
+            items2 = w_other.getitems()
+        self.replace_range(w_list, start, stop, items2)
+
+    def extend(self, w_list, w_other):
+        l = self.get_mutable_storage(w_list)
+        if w_other.strategy is self:
+            l.extend(self.unerase(w_other.lstorage))
+        else:
+            l.extend(w_other.getitems())
+
+    def sort(self, w_list):
+        ObjectSort(self.get_mutable_storage(w_list)).sort()
+
+
+class IntegerListStrategy(ListStrategy):
+    import_from_mixin(AbstractUnwrappedStrategy)
+
+    _none_value = 0
+
+    erase, unerase = rerased.new_erasing_pair("integer")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, intval):
+        return W_IntObject(intval)
+
+    def unwrap(self, w_int):
+        assert isinstance(w_int, W_IntObject)
+        return w_int.value
+
+    def is_correct_type(self, w_obj):
+        return type(w_obj) is W_IntObject
+
+    def sort(self, w_list):
+        IntSort(self.get_mutable_storage(w_list)).sort()
+
+
+class FloatListStrategy(ListStrategy):
+    import_from_mixin(AbstractUnwrappedStrategy)
+
+    _none_value = 0.0
+
+    erase, unerase = rerased.new_erasing_pair("float")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def wrap(self, floatval):
+        return W_FloatObject(floatval)
+
+    def unwrap(self, w_float):
+        assert isinstance(w_float, W_FloatObject)
+        return w_float.value
+
+    def is_correct_type(self, w_obj):
+        return type(w_obj) is W_FloatObject
+
+    def sort(self, w_list):
+        FloatSort(self.get_mutable_storage(w_list)).sort()
+
+
+class ListView(object):
+    """A slice (start, step, length) of the storage of another list."""
+    _immutable_fields_ = ['strategy', 'storage', 'start', 'step', 'length']
+
+    def __init__(self, strategy, storage, start, step, length):
+        self.strategy = strategy
+        self.storage = storage
+        self.start = start
+        self.step = step
+        self.length = length
+
+
+def new_view(cls, strategy, storage, start, step, length):
+    view = ListView(strategy, storage, start, step, length)
+    return W_ListObject.from_storage_and_strategy(
+        cls, view_strategy, view_strategy.erase(view))
+
+
+class SliceViewStrategy(ListStrategy):
+    """A slice that shares the items of the list it was taken from, so
+    that taking it is O(1).  The first mutation of the view copies the
+    items it covers and switches it to the strategy of the original list;
+    the original list copies its storage before its own next mutation
+    (W_ListObject.storage_shared).  Slicing a view makes another view of
+    the same storage."""
+
+    erase, unerase = rerased.new_erasing_pair("view")
+    erase = staticmethod(erase)
+    unerase = staticmethod(unerase)
+
+    def materialize(self, w_list):
+        view = self.unerase(w_list.lstorage)
+        w_list.strategy = view.strategy
+        w_list.lstorage = view.strategy.slice_storage(
+            view.storage, view.start, view.step, view.length)
+
+    def getstorage_copy(self, w_list):
+        # views are never mutated, they can be shared
+        return w_list.lstorage
+
+    def length(self, w_list):
+        return self.unerase(w_list.lstorage).length
+
+    def getitem(self, w_list, index):
+        view = self.unerase(w_list.lstorage)
+        return view.strategy.getitem_from_storage(
+            view.storage, view.start + index * view.step)
+
+    def getitems(self, w_list):
+        view = self.unerase(w_list.lstorage)
+        list_w = [None] * view.length
+        index = view.start
+        for i in range(view.length):
+            list_w[i] = view.strategy.getitem_from_storage(view.storage,
+                                                           index)
+            index += view.step
+        return list_w
+
+    def getslice(self, w_list, start, stop, step, length):
+        view = self.unerase(w_list.lstorage)
+        return new_view(w_list.cls, view.strategy, view.storage,
+                        view.start + start * view.step, step * view.step,
+                        length)
+
+    def setitem(self, w_list, index, w_item):
+        self.materialize(w_list)
+        w_list.setitem(index, w_item)
+
+    def append(self, w_list, w_item):
+        self.materialize(w_list)
+        w_list.append(w_item)
+
+    def pop(self, w_list, index):
+        self.materialize(w_list)
+        return w_list.pop(index)
+
+    def pop_end(self, w_list):
+        self.materialize(w_list)
+        return w_list.pop_end()
+
+    def setslice(self, w_list, start, stop, w_other):
+        self.materialize(w_list)
+        w_list.setslice(start, stop, w_other)
+
+    def extend(self, w_list, w_other):
+        self.materialize(w_list)
+        w_list.extend(w_other)
+
+    def mul(self, w_list, times):
+        self.materialize(w_list)
+        return w_list.strategy.mul(w_list, times)
+
+    def inplace_mul(self, w_list, times):
+        self.materialize(w_list)
+        w_list.strategy.inplace_mul(w_list, times)
+
+    def reverse(self, w_list):
+        self.materialize(w_list)
+        w_list.reverse()
+
+    def sort(self, w_list):
+        self.materialize(w_list)
+        w_list.sort()
+
+
+empty_strategy = EmptyListStrategy()
+object_strategy = ObjectListStrategy()
+int_strategy = IntegerListStrategy()
+float_strategy = FloatListStrategy()
+view_strategy = SliceViewStrategy()
+
+
+@jit.look_inside_iff(lambda list_w:
+        jit.loop_unrolling_heuristic(list_w, len(list_w), UNROLL_CUTOFF))
+def get_strategy_from_list_objects(list_w):
+    if not list_w:
+        return empty_strategy
+
+    w_firstobj = list_w[0]
+    if type(w_firstobj) is W_IntObject:
+        for i in range(1, len(list_w)):
+            if type(list_w[i]) is not W_IntObject:
+                return object_strategy
+        return int_strategy
+
+    if type(w_firstobj) is W_FloatObject:
+        for i in range(1, len(list_w)):
+            if type(list_w[i]) is not W_FloatObject:
+                return object_strategy
+        return float_strategy
+
+    return object_strategy
+
+
+IntBaseTimSort = make_timsort_class()
+FloatBaseTimSort = make_timsort_class()
+ObjectBaseTimSort = make_timsort_class()
+
+
+class IntSort(IntBaseTimSort):
+    def lt(self, a, b):
+        return a < b
+
+
+class FloatSort(FloatBaseTimSort):
+    def lt(self, a, b):
+        return a < b
+
+
+class ObjectSort(ObjectBaseTimSort):
+    def lt(self, w_a, w_b):
+        return w_a.lt(w_b).is_true()
 
 
 def _append(w_list, *args):
@@ -251,56 +844,33 @@ def _append(w_list, *args):
 def _getitem(w_list, *args):
     index = args[0]
     assert isinstance(index, W_IntObject)
-    return w_list.wrappeditems[index.value]
-
-
-def _getitem_copy(w_list, *args):
-    index = args[0]
-    res = [None] * len(w_list.wrappeditems)
-    prevvalue = w_list.wrappeditems[0]
-    w_item = prevvalue
-    res[0] = w_item
-    for index in range(1, len(w_list.wrappeditems)):
-        item = w_list.wrappeditems[index]
-        if jit.we_are_jitted():
-            prevvalue = item
-        res[index] = w_item
-    return W_List().instantiate(res)
+    return w_list.getitem(index.value)
 
 
 def _setitem(w_list, *args):
     index = args[0]
     w_item = args[1]
-    w_list.wrappeditems[index] = w_item
+    assert isinstance(index, W_IntObject)
+    w_list.setitem(index.value, w_item)
+
+
+def _extend(w_list, *args):
+    assert len(args) > 0, "extend should take one argument"
+    w_list.inplace_add(args[0])
+    return W_NoneObject.W_None
 
 
 def _inplace_mul(w_list, *args, **kwargs):
-    times = args[0]
-    num = times.toint()
-    assert not isinstance(num, rbigint)
-    w_result = [None] * len(w_list.wrappeditems) * num
-    for i in range(num):
-        for j in range(len(w_list.wrappeditems)):
-            w_result[len(w_list.wrappeditems) * i + j] = w_list.wrappeditems[j]
-    w_list.wrappeditems = w_result
+    return w_list.inplace_mul(args[0])
 
 
-@jit.unroll_safe
 def _mul(w_list, *args, **kwargs):
-    times = args[0]
-    num = times.toint()
-    assert not isinstance(num, rbigint)
-    w_result = [None] * len(w_list.wrappeditems) * num
-    for i in range(num):
-        for j in range(len(w_list.wrappeditems)):
-            w_result[len(w_list.wrappeditems) * i + j] = w_list.wrappeditems[j]
-    return W_List().instantiate(w_result)
+    return w_list.mul(args[0])
 
 
 def _pop(w_list, *args):
     if len(args) == 0:
-        w_list.pop_end()
-        return W_NoneObject.W_None
+        return w_list.pop_end()
 
     w_index = args[0]
     assert isinstance(w_index, W_IntObject), "%s is not W_IntObject" % (
@@ -308,23 +878,17 @@ def _pop(w_list, *args):
     )
     index = w_index.value
     if index < 0:
-        raise IndexError
-
-    try:
-        item = w_list.pop(w_index)
-    except IndexError:
-        raise
-
-    return item
+        index += w_list.length()
+    if not 0 <= index < w_list.length():
+        raise W_IndexError("pop index out of range")
+    return w_list.pop(index)
 
 
 def _reverse(w_list, *args, **kwargs):
-    wrappeditems = w_list.wrappeditems.reverse()
-    w_list.wrappeditems = wrappeditems
+    w_list.reverse()
     return w_list
 
 
 def _sort(w_list, *args, **kwargs):
-    wrappeditems = w_list.wrappeditems.sort()
-    w_list.wrappeditems = wrappeditems
+    w_list.sort()
     return w_list
@@ -1,22 +1,169 @@
 from rpython.rlib.jit import elidable
 
-class Map(object):
+# maps with fewer names than this are searched by walking up the parent
+# links; deeper ones use a name -> index dict
+SMALL_MAP_LIMIT = 8
+
+# how the value of a name is stored by an object using the map: boxed in
+# its object storage, or unboxed in its unboxed (int) storage
+FIELD_OBJECT = 0
+FIELD_INT = 1
+FIELD_FLOAT = 2
+
+
+class MapStats(object):
+    """Counts of the maps, transitions and name -> index dicts created so
+    far.  Printed by --jit-stats."""
+
     def __init__(self):
-        self.indexes = {}
-        self.other_maps = {}
+        self.maps = 0
+        self.transitions = 0
+        self.lookups = 0
+
+
+mapstats = MapStats()
+
+
+class MapLookup(object):
+    """A name -> map dict shared by a line of maps, each one the child of
+    the one before.  A map found with an index larger than the asking
+    map's is one of its descendants and does not count.  Only the map at
+    the end of the line, the tip, may add to it."""
+
+    def __init__(self, maps, tip):
+        self.maps = maps
+        self.tip = tip
+
+
+class Map(object):
+    """A node in the tree of maps.  Every map is its parent (back) plus one
+    name, stored at index; the root is the empty map.  Children are found
+    through transitions, a dict created with the first child.  Looking a
+    child up is elidable, creating it is not.
+
+    The map also records how the value of its name is stored (fieldtype)
+    and where in the storage of that kind (storageindex), and how many
+    slots of each kind an object with this map needs.  Namespaces only
+    ever use FIELD_OBJECT, so for them storageindex is index."""
+
+    _immutable_fields_ = ["back", "root", "name", "index", "fieldtype",
+                          "storageindex", "num_objects", "num_unboxed"]
+
+    def __init__(self, back=None, name=None, fieldtype=FIELD_OBJECT):
+        self.back = back
+        self.name = name
+        self.fieldtype = fieldtype
+        # on the root: the number of maps in its tree, itself included,
+        # counted by _add_transition
+        self.tree_size = 1
+        if back is None:
+            self.root = self
+            self.index = -1
+            self.storageindex = -1
+            self.num_objects = 0
+            self.num_unboxed = 0
+        else:
+            self.root = back.root
+            self.index = back.index + 1
+            self.num_objects = back.num_objects
+            self.num_unboxed = back.num_unboxed
+            if fieldtype == FIELD_OBJECT:
+                self.storageindex = self.num_objects
+                self.num_objects += 1
+            else:
+                self.storageindex = self.num_unboxed
+                self.num_unboxed += 1
+        self.transitions = None
+        # the name -> map dict of maps with SMALL_MAP_LIMIT names or more,
+        # set when they are created
+        self.lookup = None
+        mapstats.maps += 1
+
+    def length(self):
+        return self.index + 1
 
     @elidable
     def getindex(self, name):
-        return self.indexes.get(name, -1)
+        attr = self.find_map(name)
+        if attr is None:
+            return -1
+        return attr.index
+
+    @elidable
+    def find_map(self, name):
+        """The map among self and its parents that added name, or None."""
+        if self.index < SMALL_MAP_LIMIT:
+            map = self
+            while map.back is not None:
+                if map.name == name:
+                    return map
+                map = map.back
+            return None
+        attr = self.lookup.maps.get(name, None)
+        if attr is None or attr.index > self.index:
+            return None
+        return attr
+
+    def get_chain(self):
+        """The maps from the first child of the root down to self."""
+        chain = [None] * self.length()
+        map = self
+        while map.back is not None:
+            chain[map.index] = map
+            map = map.back
+        return chain
+
+    def new_map_with_additional_name(self, name, fieldtype=FIELD_OBJECT):
+        newmap = self._find_transition(name, fieldtype)
+        if newmap is None:
+            newmap = self._add_transition(name, fieldtype)
+        return newmap
 
     @elidable
-    def new_map_with_additional_name(self, name):
-        if name not in self.other_maps:
-            newmap = Map()
-            newmap.indexes.update(self.indexes)
-            newmap.indexes[name] = len(self.indexes)
-            self.other_maps[name] = newmap
-        return self.other_maps[name]
+    def _find_transition(self, name, fieldtype):
+        if self.transitions is None:
+            return None
+        return self.transitions.get((name, fieldtype), None)
+
+    def _add_transition(self, name, fieldtype):
+        """Create the child of self adding name, unless it was created
+        since _find_transition() returned None for it."""
+        if self.transitions is None:
+            self.transitions = {}
+        key = (name, fieldtype)
+        newmap = self.transitions.get(key, None)
+        if newmap is None:
+            newmap = Map(self, name, fieldtype)
+            self.root.tree_size += 1
+            if newmap.index >= SMALL_MAP_LIMIT:
+                newmap.lookup = self._lookup_for_child(newmap)
+            self.transitions[key] = newmap
+            mapstats.transitions += 1
+        return newmap
+
+    def _lookup_for_child(self, newmap):
+        lookup = self.lookup
+        if lookup is not None and lookup.tip is self:
+            # extend the parent's dict instead of copying it
+            lookup.maps[newmap.name] = newmap
+            lookup.tip = newmap
+            return lookup
+        maps = {}
+        map = newmap
+        while map.back is not None:
+            maps[map.name] = map
+            map = map.back
+        mapstats.lookups += 1
+        return MapLookup(maps, newmap)
+
+    def generalize_transition(self, name, fieldtype):
+        """The child adding name as an unboxed field of the given type got
+        a value of another type.  Return the child storing it boxed, and
+        send later objects adding name with the old type there too, so
+        they do not have to be generalized again."""
+        newmap = self.new_map_with_additional_name(name, FIELD_OBJECT)
+        self.transitions[(name, fieldtype)] = newmap
+        return newmap
 
 
 EMPTY_MAP = Map()
@@ -1,8 +1,26 @@
-from minipypy.objects.baseobject import W_Root
-from minipypy.objects.dictobject import W_Dict
+from minipypy.objects.baseobject import W_Root, W_StrObject
+from minipypy.objects.dictobject import W_ModuleDict
+
+from rpython.rlib import jit
 
 class Module(W_Root):
-    _immutable_fields_ = ["w_dict"]
+    _immutable_fields_ = ["w_name", "w_dict"]
+
+    def __init__(self, w_name, w_builtins=None):
+        self.w_name = w_name
+        self.w_dict = W_ModuleDict(w_builtins)
+        self.w_dict.setitem(W_StrObject("__name__"), w_name)
+
 
-    def __init__(self):
-        self.w_dict = W_Dict()
+@jit.unroll_safe
+def module_name_from_filename(filename):
+    """'/path/to/module.py' -> 'module'"""
+    s = ""
+    for c in filename:
+        if c == '/':
+            s = ""
+        elif c == '.':
+            break
+        else:
+            s += c
+    return s
@@ -1,9 +1,22 @@
 from minipypy.objects.baseobject import W_Root, W_StrObject
-from minipypy.objects.dictobject import W_Dict, init_mapdict_cache
+from minipypy.objects.dictobject import init_global_cache, init_mapdict_cache
 from minipypy.objects.listobject import W_ListObject
+from minipypy.opcode27 import EXTENDED_ARG, HAVE_ARGUMENT, hasjabs, hasjrel
+from minipypy.peephole import (
+    fuse_superinstructions, rewrite_method_calls, rewrite_swaps
+)
+from minipypy.quickening import (
+    KIND_GENERIC, QUICKEN_THRESHOLD, classify, merge_kinds, specialize
+)
 
+from rpython.rlib.debug import debug_print, debug_start, debug_stop
+from rpython.rlib.debug import have_debug_prints
 from rpython.rlib.objectmodel import compute_hash
 
+CO_OPTIMIZED = 0x0001
+CO_NEWLOCALS = 0x0002
+
+
 def globals_w_key_eq(key, other):
     return compute_hash(key) == compute_hash(other)
 
@@ -24,6 +37,9 @@ class PyCode(W_Root):
         "co_name",
         "co_firstlineno",
         "co_lnotab",
+        "co_stackstart",
+        "co_opcodes?[*]",
+        "co_opargs?[*]",
         "w_globals?"
     ]
 
@@ -61,7 +77,9 @@ class PyCode(W_Root):
         )
         self.co_argcount = argcount
         self.co_nlocals = nlocals
-        self.co_stacksize = stacksize
+        # one more slot for the receiver LOAD_METHOD pushes in addition to
+        # the function, see minipypy.peephole.rewrite_method_calls
+        self.co_stacksize = stacksize + 1
         self.co_flags = flags
         self.co_code = code
         self.co_consts = consts
@@ -73,13 +91,37 @@ class PyCode(W_Root):
         self.co_name = name
         self.co_firstlineno = firstlineno
         self.co_lnotab = lnotab
+        # index of the bottom of the value stack in the frame, which is
+        # laid out as | local vars | cells | stack |
+        self.co_stackstart = nlocals + len(cellvars) + len(freevars)
+        # finished frames kept for reuse, see minipypy.interpret.allocate_frame
+        self._free_frames = []
 
-        self.w_globals = W_Dict()
+        # decoded instruction stream, built by decode() on first execution
+        self.co_opcodes = None
+        self.co_opargs = None
+        # superinstruction name -> number of sites it was fused at
+        self.co_fusions = {}
+        # per-instruction quickening state, see minipypy/quickening.py
+        self._quickened_opcodes = None
+        self._quicken_counters = None
+        self._quicken_kinds = None
+
+        # the W_ModuleDict of the module this code runs in, bound when the
+        # module or the function defined by this code is created
+        self.w_globals = None
         init_mapdict_cache(self)
+        init_global_cache(self)
 
     def __repr__(self):
         return self.getrepr()
 
+    def getname(self, index):
+        """co_names[index], unwrapped."""
+        w_name = self.co_names[index]
+        assert isinstance(w_name, W_StrObject)
+        return w_name.value
+
     def getrepr(self):
         return "<code object %s, file '%s', line %d>" % (
             self.co_name.value,
@@ -87,6 +129,106 @@ class PyCode(W_Root):
             self.co_firstlineno,
         )
 
+    def is_decoded(self):
+        return self.co_opcodes is not None
+
+    def decode(self):
+        """Decode co_code into fixed-width opcode/oparg arrays indexed by
+        instruction number.  EXTENDED_ARG prefixes are folded into the
+        oparg of the instruction they extend, and the targets of relative
+        and absolute jumps are resolved to instruction numbers."""
+        co_code = self.co_code
+        codelen = len(co_code)
+        opcodes = []
+        opargs = []
+        ends = []
+        # byte offset -> instruction number; offsets pointing into the
+        # middle of an instruction stay -1
+        offset2index = [-1] * (codelen + 1)
+
+        i = 0
+        start = 0
+        extended = 0
+        while i < codelen:
+            opcode = ord(co_code[i])
+            i += 1
+            oparg = 0
+            if opcode >= HAVE_ARGUMENT:
+                lo = ord(co_code[i])
+                hi = ord(co_code[i + 1])
+                i += 2
+                oparg = (extended << 16) | (hi << 8) | lo
+            if opcode == EXTENDED_ARG:
+                extended = oparg
+                continue
+            offset2index[start] = len(opcodes)
+            opcodes.append(opcode)
+            opargs.append(oparg)
+            ends.append(i)
+            start = i
+            extended = 0
+        offset2index[codelen] = len(opcodes)
+
+        for index in range(len(opcodes)):
+            opcode = opcodes[index]
+            if opcode in hasjrel:
+                target = ends[index] + opargs[index]
+            elif opcode in hasjabs:
+                target = opargs[index]
+            else:
+                continue
+            if not 0 <= target <= codelen or offset2index[target] < 0:
+                raise ValueError("jump into the middle of an instruction")
+            opargs[index] = offset2index[target]
+
+        swaps = rewrite_swaps(opcodes, opargs)
+        method_calls = rewrite_method_calls(opcodes, opargs)
+        self.co_fusions = fuse_superinstructions(opcodes)
+        if swaps:
+            self.co_fusions["REVERSE_N"] = swaps
+        if method_calls:
+            self.co_fusions["LOAD_METHOD"] = method_calls
+        self.report_fusions()
+
+        # opcodes and opargs were built by appending, so the fixed-size
+        # arrays are copies of them
+        self._quickened_opcodes = opcodes[:]
+        self._quicken_counters = [0] * len(opcodes)
+        self._quicken_kinds = [0] * len(opcodes)
+        self.co_opcodes = opcodes[:]
+        self.co_opargs = opargs[:]
+
+    def observe_operands(self, site, w_x, w_y):
+        """Record the operand types seen by the instruction at site and
+        quicken it once it has only seen a single kind of operands."""
+        count = self._quicken_counters[site]
+        if count >= QUICKEN_THRESHOLD:
+            return
+        kind = merge_kinds(self._quicken_kinds[site], classify(w_x, w_y))
+        self._quicken_kinds[site] = kind
+        count += 1
+        self._quicken_counters[site] = count
+        if count == QUICKEN_THRESHOLD and kind != KIND_GENERIC:
+            opcode = specialize(self.co_opcodes[site], kind)
+            if opcode >= 0:
+                self._quickened_opcodes[site] = opcode
+
+    def unquicken(self, site):
+        """The type guard of a quickened instruction failed, go back to the
+        generic instruction for good."""
+        self._quickened_opcodes[site] = self.co_opcodes[site]
+        self._quicken_kinds[site] = KIND_GENERIC
+
+    def report_fusions(self):
+        """Log the superinstructions fused into this code object, enabled
+        with PYPYLOG=minipypy-fusions:-"""
+        debug_start("minipypy-fusions")
+        if have_debug_prints():
+            debug_print(self.getrepr())
+            for name, count in self.co_fusions.items():
+                debug_print("    %s: %d" % (name, count))
+        debug_stop("minipypy-fusions")
+
     def frame_stores_global(self, w_globals):
         if self.w_globals is None:
             self.w_globals = w_globals
@@ -1,4 +1,5 @@
-from minipypy.objects.baseobject import W_Root
+from minipypy.objects.baseobject import W_Root, W_IntObject, W_LongObject
+from minipypy.objects.error import oefmt, W_TypeError, W_ValueError
 
 import sys
 
@@ -14,45 +15,91 @@ class W_SliceObject(W_Root):
         self.w_step = w_step
 
     def getrepr(self):
-        pass
+        return "slice(%s, %s, %s)" % (self.w_start.getrepr(),
+                                      self.w_stop.getrepr(),
+                                      self.w_step.getrepr())
 
-    @staticmethod
-    def unwrap(w_slice):
-        return slice(w_slice.value, w_slice.w_stop.value, w_slice.w_step.value)
+    def __repr__(self):
+        return self.getrepr()
 
-    def unpack(w_slice, space):
-        if space.is_w(w_slice.w_step, space.w_None):
+    def unpack(w_slice):
+        """(start, stop, step), with None replaced by the defaults."""
+        if w_slice.w_step.is_none():
             step = 1
         else:
-            step = _eval_slice_index(space, w_slice.w_step)
+            step = _eval_slice_index(w_slice.w_step)
             if step == 0:
-                raise oefmt(space.w_ValueError, "slice step cannot be zero")
-        if space.is_w(w_slice.w_start, space.w_None):
+                raise oefmt(W_ValueError, "slice step cannot be zero")
+        if w_slice.w_start.is_none():
             if step < 0:
                 start = sys.maxint
             else:
                 start = 0
         else:
-            start = _eval_slice_index(space, w_slice.w_start)
-        if space.is_w(w_slice.w_stop, space.w_None):
+            start = _eval_slice_index(w_slice.w_start)
+        if w_slice.w_stop.is_none():
             if step < 0:
                 stop = -sys.maxint-1
             else:
                 stop = sys.maxint
         else:
-            stop = _eval_slice_index(space, w_slice.w_stop)
+            stop = _eval_slice_index(w_slice.w_stop)
         return start, stop, step
 
+    def indices4(w_slice, length):
+        """(start, stop, step, slicelength) of the slice applied to a
+        sequence of the given length, as PySlice_GetIndicesEx."""
+        start, stop, step = w_slice.unpack()
+        start = adapt_bound(start, step, length)
+        stop = adapt_bound(stop, step, length)
+        if step < 0:
+            if stop < start:
+                slicelength = (start - stop - 1) / (-step) + 1
+            else:
+                slicelength = 0
+        else:
+            if start < stop:
+                slicelength = (stop - start - 1) / step + 1
+            else:
+                slicelength = 0
+        return start, stop, step, slicelength
+
+
+def adapt_bound(index, step, length):
+    if index < 0:
+        index += length
+        if index < 0:
+            if step < 0:
+                index = -1
+            else:
+                index = 0
+    elif index >= length:
+        if step < 0:
+            index = length - 1
+        else:
+            index = length
+    return index
+
+
+def normalize_index(index, length):
+    """index of a slice bound, made non-negative and clamped to length"""
+    if index < 0:
+        index += length
+        if index < 0:
+            index = 0
+    elif index > length:
+        index = length
+    return index
+
 
 # utility functions
-def _eval_slice_index(space, w_int):
+def _eval_slice_index(w_int):
     # note that it is the *callers* responsibility to check for w_None
     # otherwise you can get funny error messages
-    try:
-        return space.getindex_w(w_int, None) # clamp if long integer too large
-    except OperationError as err:
-        if not err.match(space, space.w_TypeError):
-            raise
-        raise oefmt(space.w_TypeError,
-                    "slice indices must be integers or None or have an "
-                    "__index__ method")
+    if isinstance(w_int, W_IntObject):
+        return w_int.value
+    if isinstance(w_int, W_LongObject):
+        return w_int.toint()
+    raise oefmt(W_TypeError,
+                "slice indices must be integers or None or have an "
+                "__index__ method")
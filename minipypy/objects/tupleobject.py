@@ -1,33 +1,280 @@
 from minipypy.objects.baseobject import *
-from minipypy.objects.iteratorobject import W_IteratorObject
+from minipypy.objects.iteratorobject import W_SeqIterObject
+from minipypy.objects.sliceobject import W_SliceObject, normalize_index
 
 from rpython.rlib import jit
+from rpython.rlib.rarithmetic import intmask
+from rpython.rlib.unroll import unrolling_iterable
 
-class W_TupleObject(W_IteratorObject):
+# how a field of a specialised tuple is stored
+KIND_OBJECT = 0
+KIND_INT = 1
+KIND_FLOAT = 2
+
+
+class W_AbstractTupleObject(W_Root):
+    """A tuple.  Subclasses only provide length() and getitem(); the
+    operations here are built on those two."""
 
     def __repr__(self):
         return self.getrepr()
 
-    @jit.elidable
-    def unwrap(self):
-        return self.wrappeditems
+    def length(self):
+        raise NotImplementedError
+
+    def getitem(self, index):
+        raise NotImplementedError
+
+    def tolist(self):
+        """The items as a list, which must not be modified."""
+        items_w = [None] * self.length()
+        for i in range(len(items_w)):
+            items_w[i] = self.getitem(i)
+        return items_w
 
     def getrepr(self):
+        length = self.length()
         s = "("
-        for item in self.wrappeditems:
-            s += item.getrepr()
-            s += ", "
+        for i in range(length):
+            if i > 0:
+                s += ", "
+            s += self.getitem(i).getrepr()
+        if length == 1:
+            s += ","
         s += ")"
         return s
 
+    def is_tuple(self):
+        return True
+
     def is_true(self):
-        return len(self.wrappeditems) != 0
+        return self.length() != 0
+
+    def not_(self):
+        if self.length() == 0:
+            return W_BoolObject.W_True
+        return W_BoolObject.W_False
+
+    def iter(self):
+        return W_TupleIterObject(self)
+
+    def contains(self, w_item):
+        for i in range(self.length()):
+            if eq_w(self.getitem(i), w_item):
+                return True
+        return False
+
+    def subscr(self, w_index):
+        if isinstance(w_index, W_SliceObject):
+            start, stop, step, length = w_index.indices4(self.length())
+            return self.getslice(start, stop, step, length)
+        assert isinstance(w_index, W_IntObject)
+        index = w_index.value
+        if index < 0:
+            index += self.length()
+        if not 0 <= index < self.length():
+            raise IndexError
+        return self.getitem(index)
+
+    def getslice(self, start, stop, step, length):
+        items_w = [None] * length
+        for i in range(length):
+            items_w[i] = self.getitem(start + i * step)
+        return newtuple(items_w)
+
+    def getslice_0(self):
+        return self
+
+    def getslice_1(self, w_start):
+        assert isinstance(w_start, W_IntObject)
+        length = self.length()
+        start = normalize_index(w_start.value, length)
+        return self.getslice(start, length, 1, length - start)
+
+    def getslice_2(self, w_stop):
+        assert isinstance(w_stop, W_IntObject)
+        stop = normalize_index(w_stop.value, self.length())
+        return self.getslice(0, stop, 1, stop)
+
+    def getslice_3(self, w_start, w_stop):
+        assert isinstance(w_start, W_IntObject)
+        assert isinstance(w_stop, W_IntObject)
+        length = self.length()
+        start = normalize_index(w_start.value, length)
+        stop = normalize_index(w_stop.value, length)
+        if stop < start:
+            stop = start
+        return self.getslice(start, stop, 1, stop - start)
+
+    def eq(self, w_other):
+        if not isinstance(w_other, W_AbstractTupleObject):
+            return W_BoolObject.W_False
+        length = self.length()
+        if w_other.length() != length:
+            return W_BoolObject.W_False
+        for i in range(length):
+            if not eq_w(self.getitem(i), w_other.getitem(i)):
+                return W_BoolObject.W_False
+        return W_BoolObject.W_True
+
+    def hash(self):
+        # the algorithm of CPython's tuplehash()
+        length = self.length()
+        x = 0x345678
+        mult = 1000003
+        for i in range(length):
+            y = self.getitem(i).hash()
+            x = intmask((x ^ y) * mult)
+            mult += 82520 + length + length
+        return intmask(x + 97531)
+
+
+class W_TupleIterObject(W_SeqIterObject):
+    """Iterator over a tuple."""
+
+    def length(self):
+        w_seq = self.w_seq
+        assert isinstance(w_seq, W_AbstractTupleObject)
+        return w_seq.length()
+
+    def getitem(self, index):
+        w_seq = self.w_seq
+        assert isinstance(w_seq, W_AbstractTupleObject)
+        return w_seq.getitem(index)
+
+
+class W_TupleObject(W_AbstractTupleObject):
+    """The generic tuple, keeping its items in a list."""
+    _immutable_fields_ = ["wrappeditems[*]"]
+
+    def __init__(self, wrappeditems):
+        self.wrappeditems = wrappeditems
+
+    @jit.elidable
+    def unwrap(self):
+        return self.wrappeditems
+
+    def tolist(self):
+        return self.wrappeditems
+
+    def length(self):
+        return len(self.wrappeditems)
+
+    def getitem(self, index):
+        return self.wrappeditems[index]
 
     @staticmethod
     def from_list(lst):
-        return W_TupleObject(lst)
+        return newtuple(lst)
 
-    def not_(self):
-        if len(self.wrappeditems) == 0:
+
+def _kind_of(w_value):
+    if type(w_value) is W_IntObject:
+        return KIND_INT
+    if type(w_value) is W_FloatObject:
+        return KIND_FLOAT
+    return KIND_OBJECT
+
+
+def make_specialised_class(kinds):
+    """A tuple class of len(kinds) items, the i-th one kept in the field
+    value<i>: unboxed for KIND_INT and KIND_FLOAT, as a W_Root otherwise.
+    Comparing and hashing use the unboxed values directly."""
+    n = len(kinds)
+    iter_n = unrolling_iterable(
+        [(i, kinds[i], "value%d" % i) for i in range(n)])
+
+    class cls(W_AbstractTupleObject):
+        _immutable_fields_ = ["value%d" % i for i in range(n)]
+
+        def __init__(self, values_w):
+            for i, kind, attr in iter_n:
+                w_value = values_w[i]
+                if kind == KIND_INT:
+                    assert isinstance(w_value, W_IntObject)
+                    setattr(self, attr, w_value.value)
+                elif kind == KIND_FLOAT:
+                    assert isinstance(w_value, W_FloatObject)
+                    setattr(self, attr, w_value.value)
+                else:
+                    setattr(self, attr, w_value)
+
+        def length(self):
+            return n
+
+        def getitem(self, index):
+            for i, kind, attr in iter_n:
+                if index == i:
+                    value = getattr(self, attr)
+                    if kind == KIND_INT:
+                        return W_IntObject(value)
+                    if kind == KIND_FLOAT:
+                        return W_FloatObject(value)
+                    return value
+            raise IndexError
+
+        def eq(self, w_other):
+            if type(w_other) is not cls:
+                return W_AbstractTupleObject.eq(self, w_other)
+            assert isinstance(w_other, cls)
+            for i, kind, attr in iter_n:
+                if kind == KIND_OBJECT:
+                    if not eq_w(getattr(self, attr), getattr(w_other, attr)):
+                        return W_BoolObject.W_False
+                elif getattr(self, attr) != getattr(w_other, attr):
+                    return W_BoolObject.W_False
             return W_BoolObject.W_True
-        return W_BoolObject.W_False
+
+        def hash(self):
+            x = 0x345678
+            mult = 1000003
+            for i, kind, attr in iter_n:
+                value = getattr(self, attr)
+                if kind == KIND_INT:
+                    y = value
+                elif kind == KIND_FLOAT:
+                    y = hash_float(value)
+                else:
+                    y = value.hash()
+                x = intmask((x ^ y) * mult)
+                mult += 82520 + n + n
+            return intmask(x + 97531)
+
+    name = "".join(["oif"[kind] for kind in kinds])
+    cls.__name__ = "W_SpecialisedTupleObject_" + name
+    return cls
+
+
+def _all_kinds(n):
+    if n == 0:
+        return [()]
+    return [kinds + (kind,) for kinds in _all_kinds(n - 1)
+            for kind in (KIND_OBJECT, KIND_INT, KIND_FLOAT)]
+
+
+# the classes of the 2- and 3-tuples, at the index given by the kinds
+# of their items read as a base-3 number
+specialised_classes_2 = [make_specialised_class(kinds)
+                         for kinds in _all_kinds(2)]
+specialised_classes_3 = [make_specialised_class(kinds)
+                         for kinds in _all_kinds(3)]
+unrolling_classes_2 = unrolling_iterable(enumerate(specialised_classes_2))
+unrolling_classes_3 = unrolling_iterable(enumerate(specialised_classes_3))
+
+
+def newtuple(values_w):
+    """A tuple of the items in values_w, which it may keep.  Tuples of
+    two or three items get a specialised class."""
+    n = len(values_w)
+    if n == 2:
+        index = _kind_of(values_w[0]) * 3 + _kind_of(values_w[1])
+        for i, cls in unrolling_classes_2:
+            if i == index:
+                return cls(values_w)
+    elif n == 3:
+        index = (_kind_of(values_w[0]) * 9 + _kind_of(values_w[1]) * 3 +
+                 _kind_of(values_w[2]))
+        for i, cls in unrolling_classes_3:
+            if i == index:
+                return cls(values_w)
+    return W_TupleObject(values_w)
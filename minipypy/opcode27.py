@@ -218,4 +218,41 @@ EXTENDED_ARG = 145
 def_op("SET_ADD", 146)
 def_op("MAP_ADD", 147)
 
+# Superinstructions, written over the first instruction of a fused sequence
+# by minipypy.peephole.  CPython never emits these.
+def_op("LOAD_FAST__LOAD_FAST", 150)
+haslocal.append(150)
+def_op("LOAD_FAST__LOAD_CONST__BINARY_ADD", 151)
+haslocal.append(151)
+def_op("LOAD_FAST__LOAD_CONST__BINARY_SUBTRACT", 152)
+haslocal.append(152)
+def_op("COMPARE_OP__POP_JUMP_IF_FALSE", 153)
+hascompare.append(153)
+name_op("LOAD_NAME__LOAD_CONST__INPLACE_ADD__STORE_NAME", 154)
+def_op("COMPARE_OP__POP_JUMP_IF_TRUE", 155)
+hascompare.append(155)
+
+# Quickened instructions, written over generic instructions in
+# PyCode._quickened_opcodes by minipypy.quickening once a site has only seen
+# operands of one type.  CPython never emits these.
+def_op("INT_ADD", 160)
+def_op("INT_SUBTRACT", 161)
+def_op("FLOAT_ADD", 162)
+def_op("FLOAT_SUBTRACT", 163)
+def_op("INT_COMPARE_OP", 164)
+hascompare.append(164)
+def_op("INT_COMPARE_OP__POP_JUMP_IF_FALSE", 165)
+hascompare.append(165)
+def_op("INT_COMPARE_OP__POP_JUMP_IF_TRUE", 166)
+hascompare.append(166)
+
+# Method calls, written over LOAD_ATTR and the CALL_FUNCTION calling its
+# result by minipypy.peephole.  CPython never emits these.
+name_op("LOAD_METHOD", 170)
+def_op("CALL_METHOD", 171)
+
+# Reverses the oparg values on top of the stack, written by minipypy.peephole
+# over BUILD_TUPLE n; UNPACK_SEQUENCE n.  CPython never emits it.
+def_op("REVERSE_N", 172)
+
 del def_op, name_op, jrel_op, jabs_op
@@ -0,0 +1,155 @@
+"""Load-time rewrites of the decoded instruction stream of a PyCode.
+
+Superinstructions replace the opcode of the first instruction of a hot
+sequence.  The remaining instructions of the sequence are left in place, so
+the fused handler reads their opargs from the following slots and jumps
+into the middle of a sequence still execute the original instructions.
+
+Method calls turn LOAD_ATTR ... CALL_FUNCTION into LOAD_METHOD ...
+CALL_METHOD, so that calling a method does not allocate a bound method.
+
+Swaps turn BUILD_TUPLE n; UNPACK_SEQUENCE n, as in a, b, c, d = d, c, b, a,
+into stack rotations, so that no tuple is built.
+"""
+
+from minipypy.opcode27 import Bytecodes, hasjabs, hasjrel, opname
+
+
+# (superinstruction, fused sequence), longest sequences first
+SUPERINSTRUCTIONS = [
+    (
+        Bytecodes.LOAD_NAME__LOAD_CONST__INPLACE_ADD__STORE_NAME,
+        [
+            Bytecodes.LOAD_NAME,
+            Bytecodes.LOAD_CONST,
+            Bytecodes.INPLACE_ADD,
+            Bytecodes.STORE_NAME,
+        ],
+    ),
+    (
+        Bytecodes.LOAD_FAST__LOAD_CONST__BINARY_ADD,
+        [Bytecodes.LOAD_FAST, Bytecodes.LOAD_CONST, Bytecodes.BINARY_ADD],
+    ),
+    (
+        Bytecodes.LOAD_FAST__LOAD_CONST__BINARY_SUBTRACT,
+        [Bytecodes.LOAD_FAST, Bytecodes.LOAD_CONST, Bytecodes.BINARY_SUBTRACT],
+    ),
+    (
+        Bytecodes.COMPARE_OP__POP_JUMP_IF_FALSE,
+        [Bytecodes.COMPARE_OP, Bytecodes.POP_JUMP_IF_FALSE],
+    ),
+    (
+        Bytecodes.COMPARE_OP__POP_JUMP_IF_TRUE,
+        [Bytecodes.COMPARE_OP, Bytecodes.POP_JUMP_IF_TRUE],
+    ),
+    (
+        Bytecodes.LOAD_FAST__LOAD_FAST,
+        [Bytecodes.LOAD_FAST, Bytecodes.LOAD_FAST],
+    ),
+]
+
+SUPERINSTRUCTION_NAMES = [opname[op] for op, _ in SUPERINSTRUCTIONS]
+
+
+def _matches(opcodes, index, sequence):
+    if index + len(sequence) > len(opcodes):
+        return False
+    for i in range(len(sequence)):
+        if opcodes[index + i] != sequence[i]:
+            return False
+    return True
+
+
+def fuse_superinstructions(opcodes):
+    """Rewrite the hot sequences in opcodes in place, returning a dict that
+    maps the name of each superinstruction that fired to its count."""
+    fired = {}
+    index = 0
+    while index < len(opcodes):
+        step = 1
+        for superinstruction, sequence in SUPERINSTRUCTIONS:
+            if _matches(opcodes, index, sequence):
+                opcodes[index] = superinstruction
+                name = opname[superinstruction]
+                fired[name] = fired.get(name, 0) + 1
+                step = len(sequence)
+                break
+        index += step
+    return fired
+
+
+# instructions that push one value and have no other effect, the arguments
+# of the calls rewritten by rewrite_method_calls
+SIMPLE_LOADS = [
+    Bytecodes.LOAD_FAST,
+    Bytecodes.LOAD_CONST,
+    Bytecodes.LOAD_NAME,
+    Bytecodes.LOAD_GLOBAL,
+    Bytecodes.LOAD_DEREF,
+]
+
+
+def rewrite_method_calls(opcodes, opargs):
+    """Rewrite every LOAD_ATTR that is followed by only simple loads of the
+    positional arguments and the CALL_FUNCTION calling the attribute into
+    LOAD_METHOD and CALL_METHOD, in place.  The call is left alone when
+    something jumps past the LOAD_ATTR into it, as the jump would reach
+    CALL_METHOD without the receiver LOAD_METHOD pushes.  Returns the number
+    of calls rewritten."""
+    targets = jump_targets(opcodes, opargs)
+    count = 0
+    for index in range(len(opcodes)):
+        if opcodes[index] != Bytecodes.LOAD_ATTR:
+            continue
+        call = index + 1
+        while (call < len(opcodes) and opcodes[call] in SIMPLE_LOADS and
+                call not in targets):
+            call += 1
+        if (call < len(opcodes) and call not in targets and
+                opcodes[call] == Bytecodes.CALL_FUNCTION and
+                opargs[call] == call - index - 1):
+            opcodes[index] = Bytecodes.LOAD_METHOD
+            opcodes[call] = Bytecodes.CALL_METHOD
+            count += 1
+    return count
+
+
+def jump_targets(opcodes, opargs):
+    """The instruction numbers jumped to, once decode resolved them."""
+    targets = {}
+    for index in range(len(opcodes)):
+        if opcodes[index] in hasjrel or opcodes[index] in hasjabs:
+            targets[opargs[index]] = None
+    return targets
+
+
+def rewrite_swaps(opcodes, opargs):
+    """Rewrite every BUILD_TUPLE n directly followed by UNPACK_SEQUENCE n,
+    which together reverse the n values on top of the stack, into
+    rotations, in place.  Both slots are kept so that instruction numbers
+    do not change; the pair is left alone when something jumps between the
+    two.  Returns the number of pairs rewritten."""
+    targets = jump_targets(opcodes, opargs)
+    count = 0
+    for index in range(len(opcodes) - 1):
+        if (opcodes[index] != Bytecodes.BUILD_TUPLE or
+                opcodes[index + 1] != Bytecodes.UNPACK_SEQUENCE or
+                opargs[index] != opargs[index + 1] or
+                index + 1 in targets):
+            continue
+        n = opargs[index]
+        if n == 2:
+            opcodes[index] = Bytecodes.ROT_TWO
+            opcodes[index + 1] = Bytecodes.NOP
+        elif n == 3:
+            # [a, b, c] -> [c, a, b] -> [c, b, a]
+            opcodes[index] = Bytecodes.ROT_THREE
+            opcodes[index + 1] = Bytecodes.ROT_TWO
+        elif n > 3:
+            opcodes[index] = Bytecodes.REVERSE_N
+            opcodes[index + 1] = Bytecodes.NOP
+        else:
+            opcodes[index] = Bytecodes.NOP
+            opcodes[index + 1] = Bytecodes.NOP
+        count += 1
+    return count
@@ -0,0 +1,75 @@
+"""Adaptive quickening of arithmetic and comparison sites.
+
+The interpreter records the operand types seen at each BINARY_ADD,
+BINARY_SUBTRACT, INPLACE_ADD, INPLACE_SUBTRACT and COMPARE_OP site.  Once a
+site has executed QUICKEN_THRESHOLD times with operands of a single kind,
+its entry in PyCode._quickened_opcodes is rewritten to a specialized
+instruction guarded by a type check.  A failing guard rewrites the site back
+to the generic instruction for good.
+
+Quickened opcodes are only dispatched by the interpreter, the JIT keeps
+tracing the generic instructions from PyCode.co_opcodes.
+"""
+
+from minipypy.objects.baseobject import W_FloatObject, W_IntObject
+from minipypy.opcode27 import Bytecodes
+
+QUICKEN_THRESHOLD = 8
+
+KIND_UNSEEN = 0
+KIND_INT = 1
+KIND_FLOAT = 2
+KIND_GENERIC = 3
+
+
+def classify(w_x, w_y):
+    if type(w_x) is W_IntObject and type(w_y) is W_IntObject:
+        return KIND_INT
+    if type(w_x) is W_FloatObject and type(w_y) is W_FloatObject:
+        return KIND_FLOAT
+    return KIND_GENERIC
+
+
+def merge_kinds(old, new):
+    if old == KIND_UNSEEN or old == new:
+        return new
+    return KIND_GENERIC
+
+
+def specialize(opcode, kind):
+    """Return the quickened form of opcode for operands of the given kind,
+    or -1 if there is none."""
+    if kind == KIND_INT:
+        if opcode == Bytecodes.BINARY_ADD or opcode == Bytecodes.INPLACE_ADD:
+            return Bytecodes.INT_ADD
+        if (opcode == Bytecodes.BINARY_SUBTRACT or
+                opcode == Bytecodes.INPLACE_SUBTRACT):
+            return Bytecodes.INT_SUBTRACT
+        if opcode == Bytecodes.COMPARE_OP:
+            return Bytecodes.INT_COMPARE_OP
+        if opcode == Bytecodes.COMPARE_OP__POP_JUMP_IF_FALSE:
+            return Bytecodes.INT_COMPARE_OP__POP_JUMP_IF_FALSE
+        if opcode == Bytecodes.COMPARE_OP__POP_JUMP_IF_TRUE:
+            return Bytecodes.INT_COMPARE_OP__POP_JUMP_IF_TRUE
+    elif kind == KIND_FLOAT:
+        if opcode == Bytecodes.BINARY_ADD or opcode == Bytecodes.INPLACE_ADD:
+            return Bytecodes.FLOAT_ADD
+        if (opcode == Bytecodes.BINARY_SUBTRACT or
+                opcode == Bytecodes.INPLACE_SUBTRACT):
+            return Bytecodes.FLOAT_SUBTRACT
+    return -1
+
+
+def int_compare(opnum, x, y):
+    if opnum == 0:
+        return x < y
+    elif opnum == 1:
+        return x <= y
+    elif opnum == 2:
+        return x == y
+    elif opnum == 3:
+        return x != y
+    elif opnum == 4:
+        return x > y
+    else:
+        return x >= y
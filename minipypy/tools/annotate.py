@@ -0,0 +1,23 @@
+"""Annotate and rtype the interpreter without compiling it, a quick check
+that the tree still translates.
+
+    PYTHONPATH=.:./pypy python2 minipypy/tools/annotate.py
+"""
+
+import sys
+
+from rpython.translator.translator import TranslationContext
+
+from minipypy.main import entry_point
+
+
+def main(argv):
+    t = TranslationContext()
+    t.buildannotator().build_types(entry_point, [[str]])
+    t.buildrtyper().specialize()
+    print("annotation and rtyping succeeded")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,23 @@
+class Bag:
+    def __init__(self, items):
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+b = Bag([3, 1, 2])
+for x in b:
+    print x
+print 2 in b
+print 5 in b
+print len(b)
+
+t = Bag((4, 5))
+total = 0
+for x in t:
+    total += x
+print total
@@ -0,0 +1,79 @@
+# comparisons branched on directly, without a bool in between
+def classify(a, b):
+    r = []
+    if a == b:
+        r.append(1)
+    if a != b:
+        r.append(2)
+    if a < b:
+        r.append(3)
+    if not a < b:
+        r.append(4)
+    if a <= b:
+        r.append(5)
+    if a > b:
+        r.append(6)
+    if a >= b:
+        r.append(7)
+    if not a == b:
+        r.append(8)
+    return r
+
+print classify(1, 2), classify(2, 2), classify(3, 2)
+print classify(2L, 1), classify(1, 9223372036854775808)
+print classify('a', 'b'), classify('b', 'b')
+
+
+def identity(x, y):
+    r = []
+    if x is y:
+        r.append(1)
+    if x is not y:
+        r.append(2)
+    if x is None:
+        r.append(3)
+    if x is not None:
+        r.append(4)
+    return r
+
+l = [1]
+print identity(l, l), identity(l, [1]), identity(None, None), identity(0, None)
+
+
+def member(x, xs):
+    r = []
+    if x in xs:
+        r.append(1)
+    if x not in xs:
+        r.append(2)
+    if not x in xs:
+        r.append(3)
+    return r
+
+print member(2, [1, 2, 3]), member(5, [1, 2, 3]), member(2, (1, 2))
+print member(1, {1: 2}), member(3, {1: 2})
+
+i = 0
+while i != 10:
+    i += 1
+print i
+while not i <= 0:
+    i -= 3
+print i
+n = None
+while n is None:
+    n = 5
+print n
+print 1 != 2, 1 is not 1, [] is not [], 3 not in [1, 2]
+
+# quickened for ints once the site is hot, and back to generic for floats
+def count_below(xs, limit):
+    n = 0
+    for x in xs:
+        if not x < limit:
+            continue
+        n += 1
+    return n
+
+print count_below(range(20), 12), count_below(range(20), 12)
+print count_below([1L, 2L, 5L], 3L), count_below(range(20), 3)
@@ -0,0 +1,30 @@
+# instances with more attributes than a map searches by walking its
+# parents, and two that branch off after the tenth attribute
+class Point:
+    def __init__(self, n):
+        self.a0 = n
+        self.a1 = n + 1
+        self.a2 = n + 2
+        self.a3 = n + 3
+        self.a4 = n + 4
+        self.a5 = n + 5
+        self.a6 = n + 6
+        self.a7 = n + 7
+        self.a8 = n + 8
+        self.a9 = n + 9
+
+
+p = Point(0)
+p.x = 100
+p.y = 200
+q = Point(10)
+q.y = 300
+q.x = 400
+r = Point(20)
+r.x = 1.5
+print p.a0, p.a5, p.a9, p.x, p.y
+print q.a0, q.a8, q.x, q.y
+print r.a9, r.x
+p.a3 = 33
+q.a9 = 99
+print p.a3, q.a9, r.a3
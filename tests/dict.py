@@ -0,0 +1,46 @@
+# presized from the BUILD_MAP hint
+d = {1: 'a', 2: 'b', 3: 'c', 4: 'd', 5: 'e', 6: 'f', 7: 'g', 8: 'h'}
+print len(d)
+print d.keys()
+print d.values()
+
+# deleting leaves tombstones, which later insertions do not reuse
+e = {}
+i = 0
+while i < 20:
+    e[i] = i * i
+    i += 1
+i = 0
+while i < 20:
+    if i % 3 != 0:
+        del e[i]
+    i += 1
+print e.keys()
+print e.values()
+i = 20
+while i < 25:
+    e[i] = -i
+    i += 1
+print e.keys()
+print len(e)
+print 4 in e, 6 in e, 24 in e
+
+# numbers of different types compare equal as keys
+n = {1: 10, 2: 20}
+print n[1.0], n[True], n[2L]
+print 1.0 in n, True in n, 1.5 in n, '1' in n
+n[1.0] = 11
+print n.keys(), n[1]
+del n[2.0]
+print n.keys()
+n[3.5] = 35
+print n[3.5], n[1], n[True]
+print n.get(False, -1)
+
+f = {0.5: 5, 2.0: 20}
+print f[2], f[2L], f[0.5]
+
+s = {'a': 1}
+print s.get(1, -1), 'a' in s, 1 in s
+s[1] = 100
+print s['a'], s[1.0], s[True]
@@ -0,0 +1,33 @@
+# longs are printed inside lists, which show them with their L suffix;
+# the operands are variables so that the compiler does not fold them
+maxint = 9223372036854775807
+minint = -maxint - 1
+
+print [maxint + 1, minint - 1, -minint]
+print [maxint * 2, minint * -1, maxint * maxint]
+print [maxint + 1 - 1 == maxint, maxint + 1 > maxint]
+one = 1
+print [one << 62, one << 63, 3 << 62 + one - 1, -one << 63, -2 * one << 63]
+print [(one << 64) >> 1, (one << 100) >> 100 == 1, 5 << 3 * one]
+print [minint / -1, minint % -1 == 0, 7 / -2, -7 % 3]
+two = 2
+print [two ** 62, two ** 63, two ** 64, 3 ** 40]
+print [10L + 1, 10L * 10L, 10L - 20]
+
+x = 1
+i = 0
+while i < 70:
+    x = x * 2
+    i += 1
+print [x, x > maxint, x == 2 ** 70]
+while i > 0:
+    x = x / 2
+    i -= 1
+print [x == 1, x + maxint == maxint + 1]
+
+total = maxint - 5
+i = 0
+while i < 10:
+    total += 1
+    i += 1
+print [total, total - 10 == maxint - 5]
@@ -0,0 +1,72 @@
+# instances of Bag get their attributes in every order, far more maps than
+# a class may have, so they move to dict storage; instances created before
+# and after that keep their attributes
+class Bag:
+    pass
+
+
+def put(o, k, v):
+    if k == 0:
+        o.a = v
+    elif k == 1:
+        o.b = v
+    elif k == 2:
+        o.c = v
+    elif k == 3:
+        o.d = v
+    else:
+        o.e = v
+
+
+def orders(ks):
+    if len(ks) == 0:
+        return [[]]
+    result = []
+    for i in range(len(ks)):
+        first = ks[i]
+        rest = ks[:i] + ks[i + 1:]
+        for order in orders(rest):
+            result.append([first] + order)
+    return result
+
+
+early = Bag()
+early.a = 1
+early.b = 2
+
+bags = []
+for order in orders([0, 1, 2, 3, 4]):
+    o = Bag()
+    for k in order:
+        put(o, k, k * 10 + len(bags) % 7)
+    bags.append(o)
+print len(bags)
+
+total = 0
+for o in bags:
+    total += o.a + o.b + o.c + o.d + o.e
+print total
+
+late = Bag()
+late.e = 5
+late.a = 6
+late.a = late.a + late.e
+print early.a, early.b, late.a, late.e
+
+early.c = 3
+bags[0].a = -1
+bags[-1].f = 99
+print early.a + early.b + early.c, bags[0].a, bags[-1].f, bags[-1].e
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def norm1(self):
+        return self.x + self.y
+
+
+p = Point(3, 4)
+print p.norm1(), p.x, p.y
@@ -0,0 +1,22 @@
+class A:
+    def __init__(self, n):
+        self.n = n
+
+    def f(self, x):
+        return self.n * x
+
+    def g(self, x, y):
+        return self.n + x + y
+
+
+def g(x):
+    return x + 1
+
+a = A(10)
+print a.f(3)
+print a.g(1, 2)
+
+for c in [True, False]:
+    print (g if c else a.f)(3)
+    print (a.f if c else g)(3)
+    print (A(1).g if c else a.g)(3, 4)
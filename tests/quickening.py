@@ -0,0 +1,37 @@
+# sites quickened for the operand types they saw first keep working when
+# other types show up later
+def add(a, b):
+    return a + b
+
+
+def sub(a, b):
+    return a - b
+
+
+def less(a, b):
+    return a < b
+
+
+def same(a, b):
+    return a == b
+
+
+i = 0
+total = 0
+while i < 100:
+    total = add(total, i)
+    total = sub(total, 1)
+    i += 1
+print total, less(1, 2), same(3, 3)
+
+print add(1.5, 2.25), add('a', 'b') == 'ab', [add(9223372036854775807, 1)]
+print sub(2.5, 1.0), [sub(-9223372036854775807, 10)], sub(10L, 3) == 7
+print less(5, 3), less('a', 'b'), less(2L, 1), less(1, 9223372036854775808)
+print same(1, 1.0), same('a', 'a'), same('a', 'b'), same(None, None)
+
+i = 0
+total = 0
+while i < 100:
+    total = add(total, i)
+    i += 1
+print total
@@ -0,0 +1,40 @@
+# assigning to a slice resizes the list in place
+l = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+l[2:4] = [20, 30]
+print l
+l[2:4] = [-1]
+print l
+l[1:2] = [7, 8, 9]
+print l
+l[:0] = [100]
+print l
+l[len(l):] = [200, 300]
+print l
+l[-3:] = []
+print l
+l[:] = [5, 6]
+print l
+
+# the replacement has another strategy than the list
+m = [1, 2, 3, 4]
+m[1:3] = ['a', 'b', 'c']
+print m
+f = [1.5, 2.5, 3.5]
+f[0:1] = [1, 2]
+print f
+e = []
+e[0:0] = [1, 2]
+print e
+
+# the replacement is the list itself or a slice of it
+s = [1, 2, 3, 4]
+s[1:3] = s
+print s
+s[:2] = s[2:]
+print s
+
+big = range(1000)
+big[500:502] = [-5, -6]
+print big[498:504], len(big)
+big[10:990] = []
+print big, len(big)
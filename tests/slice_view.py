@@ -0,0 +1,52 @@
+# slices share the items of their list until one of them is mutated
+l = [1, 2, 3, 4, 5, 6, 7, 8]
+s = l[2:6]
+l[3] = 40
+print l, s
+s[0] = 30
+print l, s
+s.append(9)
+print l, s
+
+t = l[1:]
+u = t[1:4]
+t[1] = 300
+print l, t, u
+l[:] = []
+print l, t, u
+
+m = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+odd = m[::2]
+back = m[::-3]
+part = m[1:8:3]
+m[0] = 100
+m.append(10)
+print m, odd, back, part
+odd[1] = -3
+print m, odd
+
+n = ['a', 'b', 'c', 'd']
+v = n[1:3]
+n.pop()
+print n, v
+v.pop(0)
+print n, v
+
+w = [1.5, 2.5, 3.5]
+x = w[:]
+w[0] = 0.5
+x += [4.5]
+print w, x
+
+
+def rest(xs):
+    # a slice of a slice of ..., as recursive algorithms take them
+    if not xs:
+        return 0
+    return xs[0] + rest(xs[1:])
+
+print rest(range(50))
+
+word = 'abcdefgh'
+print word[2:5] == 'cde', word[::2] == 'aceg', word[::-1] == 'hgfedcba'
+print word[1:][1:][1:] == 'defgh', len(word[3:])
@@ -0,0 +1,62 @@
+class Vec:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __add__(self, other):
+        return Vec(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other):
+        return Vec(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, k):
+        return Vec(self.x * k, self.y * k)
+
+    def __eq__(self, other):
+        return self.x == other.x and self.y == other.y
+
+    def __lt__(self, other):
+        return self.x < other.x
+
+    def __getitem__(self, i):
+        if i == 0:
+            return self.x
+        return self.y
+
+    def __setitem__(self, i, value):
+        if i == 0:
+            self.x = value
+        else:
+            self.y = value
+
+    def __len__(self):
+        return 2
+
+
+a = Vec(1, 2)
+b = Vec(3, 4)
+c = a + b
+print c.x, c.y
+d = (b - a) * 3
+print d[0], d[1], len(d)
+d[1] = 7
+print d.x, d.y
+print a == Vec(1, 2), a == b, a < b, b < a
+
+# without __ne__, != compares identities, as in CPython 2
+print a != Vec(1, 2), a != a
+
+
+class Ne(Vec):
+    def __ne__(self, other):
+        return not self == other
+
+
+e = Ne(1, 2)
+print e != Ne(1, 2), e != Ne(2, 2)
+
+i = 0
+while i < 3:
+    a = a + Vec(1, 1)
+    i += 1
+print a.x, a.y
@@ -0,0 +1,47 @@
+# the sequences fused into superinstructions, with jumps into the middle
+# of some of them
+def count(n):
+    i = 0
+    total = 0
+    while i < n:
+        total = total + i
+        i = i + 1
+    return total
+
+
+def countdown(n):
+    steps = 0
+    while n > 0:
+        n = n - 1
+        steps = steps + 2
+    return steps
+
+
+def pick(c, a, b, d):
+    # the join after the conditional is the second LOAD_FAST of a fused
+    # LOAD_FAST; LOAD_FAST
+    return (a if c else b) + d
+
+
+def pick_const(c, a, b):
+    # the join is the LOAD_CONST of a fused LOAD_FAST; LOAD_CONST; BINARY_ADD
+    return (a if c else b) + 1
+
+
+def until(n):
+    i = 0
+    while not i >= n:
+        i = i + 3
+    return i
+
+
+print count(100), countdown(50), until(10)
+print pick(True, 1, 10, 100), pick(False, 1, 10, 100)
+print pick_const(True, 1, 10), pick_const(False, 1, 10)
+
+x = 0
+y = 0
+while x < 1000:
+    x += 1
+    y += 2
+print x, y
@@ -0,0 +1,47 @@
+# BUILD_TUPLE n; UNPACK_SEQUENCE n pairs become stack rotations
+a, b = 1, 2
+a, b = b, a
+print a, b
+
+a, b, c = 1, 2, 3
+a, b, c = c, a, b
+print a, b, c
+a, b, c = b, c, a
+print a, b, c
+
+a, b, c, d = 1, 2, 3, 4
+a, b, c, d = d, c, b, a
+print a, b, c, d
+a, b, c, d, e = 1, 2, 3, 4, 5
+a, b, c, d, e = e, a, d, b, c
+print a, b, c, d, e
+
+
+def fib(n):
+    x, y = 0, 1
+    i = 0
+    while i < n:
+        x, y = y, x + y
+        i += 1
+    return x
+
+print fib(30)
+
+
+def pick(flag, p, q):
+    p, q = q, (p if flag else -p)
+    return p, q
+
+print pick(True, 1, 2), pick(False, 1, 2)
+
+# unpacking tuples, lists and iterators directly
+x, y = (5, 6)
+print x, y
+x, y, z = [7, 8, 9]
+print x, y, z
+(x, y), z = (1, 2), 3
+print x, y, z
+x, y, z = xrange(3)
+print x, y, z
+for k, v in [(1, 2), (3, 4)]:
+    print k, v
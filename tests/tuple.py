@@ -0,0 +1,24 @@
+# tuples of two and three items have classes specialised on the kinds of
+# their items, ints and floats are kept unboxed
+print (1, 2) == (1, 2), (1, 2.0) == (1, 2), (1.0, 2.0) == (1, 2)
+print (1, 2, 3) == (1.0, 2, 3.0), (1, 2) == (1, 2.5), (1, 2) == (1, 2, 3)
+print (1, 'a') == (1.0, 'a'), (1, 2L) == (1, 2), (True, 0) == (1, 0.0)
+print (1, 2, 3, 4) == (1.0, 2, 3, 4.0), (1, 2) != (1, 2.0)
+
+print 2.0 in (1, 2), 2 in (1.0, 2.0), True in (0, 1), 3 in (1, 2.0)
+print 2L in (1, 2, 3), 2.5 in (1, 2.0, 3)
+
+d = {}
+d[(1, 2)] = 12
+d[(1.5, 'x')] = 15
+d[(1, 2, 3)] = 123
+d[(1, 2, 3, 4)] = 1234
+print d[(1.0, 2)], d[(1, 2.0)], d[(True, 2L)]
+print d[(1.5, 'x')], d[(1.0, 2.0, 3.0)], d[(1, 2.0, 3L)]
+print d[(1.0, 2, 3, 4.0)]
+print (2.0, 1) in d, (1, 2.5) in d
+
+t = (4, 5.5)
+a, b = t
+print a, b, t[0], t[1], t[-1], len(t)
+print (t, t), (t,)